@@ -8,16 +8,44 @@ This module contains interfaces and schemas for AI-powered features:
 Note: This is scaffolding for future implementation. No model calls are made yet.
 """
 
-from app.ai.transaction_clustering import (
-    TransactionCluster,
-    TransactionClusterer,
-    ClusteringResult,
-)
-from app.ai.suggestion_schema import (
-    AdjustmentSuggestion,
-    SuggestionConfidence,
-    AdjustmentSuggestionEngine,
-)
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.ai.transaction_clustering import (
+        TransactionCluster,
+        TransactionClusterer,
+        ClusteringResult,
+    )
+    from app.ai.suggestion_schema import (
+        AdjustmentSuggestion,
+        SuggestionConfidence,
+        AdjustmentSuggestionEngine,
+    )
+
+# Public name -> defining submodule. Submodules import pandas/numpy, so they
+# are only loaded when one of these names is first accessed (PEP 562).
+_LAZY_EXPORTS = {
+    "TransactionCluster": "app.ai.transaction_clustering",
+    "TransactionClusterer": "app.ai.transaction_clustering",
+    "ClusteringResult": "app.ai.transaction_clustering",
+    "AdjustmentSuggestion": "app.ai.suggestion_schema",
+    "SuggestionConfidence": "app.ai.suggestion_schema",
+    "AdjustmentSuggestionEngine": "app.ai.suggestion_schema",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     "TransactionCluster",
@@ -27,4 +55,3 @@ __all__ = [
     "SuggestionConfidence",
     "AdjustmentSuggestionEngine",
 ]
-
@@ -0,0 +1,182 @@
+"""
+Nearest-neighbor graph helpers for semantic clustering.
+
+Builds a k-nearest-neighbor graph over embeddings with an HNSW index
+(hnswlib) when installed, so clustering is ~O(N log N) instead of a full
+N x N cosine similarity matrix. Without hnswlib an exact blockwise search
+is used, which keeps memory bounded but is still quadratic in time.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from app.utils.jit import njit
+
+try:
+    import hnswlib
+except ImportError:  # pragma: no cover - optional speedup
+    hnswlib = None
+
+
+def quantize_int8(embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-dimension int8 quantization.
+
+    Args:
+        embeddings: Float array of shape (n, dim)
+
+    Returns:
+        (codes, scale): int8 codes of shape (n, dim) and float32 scale of
+        shape (dim,), with embeddings ~= codes * scale
+    """
+    data = np.asarray(embeddings, dtype=np.float32)
+    scale = np.abs(data).max(axis=0, initial=0.0) / 127
+    scale[scale == 0] = 1.0
+    codes = np.clip(np.round(data / scale), -127, 127).astype(np.int8)
+    return codes, scale.astype(np.float32)
+
+
+def dequantize_int8(codes: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """Reconstruct float32 embeddings from int8 codes"""
+    return codes.astype(np.float32) * scale
+
+
+def knn_graph(
+    embeddings: np.ndarray,
+    k: int = 10,
+    ef_construction: int = 200,
+    m: int = 16,
+    block_size: int = 1024,
+    scale: Optional[np.ndarray] = None,
+    quantize: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the k nearest neighbors (cosine distance) of every embedding.
+
+    Embeddings may be passed int8-quantized (with their scale, see
+    quantize_int8), or quantized here with quantize=True. Only the exact
+    fallback benefits: it keeps just the int8 matrix resident and dequantizes
+    one block at a time. hnswlib stores its own float32 copy, so float input
+    is indexed as is rather than paying int8 precision loss for no memory
+    saving.
+
+    Args:
+        embeddings: Array of shape (n, dim), float or int8 codes
+        k: Neighbors per point (including the point itself)
+        ef_construction: HNSW build-time accuracy/speed trade-off
+        m: HNSW graph degree
+        block_size: Rows per block for the exact fallback
+        scale: Per-dimension scale when embeddings are int8 codes
+        quantize: Quantize float embeddings to int8 for the exact fallback
+
+    Returns:
+        (neighbors, distances), both of shape (n, min(k, n)); distance is
+        1 - cosine similarity
+    """
+    n = len(embeddings)
+    k = min(k, n)
+    if n == 0 or k == 0:
+        return np.empty((n, 0), dtype=np.int64), np.empty((n, 0), dtype=np.float32)
+
+    if quantize and hnswlib is None and embeddings.dtype != np.int8:
+        embeddings, scale = quantize_int8(embeddings)
+
+    if embeddings.dtype == np.int8:
+        if scale is None:
+            raise ValueError("scale is required for int8 embeddings")
+
+        def block(start: int, stop: int) -> np.ndarray:
+            return dequantize_int8(embeddings[start:stop], scale)
+
+    else:
+        data = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+        def block(start: int, stop: int) -> np.ndarray:
+            return data[start:stop]
+
+    if hnswlib is not None:
+        index = hnswlib.Index(space="cosine", dim=embeddings.shape[1])
+        index.init_index(max_elements=n, ef_construction=ef_construction, M=m)
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            index.add_items(block(start, stop), np.arange(start, stop))
+        index.set_ef(max(ef_construction, k))
+        neighbors = np.empty((n, k), dtype=np.int64)
+        distances = np.empty((n, k), dtype=np.float32)
+        for start in range(0, n, block_size):
+            labels, dists = index.knn_query(block(start, start + block_size), k=k)
+            neighbors[start : start + block_size] = labels
+            distances[start : start + block_size] = dists
+        return neighbors, distances
+
+    inv_norms = np.empty(n, dtype=np.float32)
+    for start in range(0, n, block_size):
+        norms = np.linalg.norm(block(start, start + block_size), axis=1)
+        inv_norms[start : start + block_size] = 1 / np.where(norms == 0, 1, norms)
+
+    neighbors = np.empty((n, k), dtype=np.int64)
+    distances = np.empty((n, k), dtype=np.float32)
+    for row in range(0, n, block_size):
+        rows = block(row, row + block_size) * inv_norms[row : row + block_size, None]
+        best_idx = np.empty((len(rows), 0), dtype=np.int64)
+        best_sim = np.empty((len(rows), 0), dtype=np.float32)
+        # Keep a running top-k while scanning column blocks
+        for col in range(0, n, block_size):
+            cols = block(col, col + block_size) * inv_norms[col : col + block_size, None]
+            col_ids = np.broadcast_to(np.arange(col, col + len(cols)), (len(rows), len(cols)))
+            sims = np.concatenate((best_sim, rows @ cols.T), axis=1)
+            idx = np.concatenate((best_idx, col_ids), axis=1)
+            if sims.shape[1] > k:
+                top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+                sims = np.take_along_axis(sims, top, axis=1)
+                idx = np.take_along_axis(idx, top, axis=1)
+            best_sim, best_idx = sims, idx
+        neighbors[row : row + block_size] = best_idx
+        distances[row : row + block_size] = 1 - best_sim
+    return neighbors, distances
+
+
+@njit(cache=True)
+def _union_find(n, src, dst):
+    """Union-find with path halving; returns each node's root (smallest id)"""
+    parent = np.arange(n)
+    for i in range(len(src)):
+        a = src[i]
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        b = dst[i]
+        while parent[b] != b:
+            parent[b] = parent[parent[b]]
+            b = parent[b]
+        if a < b:
+            parent[b] = a
+        elif b < a:
+            parent[a] = b
+    for i in range(n):
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        parent[i] = root
+    return parent
+
+
+def connected_components(n: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """
+    Label connected components of an undirected graph given as edge lists.
+
+    Args:
+        n: Number of nodes
+        src: Edge source nodes
+        dst: Edge destination nodes
+
+    Returns:
+        Array of length n; each node is labeled with the smallest node id
+        in its component
+    """
+    return _union_find(
+        n,
+        np.ascontiguousarray(src, dtype=np.int64),
+        np.ascontiguousarray(dst, dtype=np.int64),
+    )
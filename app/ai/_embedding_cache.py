@@ -0,0 +1,192 @@
+"""
+Embedding Cache - Phase 3 AI Scaffolding
+
+Content-addressed cache for description embeddings and LLM classifications.
+Descriptions are normalized (whitespace/case) and hashed so that identical
+vendor strings recurring across a GL are only sent to a model once.
+"""
+
+import hashlib
+import io
+import json
+import re
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional speedup
+    xxhash = None
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: Any) -> str:
+    """Collapse whitespace and lowercase text for cache lookups"""
+    return _WHITESPACE_RE.sub(" ", str(text)).strip().lower()
+
+
+def hash_text(text: Any) -> int:
+    """
+    Hash normalized text to a 64-bit integer.
+
+    Uses xxhash64 when installed, otherwise an 8-byte blake2b digest.
+    """
+    data = normalize_text(text).encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def hash_ids(ids: np.ndarray) -> int:
+    """
+    Order-independent 64-bit hash of a set of integer ids.
+
+    Ids are sorted as int64 and the raw buffer is hashed in one C call
+    (xxh3_64 when installed, otherwise an 8-byte blake2b digest), giving a
+    key that is stable across processes.
+    """
+    data = np.sort(np.asarray(ids, dtype=np.int64)).tobytes()
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+class EmbeddingCache:
+    """
+    LRU cache with optional SQLite persistence.
+
+    Values are either NumPy arrays (embeddings) or JSON-serializable objects
+    (classification outputs).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        path: Optional[str | Path] = None,
+        table: str = "embeddings",
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum number of in-memory entries before LRU eviction
+            path: Optional SQLite file for persistence across processes
+            table: Table name to use within the SQLite file
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table!r}")
+
+        self.max_entries = max_entries
+        self.table = table
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if path is not None:
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value BLOB)"
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return cached value for key, or None if missing"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        if self._db is not None:
+            row = self._db.execute(
+                f"SELECT value FROM {self.table} WHERE key = ?", (repr(key),)
+            ).fetchone()
+            if row is not None:
+                value = self._decode(row[0])
+                self._remember(key, value)
+                return value
+
+        return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value for key"""
+        self._remember(key, value)
+        if self._db is not None:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)",
+                (repr(key), self._encode(value)),
+            )
+            self._db.commit()
+
+    def _remember(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        if isinstance(value, np.ndarray):
+            buf = io.BytesIO()
+            np.save(buf, value, allow_pickle=False)
+            return buf.getvalue()
+        return json.dumps(value).encode("utf-8")
+
+    @staticmethod
+    def _decode(blob: bytes) -> Any:
+        if blob.startswith(b"\x93NUMPY"):
+            return np.load(io.BytesIO(blob), allow_pickle=False)
+        return json.loads(blob.decode("utf-8"))
+
+
+async def embed_with_cache(
+    cache: EmbeddingCache,
+    texts: Sequence[Any],
+    embed_fn: Callable[[List[str]], Awaitable[np.ndarray]],
+    max_batch: int = 2048,
+) -> np.ndarray:
+    """
+    Embed texts, only calling embed_fn for cache misses.
+
+    Misses are deduplicated and sent to embed_fn in batches of up to
+    max_batch texts (OpenAI's embeddings endpoint accepts 2048 inputs).
+
+    Args:
+        cache: Cache keyed by hash_text of each description
+        texts: Descriptions to embed
+        embed_fn: Coroutine embedding a list of normalized texts
+        max_batch: Maximum number of texts per embed_fn call
+
+    Returns:
+        Array of shape (len(texts), dim), aligned with texts
+    """
+    hashes = [hash_text(t) for t in texts]
+    found: Dict[int, np.ndarray] = {}
+    missing: Dict[int, str] = {}
+
+    for h, text in zip(hashes, texts):
+        if h in found or h in missing:
+            continue
+        cached = cache.get(h)
+        if cached is not None:
+            found[h] = cached
+        else:
+            missing[h] = normalize_text(text)
+
+    missing_keys = list(missing)
+    for start in range(0, len(missing_keys), max_batch):
+        batch_keys = missing_keys[start : start + max_batch]
+        vectors = await embed_fn([missing[h] for h in batch_keys])
+        for h, vector in zip(batch_keys, vectors):
+            cache.put(h, vector)
+            found[h] = vector
+
+    if not hashes:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.stack([found[h] for h in hashes])
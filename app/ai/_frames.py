@@ -0,0 +1,97 @@
+"""
+DataFrame backend helpers for the AI modules.
+
+Clustering accepts either a pandas or a polars DataFrame. Columns are pulled
+out as NumPy arrays here (zero-copy for numeric polars columns) so the
+clustering kernels never touch DataFrame-level groupby/sort machinery.
+"""
+
+from typing import Any, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import polars as pl
+except ImportError:  # pragma: no cover - optional backend
+    pl = None
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:  # pragma: no cover - optional speedup
+    pyarrow = None
+
+
+def is_polars(df: Any) -> bool:
+    """Return True if df is a polars DataFrame"""
+    return pl is not None and isinstance(df, pl.DataFrame)
+
+
+def has_column(df: Any, column: str) -> bool:
+    """Return True if df has the given column"""
+    return column in df.columns
+
+
+def to_pandas(df: Any) -> pd.DataFrame:
+    """Convert a polars DataFrame to pandas; pandas input is returned as-is"""
+    if is_polars(df):
+        return df.to_pandas()
+    return df
+
+
+def row_id_array(df: Any) -> np.ndarray:
+    """row_id column as an array, or positional ids if there is no row_id"""
+    if not has_column(df, "row_id"):
+        return np.arange(len(df))
+    if is_polars(df):
+        return df.get_column("row_id").to_numpy()
+    return df["row_id"].to_numpy()
+
+
+def string_array(df: Any, column: str) -> np.ndarray:
+    """Column as an object array of str, with nulls replaced by ''"""
+    if is_polars(df):
+        series = df.get_column(column).cast(pl.Utf8).fill_null("")
+        return series.to_numpy().astype(object)
+    return df[column].fillna("").astype(str).to_numpy()
+
+
+def float_array(df: Any, column: str, fill: Optional[float] = None) -> np.ndarray:
+    """Column as float64, optionally replacing nulls with fill (else NaN)"""
+    if is_polars(df):
+        series = df.get_column(column).cast(pl.Float64)
+        if fill is not None:
+            series = series.fill_null(fill)
+        return series.to_numpy()
+    series = df[column]
+    if fill is not None:
+        series = series.fillna(fill)
+    return series.to_numpy(dtype=np.float64)
+
+
+def datetime_array(df: Any, column: str) -> np.ndarray:
+    """Column as datetime64[ns] (NaT for missing/unparseable values)"""
+    if is_polars(df):
+        series = df.get_column(column)
+        if series.dtype == pl.Utf8:
+            series = series.str.to_datetime(strict=False)
+        return series.cast(pl.Datetime("ns")).to_numpy().astype("datetime64[ns]")
+    return pd.to_datetime(df[column], errors="coerce").to_numpy(dtype="datetime64[ns]")
+
+
+def with_arrow_strings(df: pd.DataFrame, columns: Iterable[str]) -> pd.DataFrame:
+    """
+    Store object string columns as string[pyarrow].
+
+    String methods (.str.contains/.lower/...) on Arrow-backed columns run in
+    vectorized Arrow compute kernels instead of per-row Python calls.
+    Returns df unchanged if pyarrow is not installed.
+    """
+    if pyarrow is None:
+        return df
+    converted = {
+        column: df[column].astype("string[pyarrow]")
+        for column in columns
+        if column in df.columns and df[column].dtype == object
+    }
+    return df.assign(**converted) if converted else df
@@ -0,0 +1,154 @@
+"""
+Ollama Backend - Phase 3 AI Scaffolding
+
+Local (on-prem) model backend talking to an Ollama server. Defaults to a
+Q4_K_M quantized instruct model and pins it in memory (keep_alive=-1) so
+classification calls don't pay a model cold start.
+"""
+
+import warnings
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional backend
+    httpx = None
+
+try:
+    from prometheus_client import Gauge
+except ImportError:  # pragma: no cover - optional metrics
+    Gauge = None
+
+
+DEFAULT_OLLAMA_URL = "http://localhost:11434"
+DEFAULT_OLLAMA_MODEL = "llama3.1:8b-instruct-q4_K_M"
+
+if Gauge is not None:  # pragma: no cover - optional metrics
+    _TOKENS_PER_SEC = Gauge(
+        "qoe_ollama_tokens_per_sec", "Generation throughput of the last call", ["model"]
+    )
+    _QUEUE_DEPTH = Gauge("qoe_ollama_queue_depth", "In-flight Ollama requests", ["model"])
+else:
+    _TOKENS_PER_SEC = _QUEUE_DEPTH = None
+
+
+class OllamaBackend:
+    """
+    Async client for an Ollama server.
+
+    Tracks tokens_per_sec (last generation) and queue_depth (in-flight
+    requests); both are also exported as Prometheus gauges when
+    prometheus_client is installed.
+    """
+
+    def __init__(
+        self,
+        model: str = DEFAULT_OLLAMA_MODEL,
+        base_url: str = DEFAULT_OLLAMA_URL,
+        keep_alive: int | str = -1,
+        timeout: float = 120.0,
+    ):
+        """
+        Initialize backend.
+
+        Args:
+            model: Ollama model tag (quantized GGUF, e.g. a q4_K_M build)
+            base_url: Ollama server URL
+            keep_alive: How long the server keeps the model loaded (-1 = forever)
+            timeout: Request timeout in seconds
+        """
+        if httpx is None:
+            raise ImportError("The ollama backend requires httpx (pip install httpx)")
+
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.tokens_per_sec = 0.0
+        self.queue_depth = 0
+
+    def warmup(self) -> bool:
+        """
+        Load the model into server memory and pin it there.
+
+        Sends an empty generate request with keep_alive, which makes Ollama
+        load the weights without producing tokens.
+
+        Returns:
+            True if the server acknowledged the request
+        """
+        try:
+            response = httpx.post(
+                f"{self.base_url}/api/generate",
+                json={"model": self.model, "keep_alive": self.keep_alive},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            return True
+        except httpx.HTTPError as e:
+            warnings.warn(f"Ollama warmup failed for {self.model}: {e}")
+            return False
+
+    async def generate(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Run a single non-streaming completion.
+
+        Args:
+            prompt: Prompt text
+            options: Optional Ollama model options (temperature, num_ctx, ...)
+
+        Returns:
+            Generated text
+        """
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": self.keep_alive,
+        }
+        if options:
+            payload["options"] = options
+
+        data = await self._post("/api/generate", payload)
+        eval_ns = data.get("eval_duration") or 0
+        if eval_ns:
+            self.tokens_per_sec = data.get("eval_count", 0) / (eval_ns / 1e9)
+            if _TOKENS_PER_SEC is not None:  # pragma: no cover - optional metrics
+                _TOKENS_PER_SEC.labels(self.model).set(self.tokens_per_sec)
+        return data.get("response", "")
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts in one request.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Array of shape (len(texts), dim)
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        data = await self._post(
+            "/api/embed",
+            {"model": self.model, "input": texts, "keep_alive": self.keep_alive},
+        )
+        return np.asarray(data["embeddings"], dtype=np.float32)
+
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        # A client per call: sync wrappers run each call in a fresh event loop
+        self._set_queue_depth(self.queue_depth + 1)
+        try:
+            async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout) as client:
+                response = await client.post(path, json=payload)
+                response.raise_for_status()
+                return response.json()
+        finally:
+            self._set_queue_depth(self.queue_depth - 1)
+
+    def _set_queue_depth(self, depth: int) -> None:
+        self.queue_depth = depth
+        if _QUEUE_DEPTH is not None:  # pragma: no cover - optional metrics
+            _QUEUE_DEPTH.labels(self.model).set(depth)
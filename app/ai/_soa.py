@@ -0,0 +1,80 @@
+"""
+Struct-of-arrays helpers for AI result batches.
+
+Large batches of clusters/suggestions are stored column-wise in NumPy
+arrays. Individual dataclass records are only built when accessed.
+"""
+
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+def csr_from_lists(lists: Iterable[Iterable[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pack variable-length integer lists into CSR (values, offsets) arrays.
+
+    Row i is values[offsets[i]:offsets[i + 1]].
+    """
+    lists = [list(items) for items in lists]
+    lengths = np.fromiter((len(items) for items in lists), dtype=np.int64, count=len(lists))
+    offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    values = np.fromiter(
+        (v for items in lists for v in items), dtype=np.int64, count=int(offsets[-1])
+    )
+    return values, offsets
+
+
+def csr_filter(
+    values: np.ndarray, offsets: np.ndarray, mask: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Keep only the CSR rows selected by a boolean mask"""
+    lengths = np.diff(offsets)
+    new_offsets = np.zeros(int(mask.sum()) + 1, dtype=np.int64)
+    np.cumsum(lengths[mask], out=new_offsets[1:])
+    return values[np.repeat(mask, lengths)], new_offsets
+
+
+def object_array(items: Iterable[Any]) -> np.ndarray:
+    """Build a 1-D object array without NumPy unpacking nested lists"""
+    items = list(items)
+    arr = np.empty(len(items), dtype=object)
+    arr[:] = items
+    return arr
+
+
+class LazyRecordList(Sequence):
+    """Read-only list view that materializes records on first access"""
+
+    def __init__(self, length: int, materialize: Callable[[int], Any]):
+        self._length = length
+        self._materialize = materialize
+        self._cache: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("record index out of range")
+        if index not in self._cache:
+            self._cache[index] = self._materialize(index)
+        return self._cache[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, LazyRecordList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LazyRecordList(len={self._length})"
+
+    def to_list(self) -> List[Any]:
+        """Materialize every record"""
+        return list(self)
@@ -12,12 +12,116 @@ TODO: Implement actual suggestion generation using LLM/ML models to:
       - Provide confidence scores and reasoning
 """
 
+import asyncio
+import json
+import re
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Optional, Any
+from pathlib import Path
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Awaitable, Callable, Iterable, Literal
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 
+from app.ai._embedding_cache import EmbeddingCache, hash_ids, hash_text
+from app.ai._frames import to_pandas, with_arrow_strings
+from app.ai._soa import LazyRecordList, csr_from_lists, object_array
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import hyperscan
+except ImportError:  # pragma: no cover - optional speedup
+    hyperscan = None
+
+
+# Description keywords indicating a one-time / non-recurring expense
+ONE_TIME_KEYWORD_PATTERNS = (
+    r"\bsettlement\b",
+    r"\bone[- ]time\b",
+    r"\blegal\s+fees\b",
+    r"\bseverance\b",
+    r"\brestructur\w+\b",
+    r"\bimpair\w+\b",
+)
+ONE_TIME_KEYWORDS_RE = re.compile("|".join(ONE_TIME_KEYWORD_PATTERNS), re.IGNORECASE)
+
+_hyperscan_db = None
+
+
+def _get_hyperscan_db():
+    """Compile the one-time keyword patterns into a Hyperscan database once"""
+    global _hyperscan_db
+    if _hyperscan_db is None:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[p.encode("utf-8") for p in ONE_TIME_KEYWORD_PATTERNS],
+            ids=list(range(len(ONE_TIME_KEYWORD_PATTERNS))),
+            elements=len(ONE_TIME_KEYWORD_PATTERNS),
+            # SOM_LEFTMOST reports match start offsets, so the keyword itself
+            # can be sliced out of the scanned text
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST]
+            * len(ONE_TIME_KEYWORD_PATTERNS),
+        )
+        _hyperscan_db = db
+    return _hyperscan_db
+
+
+def _one_time_keywords(descriptions: pd.Series) -> np.ndarray:
+    """
+    Matched one-time keyword per description (None where nothing matches).
+
+    Uses a Hyperscan multi-pattern database when installed (one pass per
+    description for all patterns), otherwise a vectorized regex extract.
+    Whether a row matches and which keyword it reports always come from the
+    same engine: regex engines disagree on word boundaries next to
+    non-ASCII letters (e.g. "Résettlement").
+    """
+    if hyperscan is None:
+        matched = descriptions.str.extract(
+            f"({ONE_TIME_KEYWORDS_RE.pattern})", flags=re.IGNORECASE, expand=False
+        )
+        return matched.astype(object).where(matched.notna(), None).to_numpy()
+
+    db = _get_hyperscan_db()
+    keywords = np.full(len(descriptions), None, dtype=object)
+
+    for i, desc in enumerate(descriptions.to_numpy()):
+        if not isinstance(desc, str):
+            continue
+        encoded = desc.encode("utf-8")
+        hit = []
+
+        def on_match(pattern_id, start, end, flags, context):
+            hit.append((start, end))
+            return True  # first hit is enough; terminate the scan
+
+        try:
+            db.scan(encoded, match_event_handler=on_match)
+        except hyperscan.ScanTerminated:
+            start, end = hit[0]
+            keywords[i] = encoded[start:end].decode("utf-8", errors="replace")
+    return keywords
+
+
+def _one_time_keyword_mask(descriptions: pd.Series) -> np.ndarray:
+    """Boolean mask of descriptions containing a one-time keyword"""
+    return pd.notna(_one_time_keywords(descriptions))
+
+
+# Confidence assigned to suggestions backed only by a keyword match
+KEYWORD_MATCH_CONFIDENCE = 0.6
+
+# Spend more than this many standard deviations above its account's mean is
+# flagged as potentially discretionary (accounts need MIN_ACCOUNT_TRANSACTIONS)
+OUTLIER_ZSCORE = 3.0
+MIN_ACCOUNT_TRANSACTIONS = 5
+OUTLIER_CONFIDENCE = 0.4
+
 
 class SuggestionConfidence(str, Enum):
     """Confidence levels for adjustment suggestions"""
@@ -28,6 +132,17 @@ class SuggestionConfidence(str, Enum):
     VERY_LOW = "very_low"  # < 0.3: Very uncertain, likely not useful
 
 
+def _confidence_level(score: float) -> SuggestionConfidence:
+    """Map a confidence score onto the SuggestionConfidence bands"""
+    if score >= 0.8:
+        return SuggestionConfidence.HIGH
+    if score >= 0.5:
+        return SuggestionConfidence.MEDIUM
+    if score >= 0.3:
+        return SuggestionConfidence.LOW
+    return SuggestionConfidence.VERY_LOW
+
+
 class AdjustmentCategory(str, Enum):
     """Standard adjustment categories"""
 
@@ -42,7 +157,18 @@ class AdjustmentCategory(str, Enum):
     OTHER = "Other"
 
 
-@dataclass
+# Palettes for the int8 enum codes used by SuggestionColumns
+_CATEGORIES = list(AdjustmentCategory)
+_CONFIDENCE_LEVELS = list(SuggestionConfidence)
+_CATEGORY_CODES = {cat: code for code, cat in enumerate(_CATEGORIES)}
+_CONFIDENCE_CODES = {level: code for code, level in enumerate(_CONFIDENCE_LEVELS)}
+
+# Value -> member lookups for deserialization (avoids Enum.__call__ per row)
+_CAT_BY_VALUE = {cat.value: cat for cat in AdjustmentCategory}
+_CONF_BY_VALUE = {level.value: level for level in SuggestionConfidence}
+
+
+@dataclass(slots=True)
 class AdjustmentSuggestion:
     """
     Represents an AI-generated suggestion for an EBITDA adjustment.
@@ -99,16 +225,15 @@ class AdjustmentSuggestion:
         return cls(
             suggestion_id=data["suggestion_id"],
             transaction_ids=data["transaction_ids"],
-            adjustment_category=AdjustmentCategory(data["adjustment_category"]),
+            adjustment_category=_CAT_BY_VALUE[data["adjustment_category"]],
             suggested_amount=data["suggested_amount"],
             add_back=data["add_back"],
             confidence_score=data["confidence_score"],
-            confidence_level=SuggestionConfidence(data["confidence_level"]),
+            confidence_level=_CONF_BY_VALUE[data["confidence_level"]],
             reasoning=data["reasoning"],
             supporting_evidence=data.get("supporting_evidence", []),
             alternative_categories=[
-                AdjustmentCategory(cat)
-                for cat in data.get("alternative_categories", [])
+                _CAT_BY_VALUE[cat] for cat in data.get("alternative_categories", [])
             ],
             suggested_reasoning_template=data.get("suggested_reasoning_template", ""),
             metadata=data.get("metadata", {}),
@@ -117,6 +242,182 @@ class AdjustmentSuggestion:
 
 
 @dataclass
+class SuggestionColumns:
+    """
+    Column-oriented (struct-of-arrays) storage for a batch of suggestions.
+
+    Enums are stored as int8 codes into _CATEGORIES/_CONFIDENCE_LEVELS and
+    transaction ids CSR-style (txn_id_values sliced by txn_id_offsets).
+    """
+
+    suggestion_id: np.ndarray  # object
+    txn_id_values: np.ndarray  # int64
+    txn_id_offsets: np.ndarray  # int64, len(suggestions) + 1
+    category: np.ndarray  # int8
+    suggested_amount: np.ndarray  # float64
+    add_back: np.ndarray  # bool
+    confidence_score: np.ndarray  # float64
+    confidence_level: np.ndarray  # int8
+    created_at: np.ndarray  # datetime64[us]
+    reasoning: np.ndarray  # object
+    supporting_evidence: np.ndarray  # object (lists)
+    alternative_categories: np.ndarray  # object (lists of AdjustmentCategory)
+    suggested_reasoning_template: np.ndarray  # object
+    metadata: np.ndarray  # object (dicts)
+
+    def __len__(self) -> int:
+        return len(self.suggestion_id)
+
+    @classmethod
+    def from_suggestions(cls, suggestions: List[AdjustmentSuggestion]) -> "SuggestionColumns":
+        """Convert a list of AdjustmentSuggestion objects to columns"""
+        values, offsets = csr_from_lists(s.transaction_ids for s in suggestions)
+        return cls(
+            suggestion_id=object_array(s.suggestion_id for s in suggestions),
+            txn_id_values=values,
+            txn_id_offsets=offsets,
+            category=np.array(
+                [_CATEGORY_CODES[s.adjustment_category] for s in suggestions], dtype=np.int8
+            ),
+            suggested_amount=np.array(
+                [s.suggested_amount for s in suggestions], dtype=np.float64
+            ),
+            add_back=np.array([s.add_back for s in suggestions], dtype=bool),
+            confidence_score=np.array(
+                [s.confidence_score for s in suggestions], dtype=np.float64
+            ),
+            confidence_level=np.array(
+                [_CONFIDENCE_CODES[s.confidence_level] for s in suggestions], dtype=np.int8
+            ),
+            created_at=np.array([s.created_at for s in suggestions], dtype="datetime64[us]"),
+            reasoning=object_array(s.reasoning for s in suggestions),
+            supporting_evidence=object_array(s.supporting_evidence for s in suggestions),
+            alternative_categories=object_array(
+                s.alternative_categories for s in suggestions
+            ),
+            suggested_reasoning_template=object_array(
+                s.suggested_reasoning_template for s in suggestions
+            ),
+            metadata=object_array(s.metadata for s in suggestions),
+        )
+
+    def transaction_ids(self, index: int) -> np.ndarray:
+        """Transaction ids of suggestion index"""
+        return self.txn_id_values[self.txn_id_offsets[index] : self.txn_id_offsets[index + 1]]
+
+    def suggestion(self, index: int) -> AdjustmentSuggestion:
+        """Materialize a single AdjustmentSuggestion"""
+        return AdjustmentSuggestion(
+            suggestion_id=self.suggestion_id[index],
+            transaction_ids=self.transaction_ids(index).tolist(),
+            adjustment_category=_CATEGORIES[self.category[index]],
+            suggested_amount=float(self.suggested_amount[index]),
+            add_back=bool(self.add_back[index]),
+            confidence_score=float(self.confidence_score[index]),
+            confidence_level=_CONFIDENCE_LEVELS[self.confidence_level[index]],
+            reasoning=self.reasoning[index],
+            supporting_evidence=self.supporting_evidence[index],
+            alternative_categories=self.alternative_categories[index],
+            suggested_reasoning_template=self.suggested_reasoning_template[index],
+            metadata=self.metadata[index],
+            created_at=self.created_at[index].item(),
+        )
+
+    def txn_set_keys(self) -> np.ndarray:
+        """64-bit hash of each suggestion's transaction id set (see hash_ids)"""
+        values, offsets = self.txn_id_values, self.txn_id_offsets
+        return np.fromiter(
+            (hash_ids(values[offsets[i] : offsets[i + 1]]) for i in range(len(self))),
+            dtype=np.uint64,
+            count=len(self),
+        )
+
+    def take(self, indices: np.ndarray) -> "SuggestionColumns":
+        """Select suggestions by position"""
+        lengths = np.diff(self.txn_id_offsets)[indices]
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        starts = self.txn_id_offsets[indices]
+        gather = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return SuggestionColumns(
+            suggestion_id=self.suggestion_id[indices],
+            txn_id_values=self.txn_id_values[gather],
+            txn_id_offsets=offsets,
+            category=self.category[indices],
+            suggested_amount=self.suggested_amount[indices],
+            add_back=self.add_back[indices],
+            confidence_score=self.confidence_score[indices],
+            confidence_level=self.confidence_level[indices],
+            created_at=self.created_at[indices],
+            reasoning=self.reasoning[indices],
+            supporting_evidence=self.supporting_evidence[indices],
+            alternative_categories=self.alternative_categories[indices],
+            suggested_reasoning_template=self.suggested_reasoning_template[indices],
+            metadata=self.metadata[indices],
+        )
+
+    def drop_duplicates(self) -> "SuggestionColumns":
+        """
+        Keep one suggestion per (category, transaction id set).
+
+        The highest-confidence suggestion wins (first one on ties); the
+        original order is preserved.
+        """
+        if len(self) < 2:
+            return self
+        keys = self.txn_set_keys()
+        order = np.lexsort((np.arange(len(self)), -self.confidence_score, self.category, keys))
+        sorted_keys = keys[order]
+        sorted_cats = self.category[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (sorted_keys[1:] != sorted_keys[:-1]) | (sorted_cats[1:] != sorted_cats[:-1])
+        keep = np.sort(order[first])
+        return self if len(keep) == len(self) else self.take(keep)
+
+    def confidence_counts(self) -> np.ndarray:
+        """Number of suggestions per confidence level, indexed like _CONFIDENCE_LEVELS"""
+        return np.bincount(self.confidence_level, minlength=len(_CONFIDENCE_LEVELS))
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Convert to a list of dictionaries shaped like AdjustmentSuggestion.to_dict"""
+        offsets = self.txn_id_offsets.tolist()
+        ids = self.txn_id_values.tolist()
+        category_values = [cat.value for cat in _CATEGORIES]
+        level_values = [level.value for level in _CONFIDENCE_LEVELS]
+        keys = (
+            "suggestion_id",
+            "transaction_ids",
+            "adjustment_category",
+            "suggested_amount",
+            "add_back",
+            "confidence_score",
+            "confidence_level",
+            "reasoning",
+            "supporting_evidence",
+            "alternative_categories",
+            "suggested_reasoning_template",
+            "metadata",
+            "created_at",
+        )
+        rows = zip(
+            self.suggestion_id.tolist(),
+            (ids[offsets[i] : offsets[i + 1]] for i in range(len(self))),
+            (category_values[code] for code in self.category.tolist()),
+            self.suggested_amount.tolist(),
+            self.add_back.tolist(),
+            self.confidence_score.tolist(),
+            (level_values[code] for code in self.confidence_level.tolist()),
+            self.reasoning.tolist(),
+            self.supporting_evidence.tolist(),
+            ([cat.value for cat in cats] for cats in self.alternative_categories.tolist()),
+            self.suggested_reasoning_template.tolist(),
+            self.metadata.tolist(),
+            (ts.isoformat() for ts in self.created_at.tolist()),
+        )
+        return [dict(zip(keys, row)) for row in rows]
+
+
+@dataclass(slots=True)
 class SuggestionBatch:
     """Batch of adjustment suggestions"""
 
@@ -126,11 +427,79 @@ class SuggestionBatch:
     medium_confidence_count: int
     low_confidence_count: int
     metadata: Dict[str, Any] = field(default_factory=dict)
+    columns: Optional[SuggestionColumns] = field(default=None, repr=False)
+
+    @classmethod
+    def from_columns(
+        cls, columns: SuggestionColumns, metadata: Optional[Dict[str, Any]] = None
+    ) -> "SuggestionBatch":
+        """Create a batch backed by columns; suggestions are materialized lazily"""
+        counts = columns.confidence_counts()
+        high = int(counts[_CONFIDENCE_CODES[SuggestionConfidence.HIGH]])
+        medium = int(counts[_CONFIDENCE_CODES[SuggestionConfidence.MEDIUM]])
+        return cls(
+            suggestions=LazyRecordList(len(columns), columns.suggestion),
+            total_suggested_adjustment=float(columns.suggested_amount.sum()),
+            high_confidence_count=high,
+            medium_confidence_count=medium,
+            low_confidence_count=len(columns) - high - medium,
+            metadata=metadata if metadata is not None else {},
+            columns=columns,
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert batch to dictionary"""
         return {
-            "suggestions": [s.to_dict() for s in self.suggestions],
+            "suggestions": (
+                self.columns.to_records()
+                if self.columns is not None
+                else [s.to_dict() for s in self.suggestions]
+            ),
+            "total_suggested_adjustment": self.total_suggested_adjustment,
+            "high_confidence_count": self.high_confidence_count,
+            "medium_confidence_count": self.medium_confidence_count,
+            "low_confidence_count": self.low_confidence_count,
+            "metadata": self.metadata,
+        }
+
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize the batch column-wise to JSON bytes.
+
+        Suggestions are written as parallel column arrays rather than one
+        object per suggestion: enums as int8 codes into the category/confidence
+        palettes, transaction ids CSR-style (values + offsets) and created_at
+        as int64 nanoseconds since the epoch. Uses orjson when installed.
+
+        Returns:
+            UTF-8 encoded JSON document
+        """
+        columns = self.columns
+        if columns is None:
+            columns = SuggestionColumns.from_suggestions(list(self.suggestions))
+
+        doc = {
+            "category_palette": [cat.value for cat in _CATEGORIES],
+            "confidence_palette": [level.value for level in _CONFIDENCE_LEVELS],
+            "columns": {
+                "suggestion_id": columns.suggestion_id.tolist(),
+                "txn_id_values": columns.txn_id_values,
+                "txn_id_offsets": columns.txn_id_offsets,
+                "adjustment_category": columns.category,
+                "suggested_amount": columns.suggested_amount,
+                "add_back": columns.add_back,
+                "confidence_score": columns.confidence_score,
+                "confidence_level": columns.confidence_level,
+                "created_at_ns": columns.created_at.astype("datetime64[ns]").view(np.int64),
+                "reasoning": columns.reasoning.tolist(),
+                "supporting_evidence": columns.supporting_evidence.tolist(),
+                "alternative_categories": [
+                    [_CATEGORY_CODES[cat] for cat in cats]
+                    for cats in columns.alternative_categories.tolist()
+                ],
+                "suggested_reasoning_template": columns.suggested_reasoning_template.tolist(),
+                "metadata": columns.metadata.tolist(),
+            },
             "total_suggested_adjustment": self.total_suggested_adjustment,
             "high_confidence_count": self.high_confidence_count,
             "medium_confidence_count": self.medium_confidence_count,
@@ -138,6 +507,125 @@ class SuggestionBatch:
             "metadata": self.metadata,
         }
 
+        if orjson is not None:
+            return orjson.dumps(doc, option=orjson.OPT_SERIALIZE_NUMPY)
+        doc["columns"] = {
+            name: value.tolist() if isinstance(value, np.ndarray) else value
+            for name, value in doc["columns"].items()
+        }
+        return json.dumps(doc).encode("utf-8")
+
+
+@dataclass(slots=True)
+class _TxnFeatures:
+    """
+    Per-transaction arrays shared by all suggest_* detectors.
+
+    Built once per generate call so each detector reads aligned NumPy
+    arrays instead of re-extracting and re-normalizing DataFrame columns.
+    """
+
+    row_id: np.ndarray  # row_id values (index if no row_id column)
+    description: np.ndarray  # object, original text (None if missing)
+    desc_lower: np.ndarray  # object, normalized text ('' if missing)
+    desc_hash: np.ndarray  # uint64, hash_text of each description
+    amount: np.ndarray  # float64
+    date_i8: np.ndarray  # int64 ns since epoch (NaT sentinel if missing)
+    account_code: np.ndarray  # int32 codes into account_names (-1 if missing)
+    account_names: np.ndarray  # object, distinct account names
+
+    def __len__(self) -> int:
+        return len(self.row_id)
+
+    @classmethod
+    def from_frame(
+        cls,
+        normalized_df: pd.DataFrame,
+        account_column: str = "account_name_flat",
+        description_column: str = "description",
+        amount_column: str = "amount_net",
+        date_column: str = "date",
+    ) -> "_TxnFeatures":
+        """Extract features from a normalized GL DataFrame in one pass per column"""
+        n = len(normalized_df)
+        columns = normalized_df.columns
+
+        row_id = (
+            normalized_df["row_id"].to_numpy()
+            if "row_id" in columns
+            else normalized_df.index.to_numpy()
+        )
+
+        if description_column in columns:
+            raw = normalized_df[description_column]
+            description = raw.where(raw.notna(), None).to_numpy(dtype=object)
+            lowered = (
+                raw.fillna("")
+                .astype(str)
+                .str.replace(r"\s+", " ", regex=True)
+                .str.strip()
+                .str.lower()
+            )
+            codes, uniques = pd.factorize(lowered)
+            unique_hashes = np.fromiter(
+                (hash_text(u) for u in uniques), dtype=np.uint64, count=len(uniques)
+            )
+            desc_lower = lowered.to_numpy(dtype=object)
+            desc_hash = unique_hashes[codes] if n else np.empty(0, dtype=np.uint64)
+        else:
+            description = np.full(n, None, dtype=object)
+            desc_lower = np.full(n, "", dtype=object)
+            desc_hash = np.zeros(n, dtype=np.uint64)
+
+        amount = (
+            normalized_df[amount_column].to_numpy(dtype=np.float64)
+            if amount_column in columns
+            else np.zeros(n)
+        )
+
+        if date_column in columns:
+            date_i8 = (
+                pd.to_datetime(normalized_df[date_column], errors="coerce")
+                .to_numpy(dtype="datetime64[ns]")
+                .view(np.int64)
+            )
+        else:
+            date_i8 = np.full(n, np.datetime64("NaT", "ns").view(np.int64))
+
+        if account_column in columns:
+            categorical = pd.Categorical(normalized_df[account_column])
+            account_code = categorical.codes.astype(np.int32)
+            account_names = np.asarray(categorical.categories, dtype=object)
+        else:
+            account_code = np.full(n, -1, dtype=np.int32)
+            account_names = np.empty(0, dtype=object)
+
+        return cls(
+            row_id=row_id,
+            description=description,
+            desc_lower=desc_lower,
+            desc_hash=desc_hash,
+            amount=amount,
+            date_i8=date_i8,
+            account_code=account_code,
+            account_names=account_names,
+        )
+
+
+def _classify_one(
+    classify_fn: Callable[[str], str], descriptions: List[str]
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Classify one batch with a blocking model function.
+
+    Top-level (picklable) so it can run in a ProcessPoolExecutor worker;
+    only the function and the description strings cross the process boundary.
+    """
+    prompt = AdjustmentSuggestionEngine._build_batch_prompt(descriptions)
+    return AdjustmentSuggestionEngine._parse_batch_response(
+        classify_fn(prompt), len(descriptions)
+    )
+
 
 class AdjustmentSuggestionEngine:
     """
@@ -161,6 +649,15 @@ class AdjustmentSuggestionEngine:
         min_confidence_threshold: float = 0.5,
         max_suggestions_per_category: Optional[int] = None,
         include_low_confidence: bool = False,
+        max_concurrency: int = 8,
+        model_name: Optional[str] = None,
+        cache_path: Optional[str | Path] = None,
+        batch_size: int = 32,
+        backend: Optional[str] = None,
+        backend_url: Optional[str] = None,
+        preload: bool = True,
+        executor: Literal["asyncio", "process", "thread"] = "asyncio",
+        classify_fn: Optional[Callable[[str], str]] = None,
     ):
         """
         Initialize adjustment suggestion engine.
@@ -169,10 +666,59 @@ class AdjustmentSuggestionEngine:
             min_confidence_threshold: Minimum confidence score to include suggestion (0.0 to 1.0)
             max_suggestions_per_category: Maximum suggestions per category (None = no limit)
             include_low_confidence: Whether to include low-confidence suggestions
+            max_concurrency: Maximum number of in-flight model calls
+            model_name: Model identifier (part of the classification cache key)
+            cache_path: Optional SQLite file to persist classifications
+            batch_size: Number of descriptions packed into one classification prompt
+            backend: Model backend; "ollama" for a local quantized model, None for no model
+            backend_url: Backend server URL (default: the backend's standard local URL)
+            preload: Load and pin the model in the backend's memory at construction
+            executor: How blocking classify_fn calls run: "process" or "thread"
+                pool of max_concurrency workers ("asyncio" = async backend only)
+            classify_fn: Blocking prompt -> reply function for SDKs without async
+                IO (e.g. llama-cpp-python); must be a top-level function for "process"
         """
+        if executor not in ("asyncio", "process", "thread"):
+            raise ValueError(f"Unknown executor: {executor}")
+
         self.min_confidence_threshold = min_confidence_threshold
         self.max_suggestions_per_category = max_suggestions_per_category
         self.include_low_confidence = include_low_confidence
+        self.max_concurrency = max_concurrency
+        self.model_name = model_name
+        self.classification_cache = EmbeddingCache(path=cache_path, table="classifications")
+        self.batch_size = batch_size
+        self.backend = self._create_backend(backend, backend_url)
+        if self.backend is not None and preload:
+            self.backend.warmup()
+        self.executor = executor
+        self.classify_fn = classify_fn
+        self._pool: Optional[Executor] = None
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self) -> Executor:
+        """Start the process/thread pool on first use"""
+        if self._pool is None:
+            pool_cls = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+            self._pool = pool_cls(max_workers=self.max_concurrency)
+        return self._pool
+
+    def _create_backend(self, backend: Optional[str], backend_url: Optional[str]) -> Optional[Any]:
+        """Instantiate the configured model backend"""
+        if backend is None:
+            return None
+        if backend == "ollama":
+            from app.ai._ollama import DEFAULT_OLLAMA_MODEL, DEFAULT_OLLAMA_URL, OllamaBackend
+
+            if self.model_name is None:
+                self.model_name = DEFAULT_OLLAMA_MODEL
+            return OllamaBackend(model=self.model_name, base_url=backend_url or DEFAULT_OLLAMA_URL)
+        raise ValueError(f"Unknown model backend: {backend}")
 
     def generate_suggestions(
         self,
@@ -186,11 +732,48 @@ class AdjustmentSuggestionEngine:
         """
         Generate adjustment suggestions for GL transactions.
 
+        Synchronous wrapper around agenerate_suggestions. Must not be called
+        from inside a running event loop; await agenerate_suggestions instead.
+
+        Args:
+            normalized_df: Normalized GL DataFrame with transactions
+            transaction_clusters: Optional pre-computed transaction clusters
+            account_column: Column name for account names
+            description_column: Column name for transaction descriptions
+            amount_column: Column name for transaction amounts
+            date_column: Column name for transaction dates
+
+        Returns:
+            SuggestionBatch with generated suggestions and metadata
+        """
+        return asyncio.run(
+            self.agenerate_suggestions(
+                normalized_df,
+                transaction_clusters=transaction_clusters,
+                account_column=account_column,
+                description_column=description_column,
+                amount_column=amount_column,
+                date_column=date_column,
+            )
+        )
+
+    async def agenerate_suggestions(
+        self,
+        normalized_df: pd.DataFrame,
+        transaction_clusters: Optional[List[Any]] = None,  # TransactionCluster objects
+        account_column: str = "account_name_flat",
+        description_column: str = "description",
+        amount_column: str = "amount_net",
+        date_column: str = "date",
+    ) -> SuggestionBatch:
+        """
+        Generate adjustment suggestions for GL transactions.
+
         Analyzes transactions and generates suggestions for EBITDA adjustments
         based on AI/ML analysis of patterns, descriptions, and account structures.
 
         Args:
-            normalized_df: Normalized GL DataFrame with transactions
+            normalized_df: Normalized GL DataFrame with transactions (pandas or polars)
             transaction_clusters: Optional pre-computed transaction clusters
             account_column: Column name for account names
             description_column: Column name for transaction descriptions
@@ -209,20 +792,69 @@ class AdjustmentSuggestionEngine:
               6. Filter suggestions based on confidence thresholds
               7. Group related suggestions if using transaction clusters
         """
-        # TODO: Implement suggestion generation logic
-        # For now, return empty batch structure
-        return SuggestionBatch(
-            suggestions=[],
-            total_suggested_adjustment=0.0,
-            high_confidence_count=0,
-            medium_confidence_count=0,
-            low_confidence_count=0,
+        # Detectors work on pandas; polars input is converted once here, and
+        # text columns move to Arrow strings for vectorized string kernels
+        normalized_df = with_arrow_strings(
+            to_pandas(normalized_df), (description_column, account_column)
         )
 
+        # One timestamp for the whole batch instead of datetime.now() per suggestion
+        created_at = datetime.now()
+
+        # Extract/normalize columns once; every detector reads these arrays
+        features = _TxnFeatures.from_frame(
+            normalized_df, account_column, description_column, amount_column, date_column
+        )
+
+        # Category detectors are independent, so run them concurrently
+        one_time, discretionary, owner_comp = await asyncio.gather(
+            self.asuggest_one_time_expenses(
+                normalized_df,
+                description_column,
+                amount_column,
+                created_at=created_at,
+                features=features,
+            ),
+            self.asuggest_discretionary_expenses(
+                normalized_df,
+                account_column,
+                amount_column,
+                features=features,
+                created_at=created_at,
+            ),
+            self.asuggest_owner_compensation_adjustments(
+                normalized_df, account_column, features=features
+            ),
+        )
+        suggestions = one_time + discretionary + owner_comp
+
+        # Detectors may flag the same transactions for the same reason
+        columns = SuggestionColumns.from_suggestions(suggestions).drop_duplicates()
+
+        # TODO: Filter and group suggestions
+        return SuggestionBatch.from_columns(columns)
+
     def suggest_one_time_expenses(
         self,
         normalized_df: pd.DataFrame,
         description_column: str = "description",
+        amount_column: str = "amount_net",
+        created_at: Optional[datetime] = None,
+    ) -> List[AdjustmentSuggestion]:
+        """Synchronous wrapper around asuggest_one_time_expenses"""
+        return asyncio.run(
+            self.asuggest_one_time_expenses(
+                normalized_df, description_column, amount_column, created_at=created_at
+            )
+        )
+
+    async def asuggest_one_time_expenses(
+        self,
+        normalized_df: pd.DataFrame,
+        description_column: str = "description",
+        amount_column: str = "amount_net",
+        created_at: Optional[datetime] = None,
+        features: Optional[_TxnFeatures] = None,
     ) -> List[AdjustmentSuggestion]:
         """
         Generate suggestions for one-time expenses.
@@ -230,54 +862,231 @@ class AdjustmentSuggestionEngine:
         Identifies transactions that appear to be one-time or non-recurring
         expenses that should be added back to EBITDA.
 
+        Keyword detection runs as a single vectorized scan over the
+        description column; only matching rows are visited in Python.
+
         Args:
             normalized_df: Normalized GL DataFrame
             description_column: Column name for transaction descriptions
+            amount_column: Column name for transaction amounts
+            created_at: Timestamp shared by all suggestions (default: now)
+            features: Pre-extracted transaction features (built from the frame if None)
 
         Returns:
             List of AdjustmentSuggestion objects for one-time expenses
 
-        TODO: Implement one-time expense detection:
+        TODO: Complete one-time expense detection:
               1. Use LLM to analyze descriptions for one-time indicators
-              2. Check for keywords like "settlement", "one-time", "legal", etc.
-              3. Compare against historical patterns
-              4. Generate confidence scores
+              2. Compare against historical patterns
+              3. Generate confidence scores from model output
         """
-        # TODO: Implement one-time expense detection
-        return []
+        if normalized_df.empty or description_column not in normalized_df.columns:
+            return []
+        if features is None:
+            features = _TxnFeatures.from_frame(
+                normalized_df, description_column=description_column, amount_column=amount_column
+            )
+
+        keywords = _one_time_keywords(normalized_df[description_column])
+        mask = pd.notna(keywords)
+
+        if created_at is None:
+            created_at = datetime.now()
+
+        suggestions = []
+        for row_id, keyword, amount in zip(
+            features.row_id[mask].tolist(),
+            keywords[mask].tolist(),
+            features.amount[mask].tolist(),
+        ):
+            suggestions.append(
+                AdjustmentSuggestion(
+                    suggestion_id=f"one_time_{row_id}",
+                    transaction_ids=[row_id],
+                    adjustment_category=AdjustmentCategory.ONE_TIME_EXPENSE,
+                    suggested_amount=-amount,
+                    add_back=True,
+                    confidence_score=KEYWORD_MATCH_CONFIDENCE,
+                    confidence_level=SuggestionConfidence.MEDIUM,
+                    reasoning=f"Description contains one-time indicator '{keyword}'",
+                    supporting_evidence=[keyword],
+                    created_at=created_at,
+                )
+            )
+
+        # Descriptions without a keyword hit go to the model in batches (one
+        # call per unique description); skipped when no model is configured
+        if self.backend is None and self.classify_fn is None:
+            return suggestions
+        unmatched = ~mask & (features.desc_lower != "")
+        classifications = await self._classify_descriptions(
+            list(pd.unique(features.description[unmatched]))
+        )
+
+        for row_id, desc, amount in zip(
+            features.row_id[unmatched].tolist(),
+            features.description[unmatched].tolist(),
+            features.amount[unmatched].tolist(),
+        ):
+            score = self._one_time_model_confidence(classifications.get(desc))
+            if score is None:
+                continue
+            suggestions.append(
+                AdjustmentSuggestion(
+                    suggestion_id=f"one_time_{row_id}",
+                    transaction_ids=[row_id],
+                    adjustment_category=AdjustmentCategory.ONE_TIME_EXPENSE,
+                    suggested_amount=-amount,
+                    add_back=True,
+                    confidence_score=score,
+                    confidence_level=_confidence_level(score),
+                    reasoning="Model classified the description as a one-time expense",
+                    supporting_evidence=[desc],
+                    created_at=created_at,
+                )
+            )
+
+        return suggestions
+
+    def _one_time_model_confidence(
+        self, classification: Optional[Dict[str, Any]]
+    ) -> Optional[float]:
+        """
+        Confidence of a model classification as a one-time expense.
+
+        Args:
+            classification: Parsed model output ({"category", "confidence"}) or None
+
+        Returns:
+            Confidence in [0, 1], or None if the description was not classified
+            as a one-time expense above min_confidence_threshold
+        """
+        if not classification:
+            return None
+        if classification.get("category") != AdjustmentCategory.ONE_TIME_EXPENSE.value:
+            return None
+        try:
+            score = min(max(float(classification.get("confidence", 0.0)), 0.0), 1.0)
+        except (TypeError, ValueError):
+            return None
+        return score if score >= self.min_confidence_threshold else None
 
     def suggest_discretionary_expenses(
         self,
         normalized_df: pd.DataFrame,
         account_column: str = "account_name_flat",
         amount_column: str = "amount_net",
+    ) -> List[AdjustmentSuggestion]:
+        """Synchronous wrapper around asuggest_discretionary_expenses"""
+        return asyncio.run(
+            self.asuggest_discretionary_expenses(
+                normalized_df, account_column, amount_column
+            )
+        )
+
+    async def asuggest_discretionary_expenses(
+        self,
+        normalized_df: pd.DataFrame,
+        account_column: str = "account_name_flat",
+        amount_column: str = "amount_net",
+        features: Optional[_TxnFeatures] = None,
+        created_at: Optional[datetime] = None,
     ) -> List[AdjustmentSuggestion]:
         """
         Generate suggestions for discretionary expenses.
 
         Identifies expenses that are discretionary and could be normalized
         for EBITDA calculations (e.g., excessive marketing spend, owner perks).
+        Currently flags transactions more than OUTLIER_ZSCORE standard
+        deviations above their account's mean, suggesting the excess over
+        the mean as a low-confidence normalization.
 
         Args:
             normalized_df: Normalized GL DataFrame
             account_column: Column name for account names
             amount_column: Column name for transaction amounts
+            features: Pre-extracted transaction features (built from the frame if None)
+            created_at: Timestamp shared by all suggestions (default: now)
 
         Returns:
             List of AdjustmentSuggestion objects for discretionary expenses
-
-        TODO: Implement discretionary expense detection:
-              1. Analyze account categories for discretionary spending
-              2. Compare amounts against industry benchmarks
-              3. Use LLM to understand context and suggest normalization
         """
-        # TODO: Implement discretionary expense detection
-        return []
+        if normalized_df.empty or account_column not in normalized_df.columns:
+            return []
+        if features is None:
+            features = _TxnFeatures.from_frame(
+                normalized_df, account_column=account_column, amount_column=amount_column
+            )
+
+        # Per-account mean/std/count via bincount over the account codes
+        valid = (features.account_code >= 0) & ~np.isnan(features.amount)
+        codes = features.account_code[valid]
+        amounts = features.amount[valid]
+        n_accounts = len(features.account_names)
+        count = np.bincount(codes, minlength=n_accounts)
+        total = np.bincount(codes, weights=amounts, minlength=n_accounts)
+        mean = total / np.maximum(count, 1)
+        row_mean = mean[codes]
+        # Second pass over deviations: E[x^2] - mean^2 cancels catastrophically
+        # for large amounts with a small spread
+        squared_dev = np.bincount(codes, weights=(amounts - row_mean) ** 2, minlength=n_accounts)
+        # Population std (ddof=0), matching np.std's default
+        ddof = 0
+        std = np.sqrt(squared_dev / np.maximum(count - ddof, 1))
+
+        # Account-level conditions are decided once per account, then gathered
+        eligible = (count >= MIN_ACCOUNT_TRANSACTIONS) & (std > 0)
+        row_std = std[codes]
+        flagged = eligible[codes] & (amounts - row_mean > OUTLIER_ZSCORE * row_std)
+        positions = np.flatnonzero(valid)[flagged]
+
+        if created_at is None:
+            created_at = datetime.now()
+
+        suggestions = []
+        for position, amount, acct_mean, acct_std in zip(
+            positions.tolist(),
+            amounts[flagged].tolist(),
+            row_mean[flagged].tolist(),
+            row_std[flagged].tolist(),
+        ):
+            row_id = features.row_id[position].item()
+            account = features.account_names[features.account_code[position]]
+            zscore = (amount - acct_mean) / acct_std
+            suggestions.append(
+                AdjustmentSuggestion(
+                    suggestion_id=f"discretionary_{row_id}",
+                    transaction_ids=[row_id],
+                    adjustment_category=AdjustmentCategory.DISCRETIONARY_EXPENSE,
+                    suggested_amount=-(amount - acct_mean),
+                    add_back=True,
+                    confidence_score=OUTLIER_CONFIDENCE,
+                    confidence_level=SuggestionConfidence.LOW,
+                    reasoning=(
+                        f"{amount:,.2f} is {zscore:.1f} standard deviations above "
+                        f"the {account} average of {acct_mean:,.2f}"
+                    ),
+                    supporting_evidence=[account],
+                    created_at=created_at,
+                )
+            )
+        return suggestions
 
     def suggest_owner_compensation_adjustments(
         self,
         normalized_df: pd.DataFrame,
         account_column: str = "account_name_flat",
+    ) -> List[AdjustmentSuggestion]:
+        """Synchronous wrapper around asuggest_owner_compensation_adjustments"""
+        return asyncio.run(
+            self.asuggest_owner_compensation_adjustments(normalized_df, account_column)
+        )
+
+    async def asuggest_owner_compensation_adjustments(
+        self,
+        normalized_df: pd.DataFrame,
+        account_column: str = "account_name_flat",
+        features: Optional[_TxnFeatures] = None,
     ) -> List[AdjustmentSuggestion]:
         """
         Generate suggestions for owner compensation adjustments.
@@ -288,6 +1097,7 @@ class AdjustmentSuggestionEngine:
         Args:
             normalized_df: Normalized GL DataFrame
             account_column: Column name for account names
+            features: Pre-extracted transaction features (built from the frame if None)
 
         Returns:
             List of AdjustmentSuggestion objects for owner compensation
@@ -300,6 +1110,129 @@ class AdjustmentSuggestionEngine:
         # TODO: Implement owner compensation detection
         return []
 
+    async def _classify_descriptions(
+        self, descriptions: List[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Classify unique descriptions, batch_size descriptions per model call.
+
+        Cached classifications are reused; only misses are sent to the model.
+
+        Args:
+            descriptions: Unique transaction descriptions
+
+        Returns:
+            Dict mapping each description to its classification (or None)
+        """
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        misses: List[str] = []
+        for desc in descriptions:
+            cached = self.classification_cache.get((hash_text(desc), self.model_name))
+            if cached is not None:
+                results[desc] = cached
+            else:
+                misses.append(desc)
+
+        chunks = [
+            misses[i : i + self.batch_size] for i in range(0, len(misses), self.batch_size)
+        ]
+        outputs = await self._gather_bounded(self._classify_batch(c) for c in chunks)
+
+        for chunk, output in zip(chunks, outputs):
+            if isinstance(output, BaseException):
+                output = [None] * len(chunk)
+            for desc, classification in zip(chunk, output):
+                results[desc] = classification
+                if classification is not None:
+                    self.classification_cache.put(
+                        (hash_text(desc), self.model_name), classification
+                    )
+
+        return results
+
+    async def _classify_batch(self, descriptions: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Classify a batch of descriptions with a single model call.
+
+        Args:
+            descriptions: Up to batch_size descriptions
+
+        Returns:
+            One classification (or None) per description, in order
+
+        TODO: Add a hosted LLM backend
+        """
+        if self.classify_fn is not None and self.executor != "asyncio":
+            # Blocking SDK: run in the worker pool, outside the event loop (and
+            # outside the GIL for "process")
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_pool(), _classify_one, self.classify_fn, list(descriptions)
+            )
+        if self.backend is None:
+            return [None] * len(descriptions)
+        response = await self.backend.generate(self._build_batch_prompt(descriptions))
+        return self._parse_batch_response(response, len(descriptions))
+
+    @staticmethod
+    def _build_batch_prompt(descriptions: List[str]) -> str:
+        """Build a prompt asking for one JSON classification per description"""
+        lines = [f"{i}) {desc}" for i, desc in enumerate(descriptions, start=1)]
+        categories = ", ".join(cat.value for cat in AdjustmentCategory)
+        return (
+            "Classify each GL transaction description into one of: "
+            f"{categories}.\n"
+            "Respond with a JSON array containing one object per item, in order, "
+            'with keys "category" and "confidence" (0.0 to 1.0).\n'
+            "Classify each:\n" + "\n".join(lines)
+        )
+
+    @staticmethod
+    def _parse_batch_response(
+        response: str | bytes, expected: int
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parse a JSON array reply from the model.
+
+        Args:
+            response: Raw model reply
+            expected: Number of descriptions in the batch
+
+        Returns:
+            Classifications padded/truncated to expected length (None if unparseable)
+        """
+        try:
+            parsed = orjson.loads(response) if orjson is not None else json.loads(response)
+        except ValueError:
+            return [None] * expected
+
+        if not isinstance(parsed, list):
+            return [None] * expected
+
+        items = [item if isinstance(item, dict) else None for item in parsed[:expected]]
+        return items + [None] * (expected - len(items))
+
+    async def _gather_bounded(self, coros: Iterable[Awaitable[Any]]) -> List[Any]:
+        """
+        Await coroutines concurrently, at most max_concurrency at a time.
+
+        Exceptions are returned in place of results so one failed model call
+        does not cancel the rest of the batch.
+
+        Args:
+            coros: Coroutines to run (e.g. _classify_batch calls)
+
+        Returns:
+            Results in the same order as coros
+        """
+        sem = asyncio.Semaphore(self.max_concurrency)
+
+        async def _run(coro: Awaitable[Any]) -> Any:
+            async with sem:
+                return await coro
+
+        return await asyncio.gather(*(_run(c) for c in coros), return_exceptions=True)
+
     def _calculate_confidence_score(
         self,
         model_output: Dict[str, Any],
@@ -9,11 +9,29 @@ TODO: Implement actual clustering algorithms (e.g., LLM-based semantic clusterin
        embedding-based similarity, or traditional ML approaches).
 """
 
+import asyncio
+
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Optional, Any
+from pathlib import Path
+from typing import List, Dict, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from app.ai._ann import connected_components, knn_graph
+from app.ai._embedding_cache import EmbeddingCache, embed_with_cache
+from app.ai._frames import (
+    datetime_array,
+    float_array,
+    has_column,
+    row_id_array,
+    string_array,
+)
+from app.ai._soa import LazyRecordList, csr_filter, csr_from_lists, object_array
+from app.utils.jit import njit
+
+_NS_PER_DAY = 86_400_000_000_000
+
 
 class ClusteringMethod(str, Enum):
     """Available clustering methods (for future implementation)"""
@@ -24,7 +42,58 @@ class ClusteringMethod(str, Enum):
     HYBRID = "hybrid"  # Combination of methods
 
 
-@dataclass
+@njit(cache=True)
+def _score_periodicity(dates, amounts, tol_days, min_size, max_size):
+    """
+    Assign recurring-payment cluster labels in one pass.
+
+    Expects rows sorted by (amount, date). A run of equal amounts whose
+    successive date gaps stay within tol_days of the first gap is a
+    recurring cluster.
+
+    Args:
+        dates: int64 day numbers, sorted within each amount
+        amounts: int64 amounts in cents, sorted
+        tol_days: Allowed deviation from the run's interval, in days
+        min_size: Minimum run length to label
+        max_size: Maximum run length (0 = no limit)
+
+    Returns:
+        int64 labels aligned with the input (-1 = not recurring)
+    """
+    n = dates.shape[0]
+    labels = np.full(n, -1, dtype=np.int64)
+    next_label = 0
+    start = 0
+    while start < n:
+        end = start + 1
+        interval = -1
+        while end < n and amounts[end] == amounts[start]:
+            if max_size > 0 and end - start >= max_size:
+                break
+            gap = dates[end] - dates[end - 1]
+            if gap <= 0:
+                break
+            if interval < 0:
+                interval = gap
+            elif abs(gap - interval) > tol_days:
+                break
+            end += 1
+
+        if end - start >= min_size:
+            for i in range(start, end):
+                labels[i] = next_label
+            next_label += 1
+            start = end
+        elif end - start > 1:
+            # The last row of a broken run may start the next one
+            start = end - 1
+        else:
+            start = end
+    return labels
+
+
+@dataclass(slots=True)
 class TransactionCluster:
     """Represents a cluster of related transactions"""
 
@@ -63,7 +132,222 @@ class TransactionCluster:
         }
 
 
+def _segment_stats(
+    amounts: np.ndarray, dates: Optional[np.ndarray], boundaries: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-segment totals, counts and date ranges in one reduceat pass each.
+
+    Rows must already be sorted so each cluster is a contiguous segment
+    starting at the given boundaries.
+
+    Args:
+        amounts: Sorted transaction amounts
+        dates: Sorted datetime64[ns] dates, or None
+        boundaries: Start index of each segment
+
+    Returns:
+        (totals, counts, date_min, date_max); dates are NaT when unknown
+    """
+    n_segments = len(boundaries)
+    counts = np.diff(np.append(boundaries, len(amounts)))
+    if n_segments == 0:
+        nat = np.empty(0, dtype="datetime64[ns]")
+        return np.empty(0), counts, nat, nat.copy()
+
+    totals = np.add.reduceat(amounts, boundaries)
+    if dates is None:
+        nat = np.full(n_segments, np.datetime64("NaT"), dtype="datetime64[ns]")
+        return totals, counts, nat, nat.copy()
+
+    # NaT is the int64 minimum; swap it for sentinels that never win min/max
+    i8 = dates.view(np.int64)
+    missing = np.isnat(dates)
+    big = np.iinfo(np.int64).max
+    dmin = np.minimum.reduceat(np.where(missing, big, i8), boundaries)
+    dmax = np.maximum.reduceat(i8, boundaries)  # NaT (int64 min) never wins max
+    dmin[dmin == big] = np.iinfo(np.int64).min
+    return totals, counts, dmin.view("datetime64[ns]"), dmax.view("datetime64[ns]")
+
+
+def _iso_or_none(values: np.ndarray) -> List[Optional[str]]:
+    """Format a datetime64 array as ISO strings (None for NaT)"""
+    strings = np.datetime_as_string(values.astype("datetime64[s]"), unit="s")
+    return [None if v == "NaT" else v for v in strings.tolist()]
+
+
 @dataclass
+class ClusterColumns:
+    """
+    Column-oriented (struct-of-arrays) storage for a batch of clusters.
+
+    Transaction ids are stored CSR-style: the ids of cluster i are
+    txn_id_values[txn_id_offsets[i]:txn_id_offsets[i + 1]].
+    """
+
+    cluster_id: np.ndarray  # object
+    cluster_name: np.ndarray  # object
+    total_amount: np.ndarray  # float64
+    transaction_count: np.ndarray  # int64
+    txn_id_values: np.ndarray  # int64
+    txn_id_offsets: np.ndarray  # int64, len(clusters) + 1
+    date_range_start: np.ndarray  # datetime64[ns], NaT if unknown
+    date_range_end: np.ndarray  # datetime64[ns], NaT if unknown
+    confidence_score: np.ndarray  # float64
+    cluster_reasoning: np.ndarray  # object
+    common_accounts: np.ndarray  # object (lists)
+    common_keywords: np.ndarray  # object (lists)
+    metadata: np.ndarray  # object (dicts)
+
+    def __len__(self) -> int:
+        return len(self.cluster_id)
+
+    @classmethod
+    def build(
+        cls,
+        cluster_id: np.ndarray,
+        cluster_name: np.ndarray,
+        total_amount: np.ndarray,
+        txn_id_values: np.ndarray,
+        txn_id_offsets: np.ndarray,
+        date_range_start: Optional[np.ndarray] = None,
+        date_range_end: Optional[np.ndarray] = None,
+        confidence_score: Optional[np.ndarray] = None,
+        cluster_reasoning: Optional[np.ndarray] = None,
+        common_accounts: Optional[np.ndarray] = None,
+        common_keywords: Optional[np.ndarray] = None,
+        metadata: Optional[np.ndarray] = None,
+    ) -> "ClusterColumns":
+        """Build columns, filling optional fields with their defaults"""
+        n = len(cluster_id)
+        nat = np.full(n, np.datetime64("NaT"), dtype="datetime64[ns]")
+        return cls(
+            cluster_id=object_array(cluster_id),
+            cluster_name=object_array(cluster_name),
+            total_amount=np.asarray(total_amount, dtype=np.float64),
+            transaction_count=np.diff(txn_id_offsets).astype(np.int64),
+            txn_id_values=np.asarray(txn_id_values, dtype=np.int64),
+            txn_id_offsets=np.asarray(txn_id_offsets, dtype=np.int64),
+            date_range_start=nat if date_range_start is None else date_range_start,
+            date_range_end=nat.copy() if date_range_end is None else date_range_end,
+            confidence_score=(
+                np.zeros(n) if confidence_score is None else confidence_score
+            ),
+            cluster_reasoning=(
+                object_array([""] * n) if cluster_reasoning is None else cluster_reasoning
+            ),
+            common_accounts=(
+                object_array([[] for _ in range(n)]) if common_accounts is None else common_accounts
+            ),
+            common_keywords=(
+                object_array([[] for _ in range(n)]) if common_keywords is None else common_keywords
+            ),
+            metadata=object_array([{} for _ in range(n)]) if metadata is None else metadata,
+        )
+
+    @classmethod
+    def from_clusters(cls, clusters: List[TransactionCluster]) -> "ClusterColumns":
+        """Convert a list of TransactionCluster objects to columns"""
+        values, offsets = csr_from_lists(c.transaction_ids for c in clusters)
+        columns = cls.build(
+            cluster_id=[c.cluster_id for c in clusters],
+            cluster_name=[c.cluster_name for c in clusters],
+            total_amount=[c.total_amount for c in clusters],
+            txn_id_values=values,
+            txn_id_offsets=offsets,
+            date_range_start=np.array(
+                [c.date_range_start for c in clusters], dtype="datetime64[ns]"
+            ),
+            date_range_end=np.array([c.date_range_end for c in clusters], dtype="datetime64[ns]"),
+            confidence_score=np.array([c.confidence_score for c in clusters], dtype=np.float64),
+            cluster_reasoning=object_array(c.cluster_reasoning for c in clusters),
+            common_accounts=object_array(c.common_accounts for c in clusters),
+            common_keywords=object_array(c.common_keywords for c in clusters),
+            metadata=object_array(c.metadata for c in clusters),
+        )
+        columns.transaction_count = np.array(
+            [c.transaction_count for c in clusters], dtype=np.int64
+        )
+        return columns
+
+    def transaction_ids(self, index: int) -> np.ndarray:
+        """Transaction ids of cluster index"""
+        return self.txn_id_values[self.txn_id_offsets[index] : self.txn_id_offsets[index + 1]]
+
+    def cluster(self, index: int) -> TransactionCluster:
+        """Materialize a single TransactionCluster"""
+        start = self.date_range_start[index]
+        end = self.date_range_end[index]
+        return TransactionCluster(
+            cluster_id=self.cluster_id[index],
+            cluster_name=self.cluster_name[index],
+            transaction_ids=self.transaction_ids(index).tolist(),
+            total_amount=float(self.total_amount[index]),
+            transaction_count=int(self.transaction_count[index]),
+            date_range_start=None if np.isnat(start) else pd.Timestamp(start),
+            date_range_end=None if np.isnat(end) else pd.Timestamp(end),
+            common_accounts=self.common_accounts[index],
+            common_keywords=self.common_keywords[index],
+            confidence_score=float(self.confidence_score[index]),
+            cluster_reasoning=self.cluster_reasoning[index],
+            metadata=self.metadata[index],
+        )
+
+    def filter(self, mask: np.ndarray) -> "ClusterColumns":
+        """Keep only the clusters selected by a boolean mask"""
+        values, offsets = csr_filter(self.txn_id_values, self.txn_id_offsets, mask)
+        return ClusterColumns(
+            cluster_id=self.cluster_id[mask],
+            cluster_name=self.cluster_name[mask],
+            total_amount=self.total_amount[mask],
+            transaction_count=self.transaction_count[mask],
+            txn_id_values=values,
+            txn_id_offsets=offsets,
+            date_range_start=self.date_range_start[mask],
+            date_range_end=self.date_range_end[mask],
+            confidence_score=self.confidence_score[mask],
+            cluster_reasoning=self.cluster_reasoning[mask],
+            common_accounts=self.common_accounts[mask],
+            common_keywords=self.common_keywords[mask],
+            metadata=self.metadata[mask],
+        )
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Convert to a list of dictionaries shaped like TransactionCluster.to_dict"""
+        offsets = self.txn_id_offsets.tolist()
+        ids = self.txn_id_values.tolist()
+        keys = (
+            "cluster_id",
+            "cluster_name",
+            "transaction_ids",
+            "total_amount",
+            "transaction_count",
+            "date_range_start",
+            "date_range_end",
+            "common_accounts",
+            "common_keywords",
+            "confidence_score",
+            "cluster_reasoning",
+            "metadata",
+        )
+        rows = zip(
+            self.cluster_id.tolist(),
+            self.cluster_name.tolist(),
+            (ids[offsets[i] : offsets[i + 1]] for i in range(len(self))),
+            self.total_amount.tolist(),
+            self.transaction_count.tolist(),
+            _iso_or_none(self.date_range_start),
+            _iso_or_none(self.date_range_end),
+            self.common_accounts.tolist(),
+            self.common_keywords.tolist(),
+            self.confidence_score.tolist(),
+            self.cluster_reasoning.tolist(),
+            self.metadata.tolist(),
+        )
+        return [dict(zip(keys, row)) for row in rows]
+
+
+@dataclass(slots=True)
 class ClusteringResult:
     """Result of transaction clustering operation"""
 
@@ -74,11 +358,25 @@ class ClusteringResult:
     clustering_method: ClusteringMethod
     processing_time_seconds: Optional[float] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    columns: Optional[ClusterColumns] = field(default=None, repr=False)
+
+    @classmethod
+    def from_columns(cls, columns: ClusterColumns, **kwargs: Any) -> "ClusteringResult":
+        """Create a result backed by columns; clusters are materialized lazily"""
+        return cls(
+            clusters=LazyRecordList(len(columns), columns.cluster),
+            columns=columns,
+            **kwargs,
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert clustering result to dictionary"""
         return {
-            "clusters": [cluster.to_dict() for cluster in self.clusters],
+            "clusters": (
+                self.columns.to_records()
+                if self.columns is not None
+                else [cluster.to_dict() for cluster in self.clusters]
+            ),
             "unclustered_transaction_ids": self.unclustered_transaction_ids,
             "total_transactions": self.total_transactions,
             "clustered_transactions": self.clustered_transactions,
@@ -116,6 +414,8 @@ class TransactionClusterer:
         min_cluster_size: int = 2,
         max_cluster_size: Optional[int] = None,
         similarity_threshold: float = 0.7,
+        cache_path: Optional[str | Path] = None,
+        quantize_embeddings: bool = True,
     ):
         """
         Initialize transaction clusterer.
@@ -125,11 +425,16 @@ class TransactionClusterer:
             min_cluster_size: Minimum number of transactions per cluster
             max_cluster_size: Maximum number of transactions per cluster (None = no limit)
             similarity_threshold: Minimum similarity score for clustering (0.0 to 1.0)
+            cache_path: Optional SQLite file to persist description embeddings
+            quantize_embeddings: Hold embeddings as int8 during exact (non-HNSW)
+                similarity search
         """
         self.method = method
         self.min_cluster_size = min_cluster_size
         self.max_cluster_size = max_cluster_size
         self.similarity_threshold = similarity_threshold
+        self.embedding_cache = EmbeddingCache(path=cache_path, table="embeddings")
+        self.quantize_embeddings = quantize_embeddings
 
     def cluster_transactions(
         self,
@@ -171,9 +476,7 @@ class TransactionClusterer:
         # For now, return empty result structure
         return ClusteringResult(
             clusters=[],
-            unclustered_transaction_ids=normalized_df["row_id"].tolist()
-            if "row_id" in normalized_df.columns
-            else list(range(len(normalized_df))),
+            unclustered_transaction_ids=row_id_array(normalized_df).tolist(),
             total_transactions=len(normalized_df),
             clustered_transactions=0,
             clustering_method=self.method,
@@ -183,78 +486,294 @@ class TransactionClusterer:
         self,
         normalized_df: pd.DataFrame,
         account_column: str = "account_name_flat",
+        amount_column: str = "amount_net",
+        date_column: str = "date",
     ) -> ClusteringResult:
         """
         Cluster transactions by account patterns.
 
         Groups transactions that share similar account structures or patterns.
         Useful for identifying recurring expenses in similar account categories.
+        Currently groups by exact account name; per-account totals, counts and
+        date ranges are computed in a single sorted NumPy pass.
 
         Args:
-            normalized_df: Normalized GL DataFrame
+            normalized_df: Normalized GL DataFrame (pandas or polars)
             account_column: Column name for account names
+            amount_column: Column name for transaction amounts
+            date_column: Column name for transaction dates (optional)
 
         Returns:
             ClusteringResult with account-based clusters
 
-        TODO: Implement account pattern recognition
+        TODO: Group similar (not just identical) account names
         """
-        # TODO: Implement account pattern clustering
-        return self.cluster_transactions(normalized_df, account_column=account_column)
+        row_ids = row_id_array(normalized_df)
+        accounts = string_array(normalized_df, account_column)
+        amts = float_array(normalized_df, amount_column, fill=0.0)
+        dates = (
+            datetime_array(normalized_df, date_column)
+            if has_column(normalized_df, date_column)
+            else None
+        )
+
+        clustered = np.zeros(len(normalized_df), dtype=bool)
+        columns = ClusterColumns.build(
+            cluster_id=[],
+            cluster_name=[],
+            total_amount=[],
+            txn_id_values=np.empty(0, dtype=np.int64),
+            txn_id_offsets=np.zeros(1, dtype=np.int64),
+        )
+        if len(accounts):
+            codes, inv = np.unique(accounts, return_inverse=True)
+            order = np.argsort(inv, kind="stable")
+            sorted_inv = inv[order]
+            boundaries = np.concatenate(([0], np.flatnonzero(np.diff(sorted_inv)) + 1))
+            totals, counts, dmin, dmax = _segment_stats(
+                amts[order], None if dates is None else dates[order], boundaries
+            )
+
+            keep = counts >= self.min_cluster_size
+            if self.max_cluster_size is not None:
+                keep &= counts <= self.max_cluster_size
+            member_mask = np.repeat(keep, counts)
+            members = order[member_mask]
+            clustered[members] = True
+
+            kept_counts = counts[keep]
+            offsets = np.zeros(len(kept_counts) + 1, dtype=np.int64)
+            np.cumsum(kept_counts, out=offsets[1:])
+            names = codes[sorted_inv[boundaries[keep]]].tolist()
+            columns = ClusterColumns.build(
+                cluster_id=[f"account_{i}" for i in range(len(names))],
+                cluster_name=names,
+                total_amount=totals[keep],
+                txn_id_values=row_ids[members],
+                txn_id_offsets=offsets,
+                date_range_start=dmin[keep],
+                date_range_end=dmax[keep],
+                cluster_reasoning=object_array(
+                    f"{count} transactions posted to {name}"
+                    for count, name in zip(kept_counts.tolist(), names)
+                ),
+                common_accounts=object_array([name] for name in names),
+            )
+
+        return ClusteringResult.from_columns(
+            columns,
+            unclustered_transaction_ids=row_ids[~clustered].tolist(),
+            total_transactions=len(normalized_df),
+            clustered_transactions=int(clustered.sum()),
+            clustering_method=ClusteringMethod.RULE_BASED,
+        )
 
     def cluster_by_time_pattern(
         self,
         normalized_df: pd.DataFrame,
         date_column: str = "date",
         amount_column: str = "amount_net",
+        tolerance_days: int = 3,
     ) -> ClusteringResult:
         """
         Cluster transactions by temporal patterns.
 
         Identifies recurring transactions based on time intervals and amounts.
         Useful for finding monthly subscriptions, quarterly payments, etc.
+        Transactions with the same amount recurring at a steady interval
+        (within tolerance_days) form one cluster.
 
         Args:
-            normalized_df: Normalized GL DataFrame
+            normalized_df: Normalized GL DataFrame (pandas or polars)
             date_column: Column name for transaction dates
             amount_column: Column name for transaction amounts
+            tolerance_days: Allowed jitter in the recurrence interval, in days
 
         Returns:
             ClusteringResult with time-pattern-based clusters
-
-        TODO: Implement time-series pattern recognition
         """
-        # TODO: Implement time pattern clustering
-        return self.cluster_transactions(
-            normalized_df, date_column=date_column, amount_column=amount_column
+        row_ids = row_id_array(normalized_df)
+        dates = datetime_array(normalized_df, date_column)
+        amts = float_array(normalized_df, amount_column)
+
+        valid = ~np.isnat(dates) & ~np.isnan(amts)
+        dates_i8 = dates[valid].view("i8") // _NS_PER_DAY
+        cents = np.round(amts[valid] * 100).astype(np.int64)
+        valid_ids = row_ids[valid]
+
+        order = np.lexsort((dates_i8, cents))
+        labels = _score_periodicity(
+            np.ascontiguousarray(dates_i8[order]),
+            np.ascontiguousarray(cents[order]),
+            tolerance_days,
+            max(self.min_cluster_size, 2),
+            self.max_cluster_size or 0,
+        )
+
+        sorted_ids = valid_ids[order]
+        sorted_dates = dates[valid][order]
+        sorted_amts = amts[valid][order]
+
+        labeled = np.flatnonzero(labels >= 0)
+        segments = (
+            np.split(labeled, np.flatnonzero(np.diff(labels[labeled])) + 1) if len(labeled) else []
+        )
+        firsts = np.array([seg[0] for seg in segments], dtype=np.int64)
+        offsets = np.zeros(len(segments) + 1, dtype=np.int64)
+        np.cumsum([len(seg) for seg in segments], out=offsets[1:])
+        totals, counts, dmin, dmax = _segment_stats(
+            sorted_amts[labeled], sorted_dates[labeled], offsets[:-1]
+        )
+
+        intervals = (
+            (sorted_dates[firsts + 1] - sorted_dates[firsts]) // np.timedelta64(1, "D")
+        ).tolist()
+        amounts = sorted_amts[firsts].tolist()
+        columns = ClusterColumns.build(
+            cluster_id=[f"time_{i}" for i in range(len(segments))],
+            cluster_name=[
+                f"Recurring {amount:,.2f} every ~{interval} days"
+                for amount, interval in zip(amounts, intervals)
+            ],
+            total_amount=totals,
+            txn_id_values=sorted_ids[labeled],
+            txn_id_offsets=offsets,
+            date_range_start=dmin,
+            date_range_end=dmax,
+            cluster_reasoning=object_array(
+                f"{count} transactions of {amount:,.2f} spaced ~{interval} days apart"
+                for count, amount, interval in zip(counts.tolist(), amounts, intervals)
+            ),
+            metadata=object_array({"interval_days": interval} for interval in intervals),
+        )
+
+        clustered_ids = set(sorted_ids[labeled].tolist())
+        return ClusteringResult.from_columns(
+            columns,
+            unclustered_transaction_ids=[
+                rid for rid in row_ids.tolist() if rid not in clustered_ids
+            ],
+            total_transactions=len(normalized_df),
+            clustered_transactions=len(clustered_ids),
+            clustering_method=ClusteringMethod.RULE_BASED,
         )
 
     def cluster_by_semantic_similarity(
         self,
         normalized_df: pd.DataFrame,
         description_column: str = "description",
+        amount_column: str = "amount_net",
+        date_column: str = "date",
+        n_neighbors: int = 10,
     ) -> ClusteringResult:
         """
         Cluster transactions by semantic similarity of descriptions.
 
         Uses AI/LLM to understand the meaning of transaction descriptions
         and group similar transactions together, even if wording differs.
+        Distinct descriptions are embedded once, linked to their n_neighbors
+        nearest neighbors (HNSW index when hnswlib is installed) and the
+        links with similarity >= similarity_threshold are merged into
+        clusters with union-find, avoiding an N x N similarity matrix.
 
         Args:
-            normalized_df: Normalized GL DataFrame
+            normalized_df: Normalized GL DataFrame (pandas or polars)
             description_column: Column name for transaction descriptions
+            amount_column: Column name for transaction amounts
+            date_column: Column name for transaction dates (optional)
+            n_neighbors: Neighbors considered per distinct description
 
         Returns:
             ClusteringResult with semantically similar clusters
 
-        TODO: Implement semantic similarity clustering:
-              1. Generate embeddings for transaction descriptions using LLM
-              2. Calculate cosine similarity between embeddings
-              3. Group transactions with similarity above threshold
-              4. Generate cluster names using LLM summarization
+        TODO: Generate cluster names using LLM summarization
         """
-        # TODO: Implement semantic similarity clustering
-        return self.cluster_transactions(
-            normalized_df, description_column=description_column
+        row_ids = row_id_array(normalized_df)
+        descriptions = string_array(normalized_df, description_column)
+        # Blank descriptions get code -1 and never cluster
+        codes, uniques = pd.factorize(np.where(descriptions == "", None, descriptions))
+        embeddings = asyncio.run(self._embed_batch(list(uniques)))
+
+        if embeddings.ndim != 2 or embeddings.shape[1] == 0:
+            # No embedding model configured yet
+            return self.cluster_transactions(
+                normalized_df, description_column=description_column
+            )
+
+        neighbors, distances = knn_graph(
+            embeddings, k=n_neighbors, quantize=self.quantize_embeddings
+        )
+        src = np.repeat(np.arange(len(uniques)), neighbors.shape[1])
+        dst = neighbors.ravel()
+        linked = distances.ravel() <= 1 - self.similarity_threshold
+        components = connected_components(len(uniques), src[linked], dst[linked])
+
+        amts = float_array(normalized_df, amount_column, fill=0.0)
+        dates = (
+            datetime_array(normalized_df, date_column)
+            if has_column(normalized_df, date_column)
+            else None
+        )
+
+        candidates = np.flatnonzero(codes >= 0)
+        row_labels = components[codes[candidates]]
+        order = candidates[np.argsort(row_labels, kind="stable")]
+        sorted_labels = components[codes[order]]
+        boundaries = np.flatnonzero(np.diff(sorted_labels, prepend=-1))
+        totals, counts, dmin, dmax = _segment_stats(
+            amts[order], None if dates is None else dates[order], boundaries
+        )
+
+        keep = counts >= self.min_cluster_size
+        if self.max_cluster_size is not None:
+            keep &= counts <= self.max_cluster_size
+        members = order[np.repeat(keep, counts)]
+        kept_counts = counts[keep]
+        offsets = np.zeros(len(kept_counts) + 1, dtype=np.int64)
+        np.cumsum(kept_counts, out=offsets[1:])
+
+        # The component root is the first-seen description; use it as the name
+        names = uniques[sorted_labels[boundaries[keep]]].tolist()
+        columns = ClusterColumns.build(
+            cluster_id=[f"semantic_{i}" for i in range(len(names))],
+            cluster_name=names,
+            total_amount=totals[keep],
+            txn_id_values=row_ids[members],
+            txn_id_offsets=offsets,
+            date_range_start=dmin[keep],
+            date_range_end=dmax[keep],
+            confidence_score=np.full(len(names), self.similarity_threshold),
+            cluster_reasoning=object_array(
+                f"{count} transactions with descriptions similar to '{name}'"
+                for count, name in zip(kept_counts.tolist(), names)
+            ),
         )
 
+        clustered = np.zeros(len(row_ids), dtype=bool)
+        clustered[members] = True
+        return ClusteringResult.from_columns(
+            columns,
+            unclustered_transaction_ids=row_ids[~clustered].tolist(),
+            total_transactions=len(row_ids),
+            clustered_transactions=int(clustered.sum()),
+            clustering_method=ClusteringMethod.SEMANTIC_SIMILARITY,
+        )
+
+    async def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of normalized descriptions.
+
+        Args:
+            texts: Normalized descriptions (cache misses only)
+
+        Returns:
+            Array of shape (len(texts), dim)
+
+        TODO: Call the embedding model's batch endpoint
+        """
+        # TODO: Implement embedding model call
+        return np.zeros((len(texts), 0), dtype=np.float32)
+
+    async def _embed_batch(self, texts: List[Any]) -> np.ndarray:
+        """Embed descriptions through the content-addressed embedding cache"""
+        return await embed_with_cache(self.embedding_cache, texts, self._embed_texts)
@@ -0,0 +1,121 @@
+"""
+Background databook job registry.
+
+Jobs live in the memory of the API process that accepted the upload, so
+with several workers the /jobs endpoints must be routed to the same worker
+(sticky sessions) or run with a single worker. Finished jobs and their
+output files are removed after a TTL, and the registry is capped in size.
+"""
+
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+# Finished jobs (and their databook files) are kept this long for download
+DEFAULT_JOB_TTL_SECONDS = 3600
+# Upper bound on tracked jobs; the oldest finished jobs are evicted first
+DEFAULT_MAX_JOBS = 1000
+
+
+class DatabookJobs:
+    """
+    Thread-safe registry of databook generation jobs.
+
+    Each job records the user that started it; lookups for another user's
+    job behave as if the job did not exist.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        clock=time.monotonic,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            ttl_seconds: Seconds a finished job is kept (default: DATABOOK_JOB_TTL_SECONDS
+                env var, else DEFAULT_JOB_TTL_SECONDS)
+            max_jobs: Maximum number of tracked jobs
+            clock: Monotonic time source (injectable for tests)
+        """
+        if ttl_seconds is None:
+            ttl_seconds = float(
+                os.getenv("DATABOOK_JOB_TTL_SECONDS", str(DEFAULT_JOB_TTL_SECONDS))
+            )
+        self.ttl_seconds = ttl_seconds
+        self.max_jobs = max_jobs
+        self._clock = clock
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, user_id: int) -> str:
+        """Register a pending job for user_id and return its id"""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._expire_locked(room=1)
+            self._jobs[job_id] = {"status": "pending", "user_id": user_id}
+        return job_id
+
+    def finish(self, job_id: str, path: str) -> None:
+        """Mark a job done with the path of its databook"""
+        self._update(job_id, status="done", path=path)
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Mark a job failed"""
+        self._update(job_id, status="failed", error=error)
+
+    def get(self, job_id: str, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job owned by user_id.
+
+        Returns:
+            Copy of the job record, or None if it is unknown, expired or
+            belongs to another user
+        """
+        with self._lock:
+            self._expire_locked()
+            job = self._jobs.get(job_id)
+            if job is None or job["user_id"] != user_id:
+                return None
+            return dict(job)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                # Evicted while running: nobody can download the result
+                _remove_file(fields.get("path"))
+                return
+            job.update(fields, finished_at=self._clock())
+
+    def _expire_locked(self, room: int = 0) -> None:
+        """Drop expired finished jobs, then the oldest ones beyond max_jobs - room"""
+        now = self._clock()
+        finished = [job_id for job_id, job in self._jobs.items() if "finished_at" in job]
+        expired = {
+            job_id
+            for job_id in finished
+            if now - self._jobs[job_id]["finished_at"] >= self.ttl_seconds
+        }
+        # Dicts keep insertion order, so finished lists jobs oldest first
+        overflow = len(self._jobs) - len(expired) - (self.max_jobs - room)
+        if overflow > 0:
+            expired.update([job_id for job_id in finished if job_id not in expired][:overflow])
+        for job_id in expired:
+            _remove_file(self._jobs.pop(job_id).get("path"))
+
+
+def _remove_file(path: Optional[str]) -> None:
+    if path:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
@@ -1,27 +1,41 @@
-from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import FileResponse
-from pydantic import BaseModel, EmailStr
+from fastapi.responses import FileResponse, JSONResponse, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, EmailStr, TypeAdapter, ValidationError
 from typing import Optional, List
 import sys
 from pathlib import Path
+import asyncio
 import tempfile
+import shutil
 import os
-import json
-from datetime import datetime
+import logging
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional speedup
+    pa = None
 
 project_root = Path(__file__).parent.parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from app.auth.auth import create_user, authenticate_user, get_user_by_id
+from app.auth.auth import acreate_user, aauthenticate_user, create_access_token, decode_access_token
 from app.project.project_manager import create_project, get_user_projects, get_project_by_id, delete_project
-from app.core.gl_pipeline import GLPipeline
-from app.core.mapping import MultiEntityProcessor
-from app.utils.file_manager import save_uploaded_file
-from app.excel.databook_generator import DatabookGenerator
-from app.core.mapping import GLAccountMapper
+from app.utils.file_manager import save_uploaded_file_from_path
+from app.database.models import db_dep
+from app.api.jobs import DatabookJobs
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="QoE Tool API",
@@ -29,38 +43,40 @@ app = FastAPI(
     version="1.0.0"
 )
 
-import os
-
-allowed_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000,*").split(",")
-allowed_origins = [origin.strip() for origin in allowed_origins]
+# Explicit allowlist only: "*" together with allow_credentials would let any
+# site make credentialed requests. Preview deployments can be matched with
+# CORS_ORIGIN_REGEX (e.g. https://.*\.amplifyapp\.com).
+allowed_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000").split(",")
+allowed_origins = [origin.strip() for origin in allowed_origins if origin.strip() not in ("", "*")]
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
+    allow_origin_regex=os.getenv("CORS_ORIGIN_REGEX") or None,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
-    expose_headers=["*"],
+    expose_headers=["Content-Disposition"],
 )
 
 security = HTTPBearer()
 
+# Opt-in for local/frontend-only setups: requests without a valid token act
+# as this user instead of getting 401 (unset = tokens are required)
+ANONYMOUS_USER_ID = os.getenv("ANONYMOUS_USER_ID")
+
 def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
-    try:
-        user_id = int(token)
-        # For frontend-only projects, allow any user_id without checking database
-        try:
-            user = get_user_by_id(user_id)
-            if user:
-                return user_id
-        except:
-            pass
-        # Return the user_id even if not in database (for frontend-only projects)
-        return user_id
-    except (ValueError, TypeError):
-        # Return default user ID for frontend-only projects
-        return 1
+    # The signature proves the token was issued at login, so no DB lookup
+    user_id = decode_access_token(credentials.credentials)
+    if user_id is None:
+        if ANONYMOUS_USER_ID:
+            return int(ANONYMOUS_USER_ID)
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user_id
 
 class SignUpRequest(BaseModel):
     email: EmailStr
@@ -76,6 +92,102 @@ class ProjectCreate(BaseModel):
     title: str
     description: Optional[str] = None
 
+class EntityConfig(BaseModel):
+    filename: str
+    entity_name: str
+
+# Parses and validates the entity_configs form field in one pass (pydantic-core)
+entity_configs_adapter = TypeAdapter(List[EntityConfig])
+
+def json_default(obj):
+    # Types orjson doesn't serialize natively (pandas Timestamp/NaT)
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def json_response(payload) -> Response:
+    # Trusted handler output: serialize straight to bytes, skipping jsonable_encoder
+    if orjson is None:
+        return JSONResponse(jsonable_encoder(payload))
+    return Response(
+        orjson.dumps(payload, default=json_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+        media_type="application/json",
+    )
+
+# Rows of processed data returned in the /process response
+PREVIEW_ROWS = 1000
+
+def preview_records(df, limit: int = PREVIEW_ROWS) -> list:
+    # Slice before converting; Arrow's to_pylist avoids pandas' per-cell Python loop
+    head = df.head(limit)
+    if pa is not None:
+        try:
+            return pa.Table.from_pandas(head, preserve_index=False).to_pylist()
+        except pa.ArrowException:
+            pass  # mixed-type object columns
+    return head.to_dict(orient="records")
+
+# Databook generation jobs (in-process, per-user, expired after a TTL)
+databook_jobs = DatabookJobs()
+
+def generate_databook_job(job_id: str, normalized_df, validation_result, processing_report,
+                          source_files: List[str]):
+    # Runs after the /process response has been sent (BackgroundTasks threadpool)
+    from app.core.mapping import GLAccountMapper
+    from app.excel.databook_generator import DatabookGenerator
+
+    try:
+        entity_info = None
+        if "entity" in normalized_df.columns:
+            entities = normalized_df["entity"].unique()
+            if len(entities) == 1:
+                entity_info = entities[0]
+        
+        mapper = GLAccountMapper()
+        auto_mapping_df = mapper.generate_auto_mapping_df(normalized_df, entity=entity_info)
+        
+        # Ensure output directory exists
+        output_dir = Path("output")
+        output_dir.mkdir(exist_ok=True)
+        
+        # One file per job: jobs finishing in the same second must not share
+        # (or, on expiry, delete) each other's databook
+        output_path = output_dir / f"GL_Databook_{job_id}.xlsx"
+        
+        generator = DatabookGenerator(break_formulas=False)
+        
+        output_path = generator.generate_databook(
+            output_path=str(output_path),
+            normalized_df=normalized_df,
+            validation_result=validation_result,
+            processing_report=processing_report,
+            source_files=source_files,
+            entity=entity_info,
+            mapping_df=auto_mapping_df
+        )
+        databook_jobs.finish(job_id, str(output_path))
+    except Exception as e:
+        # Runs off-request, so the log is the only trace of the failure
+        logger.exception("Databook generation failed for job %s", job_id)
+        databook_jobs.fail(job_id, str(e))
+
+# Copy buffer for streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Uploads persisted at once per request
+MAX_CONCURRENT_UPLOADS = 8
+
+def spool_upload(uploaded_file: UploadFile) -> str:
+    # Stream the upload to a temp file in chunks instead of reading it into memory
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp_file:
+        try:
+            shutil.copyfileobj(uploaded_file.file, tmp_file, length=UPLOAD_CHUNK_SIZE)
+        except BaseException:
+            # The caller never sees the path, so drop the partial file here
+            tmp_file.close()
+            os.unlink(tmp_file.name)
+            raise
+        return tmp_file.name
+
 @app.get("/")
 async def root():
     return {"message": "QoE Tool API", "version": "1.0.0"}
@@ -85,24 +197,25 @@ async def health():
     return {"status": "healthy"}
 
 @app.post("/auth/signup")
-async def signup(request: SignUpRequest):
-    user = create_user(
+async def signup(request: SignUpRequest, db: Session = Depends(db_dep)):
+    user = await acreate_user(
         email=request.email,
         username=request.username,
         password=request.password,
-        full_name=request.full_name
+        full_name=request.full_name,
+        db=db
     )
     if not user:
         raise HTTPException(status_code=400, detail="Email or username already exists")
     return {"message": "User created successfully", "user_id": user.id}
 
 @app.post("/auth/login")
-async def login(request: LoginRequest):
-    user = authenticate_user(request.email, request.password)
+async def login(request: LoginRequest, db: Session = Depends(db_dep)):
+    user = await aauthenticate_user(request.email, request.password, db=db)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
-    token = str(user.id)
+    token = create_access_token(user.id)
     return {
         "token": token,
         "user": {
@@ -113,20 +226,20 @@ async def login(request: LoginRequest):
         }
     }
 
-@app.get("/projects")
+@app.get("/projects", response_model=None)
 async def list_projects(user_id: int = Depends(get_current_user_id)):
     projects = get_user_projects(user_id)
-    return [
+    return json_response([
         {
             "id": p.id,
             "title": p.title,
             "description": p.description,
-            "created_at": p.created_at.isoformat() if p.created_at else None,
+            "created_at": p.created_at,
             "files": [{"id": f.id, "filename": f.filename} for f in (p.files or [])],
             "databooks": [{"id": d.id, "filename": d.filename} for d in (p.databooks or [])]
         }
         for p in projects
-    ]
+    ])
 
 @app.post("/projects")
 async def create_new_project(project: ProjectCreate, user_id: int = Depends(get_current_user_id)):
@@ -140,19 +253,19 @@ async def create_new_project(project: ProjectCreate, user_id: int = Depends(get_
         "created_at": new_project.created_at.isoformat() if new_project.created_at else None
     }
 
-@app.get("/projects/{project_id}")
+@app.get("/projects/{project_id}", response_model=None)
 async def get_project(project_id: int, user_id: int = Depends(get_current_user_id)):
     project = get_project_by_id(project_id, user_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return {
+    return json_response({
         "id": project.id,
         "title": project.title,
         "description": project.description,
-        "created_at": project.created_at.isoformat() if project.created_at else None,
+        "created_at": project.created_at,
         "files": [{"id": f.id, "filename": f.filename} for f in (project.files or [])],
         "databooks": [{"id": d.id, "filename": d.filename} for d in (project.databooks or [])]
-    }
+    })
 
 @app.delete("/projects/{project_id}")
 async def delete_project_endpoint(project_id: int, user_id: int = Depends(get_current_user_id)):
@@ -165,14 +278,20 @@ async def delete_project_endpoint(project_id: int, user_id: int = Depends(get_cu
 async def options_process():
     return {"message": "OK"}
 
-@app.post("/projects/{project_id}/process")
+@app.post("/projects/{project_id}/process", response_model=None)
 async def process_gl_files(
     project_id: int,
+    background: BackgroundTasks,
     files: List[UploadFile] = File(...),
     source_system: str = Form(...),
     entity_configs: str = Form(...),
     user_id: int = Depends(get_current_user_id)
 ):
+    # Processing modules pull in pandas/openpyxl; import them on first use so
+    # API startup (and /health) doesn't pay for it
+    from app.core.gl_pipeline import GLPipeline
+    from app.core.mapping import MultiEntityProcessor
+
     # Note: Project validation is optional since projects are stored in frontend localStorage
     # We still accept the project_id for reference but don't require it to exist in DB
     try:
@@ -181,113 +300,91 @@ async def process_gl_files(
         project = None  # Allow processing even if project doesn't exist in DB
     
     try:
-        try:
-            configs = json.loads(entity_configs)
-        except:
-            configs = []
-        
-        if not isinstance(configs, list):
-            configs = [configs] if configs else []
-        
-        entity_map = {}
-        for c in configs:
-            if isinstance(c, str):
-                try:
-                    c = json.loads(c)
-                except:
-                    continue
-            if isinstance(c, dict) and "filename" in c and "entity_name" in c:
-                entity_map[c["filename"]] = c["entity_name"]
-        
+        configs = entity_configs_adapter.validate_json(entity_configs)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=e.errors(include_url=False))
+    entity_map = {c.filename: c.entity_name for c in configs}
+    
+    try:
         tmp_paths = []
-        file_entity_pairs = []
+        upload_slots = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
         
-        try:
-            for uploaded_file in files:
-                entity_name = entity_map.get(uploaded_file.filename, uploaded_file.filename)
-                file_content = await uploaded_file.read()
+        async def persist(uploaded_file: UploadFile) -> tuple[str, str]:
+            entity_name = entity_map.get(uploaded_file.filename, uploaded_file.filename)
+            async with upload_slots:
+                tmp_path = await run_in_threadpool(spool_upload, uploaded_file)
+                tmp_paths.append(tmp_path)
                 
-                # Save file to temp directory (projects stored in frontend localStorage)
                 try:
-                    # Try to save via file manager (if project exists in DB)
-                    project_file = save_uploaded_file(
+                    # Move into project storage (if project exists in DB)
+                    project_file = await run_in_threadpool(
+                        save_uploaded_file_from_path,
                         project_id=project_id,
-                        file_content=file_content,
+                        source_path=tmp_path,
                         filename=uploaded_file.filename,
                         entity_name=entity_name,
                         source_system=source_system
                     )
-                    tmp_path = project_file.file_path
+                    file_path = project_file.file_path
                 except Exception as e:
-                    # Fallback: save to temp file (for frontend-only projects)
-                    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
-                    tmp_file.write(file_content)
-                    tmp_file.close()
-                    tmp_path = tmp_file.name
-                
-                tmp_paths.append(tmp_path)
-                file_entity_pairs.append((tmp_path, entity_name))
+                    # Fallback: process the temp file (for frontend-only projects)
+                    file_path = tmp_path
+            
+            return file_path, entity_name
+        
+        try:
+            # Persist all uploads concurrently; wait for every one to finish so
+            # the cleanup below sees all temp files even if one of them failed
+            results = await asyncio.gather(*(persist(f) for f in files), return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            file_entity_pairs = list(results)
             
             if len(file_entity_pairs) == 1:
                 pipeline = GLPipeline()
-                normalized_df, processing_report, validation_result = pipeline.process_gl_file(
+                normalized_df, processing_report, validation_result = await run_in_threadpool(
+                    pipeline.process_gl_file,
                     file_path=file_entity_pairs[0][0],
                     entity=file_entity_pairs[0][1],
                     source_system=source_system
                 )
             else:
                 processor = MultiEntityProcessor()
-                normalized_df, processing_reports, validation_result = processor.process_multiple_files(
+                normalized_df, processing_reports, validation_result = await run_in_threadpool(
+                    processor.process_multiple_files,
                     file_entity_pairs=file_entity_pairs,
                     source_system=source_system
                 )
                 processing_report = processing_reports[0] if processing_reports else None
             
+            job_id = None
             excel_file_url = None
             if validation_result.is_valid():
-                try:
-                    entity_info = None
-                    if "entity" in normalized_df.columns:
-                        entities = normalized_df["entity"].unique()
-                        if len(entities) == 1:
-                            entity_info = entities[0]
-                    
-                    mapper = GLAccountMapper()
-                    auto_mapping_df = mapper.generate_auto_mapping_df(normalized_df, entity=entity_info)
-                    
-                    # Ensure output directory exists
-                    output_dir = Path("output")
-                    output_dir.mkdir(exist_ok=True)
-                    
-                    default_filename = f"GL_Databook_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-                    output_path = output_dir / default_filename
-                    
-                    generator = DatabookGenerator(break_formulas=False)
-                    
-                    output_path = generator.generate_databook(
-                        output_path=str(output_path),
-                        normalized_df=normalized_df,
-                        validation_result=validation_result,
-                        processing_report=processing_report,
-                        source_files=[f.filename for f in files],
-                        entity=entity_info,
-                        mapping_df=auto_mapping_df
-                    )
-                    
-                    excel_file_url = f"/projects/{project_id}/download/{os.path.basename(output_path)}"
-                except Exception as e:
-                    print(f"Error generating Excel: {e}")
+                # Databook generation can take a while on large GLs: run it after
+                # responding; the URL returns 202 until the file is ready
+                job_id = databook_jobs.create(user_id)
+                background.add_task(
+                    generate_databook_job,
+                    job_id,
+                    normalized_df,
+                    validation_result,
+                    processing_report,
+                    [f.filename for f in files],
+                )
+                excel_file_url = f"/jobs/{job_id}/result"
             
-            return {
+            return json_response({
                 "validation_result": {
                     "is_valid": validation_result.is_valid(),
                     "key_metrics": validation_result.key_metrics or {},
                     "errors": validation_result.errors or [],
                     "warnings": validation_result.warnings or []
                 },
-                "processed_data": normalized_df.to_dict(orient="records")[:1000],
+                "processed_data": preview_records(normalized_df),
+                "job_id": job_id,
                 "excel_file_url": excel_file_url
-            }
+            })
         finally:
             for tmp_path in tmp_paths:
                 if os.path.exists(tmp_path) and tmp_path.startswith(tempfile.gettempdir()):
@@ -301,6 +398,29 @@ async def process_gl_files(
         traceback.print_exc()  # Print full traceback to console for debugging
         raise HTTPException(status_code=500, detail=f"Processing error: {error_detail}")
 
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, user_id: int = Depends(get_current_user_id)):
+    job = databook_jobs.get(job_id, user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"job_id": job_id, "status": job["status"], "error": job.get("error")}
+
+@app.get("/jobs/{job_id}/result", response_model=None)
+async def get_job_result(job_id: str, user_id: int = Depends(get_current_user_id)):
+    job = databook_jobs.get(job_id, user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == "pending":
+        return JSONResponse({"job_id": job_id, "status": "pending"}, status_code=202)
+    if job["status"] == "failed":
+        raise HTTPException(status_code=500, detail=f"Databook generation failed: {job['error']}")
+    
+    return FileResponse(
+        job["path"],
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        filename=os.path.basename(job["path"])
+    )
+
 @app.get("/projects/{project_id}/download/{filename}")
 async def download_file(project_id: int, filename: str, user_id: int = Depends(get_current_user_id)):
     try:
@@ -1,15 +1,42 @@
 """
 Authentication utilities for user login/signup
 """
+import asyncio
+import logging
+import os
+import secrets
+import time
+from contextlib import contextmanager
+
 import bcrypt
+from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from app.database.models import User, get_session
 from typing import Optional
 
 
+logger = logging.getLogger(__name__)
+
+# Signing key for access tokens; set JWT_SECRET_KEY so tokens survive restarts
+# and are shared across workers
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+if not JWT_SECRET_KEY:
+    JWT_SECRET_KEY = secrets.token_urlsafe(32)
+    logger.warning(
+        "JWT_SECRET_KEY is not set: using a random per-process key. Tokens will not "
+        "validate across workers or after a restart; set JWT_SECRET_KEY in production."
+    )
+JWT_ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_SECONDS = 3600
+
+# bcrypt cost factor; dev/CI can set BCRYPT_ROUNDS=4 to make hashing cheap
+DEFAULT_BCRYPT_ROUNDS = 12
+
+
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
-    salt = bcrypt.gensalt()
+    """Hash a password using bcrypt (cost from the BCRYPT_ROUNDS env var)"""
+    rounds = int(os.getenv("BCRYPT_ROUNDS", str(DEFAULT_BCRYPT_ROUNDS)))
+    salt = bcrypt.gensalt(rounds)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
@@ -19,43 +46,55 @@ def verify_password(password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 
-def create_user(email: str, username: str, password: str, full_name: Optional[str] = None) -> Optional[User]:
-    """Create a new user"""
+@contextmanager
+def _session_scope(db: Optional[Session] = None):
+    """Use the caller's session, or open (and close) a pooled one"""
+    if db is not None:
+        yield db
+        return
     db = get_session()
     try:
-        # Check if user already exists
-        existing_user = db.query(User).filter(
-            (User.email == email) | (User.username == username)
-        ).first()
-        
-        if existing_user:
-            return None
-        
-        # Create new user
-        hashed = hash_password(password)
-        new_user = User(
-            email=email,
-            username=username,
-            hashed_password=hashed,
-            full_name=full_name,
-            is_active=True
-        )
-        
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-        return new_user
-    except Exception as e:
-        db.rollback()
-        raise e
+        yield db
     finally:
         db.close()
 
 
-def authenticate_user(email: str, password: str) -> Optional[User]:
+def create_user(email: str, username: str, password: str, full_name: Optional[str] = None,
+                db: Optional[Session] = None) -> Optional[User]:
+    """Create a new user (in db if given, else in a session of its own)"""
+    with _session_scope(db) as db:
+        try:
+            # Check if user already exists
+            existing_user = db.query(User).filter(
+                (User.email == email) | (User.username == username)
+            ).first()
+            
+            if existing_user:
+                return None
+            
+            # Create new user
+            hashed = hash_password(password)
+            new_user = User(
+                email=email,
+                username=username,
+                hashed_password=hashed,
+                full_name=full_name,
+                is_active=True
+            )
+            
+            db.add(new_user)
+            db.commit()
+            db.refresh(new_user)
+            return new_user
+        except Exception as e:
+            db.rollback()
+            raise e
+
+
+def authenticate_user(email: str, password: str,
+                      db: Optional[Session] = None) -> Optional[User]:
     """Authenticate a user with email and password"""
-    db = get_session()
-    try:
+    with _session_scope(db) as db:
         user = db.query(User).filter(User.email == email).first()
         if not user:
             return None
@@ -67,16 +106,39 @@ def authenticate_user(email: str, password: str) -> Optional[User]:
             return None
         
         return user
-    finally:
-        db.close()
 
 
-def get_user_by_id(user_id: int) -> Optional[User]:
-    """Get user by ID"""
-    db = get_session()
+def create_access_token(user_id: int) -> str:
+    """Create a signed, expiring JWT for a user"""
+    payload = {"sub": str(user_id), "exp": int(time.time()) + ACCESS_TOKEN_EXPIRE_SECONDS}
+    return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+
+
+def decode_access_token(token: str) -> Optional[int]:
+    """Return the user ID from a valid access token, or None if invalid/expired"""
     try:
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        return int(payload["sub"])
+    except (JWTError, KeyError, ValueError):
+        return None
+
+
+async def acreate_user(email: str, username: str, password: str,
+                       full_name: Optional[str] = None,
+                       db: Optional[Session] = None) -> Optional[User]:
+    """create_user in a worker thread, so bcrypt hashing doesn't block the event loop"""
+    return await asyncio.to_thread(create_user, email, username, password, full_name, db)
+
+
+async def aauthenticate_user(email: str, password: str,
+                             db: Optional[Session] = None) -> Optional[User]:
+    """authenticate_user in a worker thread, so bcrypt checks don't block the event loop"""
+    return await asyncio.to_thread(authenticate_user, email, password, db)
+
+
+def get_user_by_id(user_id: int, db: Optional[Session] = None) -> Optional[User]:
+    """Get user by ID"""
+    with _session_scope(db) as db:
         return db.query(User).filter(User.id == user_id).first()
-    finally:
-        db.close()
 
 
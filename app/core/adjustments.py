@@ -7,12 +7,49 @@ Applies configurable rules to GL transactions to identify and calculate adjustme
 import pandas as pd
 import numpy as np
 import re
-from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 import yaml
 import json
 
+# Placeholders supported in AdjustmentRule.reasoning_template
+_TEMPLATE_FIELD_RE = re.compile(r"(\{(?:rule_name|account|description|amount|category)\})")
+# Placeholders filled per row (the others are constant per rule)
+_ROW_FIELDS = ("{account}", "{description}", "{amount}")
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional speedup
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:  # pragma: no cover - optional speedup
+    hyperscan = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:  # pragma: no cover - optional speedup
+    pyarrow = None
+
+try:
+    import numexpr
+except ImportError:  # pragma: no cover - optional speedup
+    numexpr = None
+
+# Row count above which threshold comparisons use multi-threaded numexpr
+NUMEXPR_MIN_ROWS = 100_000
+
+# libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 @dataclass
 class AdjustmentRule:
@@ -25,6 +62,27 @@ class AdjustmentRule:
     adjustment_category: str = ""
     add_back: bool = False  # True = add back to EBITDA, False = subtract
     reasoning_template: str = ""
+    _compiled: Optional[re.Pattern] = field(default=None, init=False, repr=False, compare=False)
+
+    def compiled_pattern(self) -> Optional[re.Pattern]:
+        """
+        Compiled regex for regex rules, cached on the rule.
+
+        The cache is rebuilt if match_value has been changed since it was
+        compiled.
+
+        Returns:
+            Compiled pattern, or None for non-regex rules
+
+        Raises:
+            re.error: If match_value is not a valid regex
+        """
+        if self.match_type != "regex":
+            return None
+        pattern = str(self.match_value)
+        if self._compiled is None or self._compiled.pattern != pattern:
+            self._compiled = re.compile(pattern)
+        return self._compiled
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert rule to dictionary"""
@@ -52,6 +110,62 @@ class AdjustmentRule:
         )
 
 
+@lru_cache(maxsize=256)
+def _compile_template(
+    template: str, rule_name: str, category: str
+) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Compile a reasoning template into a positional str.format string.
+
+    Rule-level placeholders are substituted up front and literal braces are
+    escaped, so a row renders with a single fmt.format(*row_values) call.
+
+    Args:
+        template: AdjustmentRule.reasoning_template
+        rule_name: Value for {rule_name}
+        category: Value for {category}
+
+    Returns:
+        (fmt, fields): format string and the row placeholders (from
+        _ROW_FIELDS) for its positional arguments, in order
+    """
+    constants = {"{rule_name}": rule_name, "{category}": category}
+    fmt_parts = []
+    fields = []
+    for part in _TEMPLATE_FIELD_RE.split(template):
+        if part in _ROW_FIELDS:
+            fmt_parts.append(f"{{{len(fields)}}}")
+            fields.append(part)
+        else:
+            fmt_parts.append(constants.get(part, part).replace("{", "{{").replace("}", "}}"))
+    return "".join(fmt_parts), tuple(fields)
+
+
+@lru_cache(maxsize=32)
+def _load_rules_file(path: str, mtime: float, file_format: str) -> Tuple[AdjustmentRule, ...]:
+    """
+    Parse a YAML or JSON rules config.
+
+    Cached on (path, mtime), so an unchanged file is parsed only once.
+
+    Args:
+        path: Config file path
+        mtime: File modification time, part of the cache key
+        file_format: "yaml" or "json"
+
+    Returns:
+        Tuple of parsed rules (shared; callers must copy before mutating)
+    """
+    if file_format == "json":
+        data = Path(path).read_bytes()
+        config = orjson.loads(data) if orjson is not None else json.loads(data)
+    else:
+        with open(path, "r") as f:
+            config = yaml.load(f, Loader=_YAML_LOADER)
+
+    return tuple(AdjustmentRule.from_dict(rule_data) for rule_data in config.get("rules", []))
+
+
 class AdjustmentRulesEngine:
     """Engine for applying adjustment rules to GL transactions"""
 
@@ -71,14 +185,7 @@ class AdjustmentRulesEngine:
         Args:
             config_path: Path to YAML config file
         """
-        config_path = Path(config_path)
-        with open(config_path, "r") as f:
-            config = yaml.safe_load(f)
-
-        self.rules = []
-        if "rules" in config:
-            for rule_data in config["rules"]:
-                self.rules.append(AdjustmentRule.from_dict(rule_data))
+        self.rules = self._load_rules(config_path, "yaml")
 
     def load_rules_from_json(self, config_path: str | Path) -> None:
         """
@@ -87,90 +194,353 @@ class AdjustmentRulesEngine:
         Args:
             config_path: Path to JSON config file
         """
-        config_path = Path(config_path)
-        with open(config_path, "r") as f:
-            config = json.load(f)
+        self.rules = self._load_rules(config_path, "json")
 
-        self.rules = []
-        if "rules" in config:
-            for rule_data in config["rules"]:
-                self.rules.append(AdjustmentRule.from_dict(rule_data))
+    @staticmethod
+    def _load_rules(config_path: str | Path, file_format: str) -> List[AdjustmentRule]:
+        """Load rules through the mtime-keyed cache, copying them for this engine"""
+        config_path = Path(config_path).resolve()
+        cached = _load_rules_file(str(config_path), config_path.stat().st_mtime, file_format)
+        return [replace(rule) for rule in cached]
 
     def apply_rules(
-        self, normalized_df: pd.DataFrame
+        self, normalized_df: pd.DataFrame, *, inplace: bool = False
     ) -> tuple[pd.DataFrame, pd.DataFrame]:
         """
         Apply adjustment rules to normalized GL DataFrame.
 
+        Only the four adjustment columns are written, each as a freshly
+        allocated array. Without inplace the result is a shallow copy: it
+        shares the existing columns' data with normalized_df, so those
+        columns should be treated as read-only.
+
         Args:
             normalized_df: Normalized GL DataFrame
+            inplace: Add the adjustment columns to normalized_df itself
+                instead of a copy (for callers that discard the input)
 
         Returns:
             Tuple of (adjusted_df, adjustment_log_df)
             - adjusted_df: DataFrame with adjustment columns added
+              (normalized_df itself when inplace=True); adjustment_category
+              is categorical over the rules' categories plus ""
             - adjustment_log_df: DataFrame with adjustment details for each match
+              (rule_name and adjustment_category categorical)
         """
-        if normalized_df.empty:
-            return normalized_df.copy(), pd.DataFrame()
+        df = normalized_df if inplace else normalized_df.copy(deep=False)
+        if df.empty:
+            return df, pd.DataFrame()
+
+        n = len(df)
 
-        df = normalized_df.copy()
+        # Adjustment columns are built as arrays and assigned once at the end
+        flag = np.zeros(n, dtype=bool)
+        # Categories are known up front, so categorical columns are built from codes
+        category_dtype = pd.CategoricalDtype(
+            sorted({rule.adjustment_category for rule in self.rules} | {""})
+        )
+        rule_name_dtype = pd.CategoricalDtype(sorted({rule.rule_name for rule in self.rules}))
+        category_codes = np.full(n, category_dtype.categories.get_loc(""), dtype=np.int32)
+        reasoning = np.full(n, "", dtype=object)
+        amount = np.zeros(n, dtype=np.float64)
+        amount_net = df["amount_net"].to_numpy(dtype=np.float64)
+
+        # Per-row template values, formatted once for all rules
+        template_values = {
+            "{account}": df["account_name_flat"].astype(str).to_numpy(dtype=object),
+            "{description}": df["description"].astype(str).to_numpy(dtype=object),
+            "{amount}": np.array([f"${v:,.2f}" for v in amount_net.tolist()], dtype=object),
+        }
 
-        # Initialize adjustment columns
-        df["adjustment_flag"] = False
-        df["adjustment_category"] = ""
-        df["reasoning"] = ""
-        df["adjustment_amount"] = 0.0
+        # Log columns are pulled out once and sliced per rule; the log is
+        # built from per-rule column fragments concatenated at the end
+        log_columns = {
+            "row_id": df["row_id"].to_numpy(),
+            "date": df["date"].to_numpy(),
+            "entity": df["entity"].to_numpy() if "entity" in df.columns else None,
+            "account_name_flat": df["account_name_flat"].to_numpy(),
+            "description": df["description"].to_numpy(),
+        }
+        log_frames = []
 
-        # Track adjustments for log
-        adjustment_log = []
+        # Match every enabled rule up front (keyword/regex rules share one scan)
+        rule_masks = self._match_all(df)
 
         # Apply each enabled rule
-        for rule in self.rules:
+        for rule_idx, rule in enumerate(self.rules):
             if not rule.enabled:
                 continue
 
-            # Find matching rows
-            matches = self._find_matches(df, rule)
-
-            if len(matches) > 0:
-                # Apply rule to matching rows
-                for idx in matches:
-                    # Set adjustment flag
-                    df.at[idx, "adjustment_flag"] = True
-                    df.at[idx, "adjustment_category"] = rule.adjustment_category
+            mask = rule_masks[rule_idx]
+            if not mask.any():
+                continue
 
-                    # Generate reasoning
-                    reasoning = self._generate_reasoning(df.loc[idx], rule)
-                    df.at[idx, "reasoning"] = reasoning
+            rule_amounts = -amount_net[mask] if rule.add_back else amount_net[mask]
+            rule_reasoning = self._format_reasoning(rule, template_values, mask)
+
+            flag |= mask
+            category_code = category_dtype.categories.get_loc(rule.adjustment_category)
+            category_codes[mask] = category_code
+            reasoning[mask] = rule_reasoning
+            amount[mask] = rule_amounts
+
+            log_frames.append(
+                pd.DataFrame(
+                    {
+                        **{
+                            column: values[mask] if values is not None else ""
+                            for column, values in log_columns.items()
+                        },
+                        "rule_name": pd.Categorical.from_codes(
+                            np.full(
+                                len(rule_amounts),
+                                rule_name_dtype.categories.get_loc(rule.rule_name),
+                                dtype=np.int32,
+                            ),
+                            dtype=rule_name_dtype,
+                        ),
+                        "adjustment_category": pd.Categorical.from_codes(
+                            np.full(len(rule_amounts), category_code, dtype=np.int32),
+                            dtype=category_dtype,
+                        ),
+                        "adjustment_amount": rule_amounts,
+                        "add_back": rule.add_back,
+                        "reasoning": rule_reasoning,
+                    }
+                )
+            )
 
-                    # Calculate adjustment amount
-                    adjustment_amount = self._calculate_adjustment_amount(
-                        df.loc[idx], rule
-                    )
-                    df.at[idx, "adjustment_amount"] = adjustment_amount
-
-                    # Log adjustment
-                    adjustment_log.append(
-                        {
-                            "row_id": df.at[idx, "row_id"],
-                            "date": df.at[idx, "date"],
-                            "entity": df.at[idx, "entity"] if "entity" in df.columns else "",
-                            "account_name_flat": df.at[idx, "account_name_flat"],
-                            "description": df.at[idx, "description"],
-                            "rule_name": rule.rule_name,
-                            "adjustment_category": rule.adjustment_category,
-                            "adjustment_amount": adjustment_amount,
-                            "add_back": rule.add_back,
-                            "reasoning": reasoning,
-                        }
-                    )
+        df["adjustment_flag"] = flag
+        df["adjustment_category"] = pd.Categorical.from_codes(category_codes, dtype=category_dtype)
+        df["reasoning"] = reasoning
+        df["adjustment_amount"] = amount
 
         # Create adjustment log DataFrame
-        adjustment_log_df = pd.DataFrame(adjustment_log)
+        adjustment_log_df = (
+            pd.concat(log_frames, ignore_index=True, copy=False) if log_frames else pd.DataFrame()
+        )
 
         return df, adjustment_log_df
 
-    def _find_matches(self, df: pd.DataFrame, rule: AdjustmentRule) -> List[int]:
+    def _match_all(self, df: pd.DataFrame) -> Dict[int, np.ndarray]:
+        """
+        Find matching rows for all enabled rules.
+
+        Account and description columns are lowercased once and shared by all
+        keyword rules. Literal keyword rules are matched together in a single
+        Aho-Corasick pass (when pyahocorasick is installed) and regex rules in
+        a single Hyperscan pass (when installed); everything else falls back
+        to _find_matches.
+
+        Args:
+            df: DataFrame to search
+
+        Returns:
+            Dict mapping rule position in self.rules to a boolean row mask
+        """
+        enabled = {i: rule for i, rule in enumerate(self.rules) if rule.enabled}
+        masks: Dict[int, np.ndarray] = {}
+
+        keyword_rules = {
+            i: str(rule.match_value).lower()
+            for i, rule in enabled.items()
+            if rule.match_type == "keyword"
+        }
+        # Keywords are regex patterns to str.contains; only plain literals can
+        # go through the automaton without changing what they match
+        literal_rules = {
+            i: keyword
+            for i, keyword in keyword_rules.items()
+            if keyword and re.escape(keyword) == keyword
+        }
+        if keyword_rules:
+            acct_lower = self._arrow_strings(df["account_name_flat"]).str.lower()
+            desc_lower = self._arrow_strings(df["description"]).str.lower()
+        if literal_rules:
+            masks.update(self._keyword_masks(acct_lower, desc_lower, literal_rules))
+
+        pattern_keywords = {
+            i: keyword for i, keyword in keyword_rules.items() if i not in literal_rules
+        }
+        if pattern_keywords:
+            # Matched with Python re on object columns, like _find_matches
+            acct_lower = acct_lower.astype(object)
+            desc_lower = desc_lower.astype(object)
+            for i, keyword in pattern_keywords.items():
+                masks[i] = (
+                    acct_lower.str.contains(keyword, na=False)
+                    | desc_lower.str.contains(keyword, na=False)
+                ).to_numpy(dtype=bool)
+
+        regex_rules = {
+            i: str(rule.match_value)
+            for i, rule in enabled.items()
+            if rule.match_type == "regex"
+        }
+        if regex_rules and hyperscan is not None:
+            masks.update(self._regex_masks(df, regex_rules))
+
+        thresholds = {
+            i: float(rule.match_value)
+            for i, rule in enabled.items()
+            if rule.match_type == "threshold"
+        }
+        if thresholds:
+            masks.update(self._threshold_masks(df["amount_net"], thresholds))
+
+        for i, rule in enabled.items():
+            if i not in masks:
+                masks[i] = self._find_matches(df, rule)
+
+        return masks
+
+    @staticmethod
+    def _threshold_masks(
+        amount_net: pd.Series, thresholds: Dict[int, float]
+    ) -> Dict[int, np.ndarray]:
+        """
+        Match threshold rules against one shared absolute-amount array.
+
+        Args:
+            amount_net: Net amounts
+            thresholds: Rule position -> threshold
+
+        Returns:
+            Dict mapping rule position to a boolean row mask
+        """
+        abs_amount = np.abs(amount_net.to_numpy(dtype=np.float64))
+        if numexpr is not None and len(abs_amount) > NUMEXPR_MIN_ROWS:
+            return {
+                i: numexpr.evaluate(
+                    "abs_amount >= threshold",
+                    local_dict={"abs_amount": abs_amount, "threshold": threshold},
+                )
+                for i, threshold in thresholds.items()
+            }
+        return {i: abs_amount >= threshold for i, threshold in thresholds.items()}
+
+    @staticmethod
+    def _arrow_strings(series: pd.Series) -> pd.Series:
+        """
+        Object string column as string[pyarrow] (unchanged without pyarrow).
+
+        .str.lower and literal .str.contains then run as Arrow UTF-8 kernels.
+        Only used for literal keyword matching: regex rules keep Python re
+        semantics, which Arrow's RE2-based matching does not share.
+        """
+        if pyarrow is None or series.dtype != object:
+            return series
+        return series.astype("string[pyarrow]")
+
+    @staticmethod
+    def _object_strings(series: pd.Series) -> pd.Series:
+        """
+        String column as object dtype, so regex matching uses Python re.
+
+        Arrow-backed columns (e.g. the normalized description) would otherwise
+        be matched with RE2, which rejects lookarounds and backreferences.
+        """
+        if series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype):
+            return series
+        return series.astype(object)
+
+    @staticmethod
+    def _keyword_masks(
+        acct_lower: pd.Series, desc_lower: pd.Series, keywords: Dict[int, str]
+    ) -> Dict[int, np.ndarray]:
+        """
+        Match literal keywords against pre-lowercased account/description columns.
+
+        Args:
+            acct_lower: Lowercased account names
+            desc_lower: Lowercased descriptions
+            keywords: Rule position -> lowercase keyword
+
+        Returns:
+            Dict mapping rule position to a boolean row mask
+        """
+        n = len(acct_lower)
+        if ahocorasick is None:
+            return {
+                i: (
+                    acct_lower.str.contains(keyword, regex=False, na=False)
+                    | desc_lower.str.contains(keyword, regex=False, na=False)
+                ).to_numpy(dtype=bool)
+                for i, keyword in keywords.items()
+            }
+
+        rules_by_keyword: Dict[str, List[int]] = {}
+        for i, keyword in keywords.items():
+            rules_by_keyword.setdefault(keyword, []).append(i)
+
+        automaton = ahocorasick.Automaton()
+        for keyword, rule_ids in rules_by_keyword.items():
+            automaton.add_word(keyword, rule_ids)
+        automaton.make_automaton()
+
+        masks = {i: np.zeros(n, dtype=bool) for i in keywords}
+        # NUL separator keeps matches from spanning the two columns
+        haystacks = (
+            acct_lower.fillna("").astype(str) + "\x00" + desc_lower.fillna("").astype(str)
+        )
+        for row, haystack in enumerate(haystacks.tolist()):
+            for _, rule_ids in automaton.iter(haystack):
+                for i in rule_ids:
+                    masks[i][row] = True
+        return masks
+
+    @staticmethod
+    def _regex_masks(df: pd.DataFrame, patterns: Dict[int, str]) -> Dict[int, np.ndarray]:
+        """
+        Match regex rules against account/description with one Hyperscan database.
+
+        Patterns Hyperscan cannot compile (e.g. backreferences) are left out
+        of the result so the caller falls back to per-rule matching.
+
+        Args:
+            df: DataFrame to search
+            patterns: Rule position -> regex pattern
+
+        Returns:
+            Dict mapping rule position to a boolean row mask
+        """
+        # UTF8/UCP so '.', \w etc. see characters like Python's re does
+        flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+        compiled_ids = []
+        for i, pattern in patterns.items():
+            try:
+                re.compile(pattern)
+                hyperscan.Database().compile(
+                    expressions=[pattern.encode("utf-8")], flags=[flags]
+                )
+            except (re.error, hyperscan.error):
+                continue
+            compiled_ids.append(i)
+        if not compiled_ids:
+            return {}
+
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[patterns[i].encode("utf-8") for i in compiled_ids],
+            ids=compiled_ids,
+            elements=len(compiled_ids),
+            flags=[flags] * len(compiled_ids),
+        )
+
+        n = len(df)
+        masks = {i: np.zeros(n, dtype=bool) for i in compiled_ids}
+        row = 0
+
+        def on_match(rule_id, start, end, flags, context):
+            masks[rule_id][row] = True
+
+        for column in ("account_name_flat", "description"):
+            for row, text in enumerate(df[column].tolist()):
+                if isinstance(text, str):
+                    db.scan(text.encode("utf-8"), match_event_handler=on_match)
+        return masks
+
+    def _find_matches(self, df: pd.DataFrame, rule: AdjustmentRule) -> np.ndarray:
         """
         Find rows matching the rule criteria.
 
@@ -179,33 +549,38 @@ class AdjustmentRulesEngine:
             rule: AdjustmentRule to apply
 
         Returns:
-            List of row indices that match
+            Boolean mask over the rows of df
         """
-        matches = []
+        mask = np.zeros(len(df), dtype=bool)
 
         if rule.match_type == "keyword":
             # Match against account name or description
             keyword = str(rule.match_value).lower()
             mask = (
-                df["account_name_flat"].str.lower().str.contains(keyword, na=False)
-                | df["description"].str.lower().str.contains(keyword, na=False)
-            )
-            matches = df[mask].index.tolist()
+                self._object_strings(df["account_name_flat"]).str.lower().str.contains(
+                    keyword, na=False
+                )
+                | self._object_strings(df["description"]).str.lower().str.contains(
+                    keyword, na=False
+                )
+            ).to_numpy(dtype=bool)
 
         elif rule.match_type == "account":
             # Exact match on account name
-            account_match = df["account_name_flat"] == rule.match_value
-            matches = df[account_match].index.tolist()
+            mask = (df["account_name_flat"] == rule.match_value).to_numpy(dtype=bool)
 
         elif rule.match_type == "regex":
             # Regex match on account name or description
-            pattern = str(rule.match_value)
             try:
+                pattern = rule.compiled_pattern()
                 mask = (
-                    df["account_name_flat"].str.contains(pattern, regex=True, na=False)
-                    | df["description"].str.contains(pattern, regex=True, na=False)
-                )
-                matches = df[mask].index.tolist()
+                    self._object_strings(df["account_name_flat"]).str.contains(
+                        pattern, regex=True, na=False
+                    )
+                    | self._object_strings(df["description"]).str.contains(
+                        pattern, regex=True, na=False
+                    )
+                ).to_numpy(dtype=bool)
             except re.error:
                 # Invalid regex pattern
                 pass
@@ -214,16 +589,48 @@ class AdjustmentRulesEngine:
             # Match based on amount threshold
             threshold = float(rule.match_value)
             # Check if amount exceeds threshold (absolute value)
-            mask = df["amount_net"].abs() >= threshold
-            matches = df[mask].index.tolist()
+            mask = (df["amount_net"].abs() >= threshold).to_numpy(dtype=bool)
+
+        return mask
+
+    @staticmethod
+    def _format_reasoning(
+        rule: AdjustmentRule, template_values: Dict[str, np.ndarray], mask: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized _generate_reasoning for all rows selected by mask.
+
+        The template is compiled once per rule (see _compile_template) and
+        each row is rendered with one str.format call over the masked
+        pre-formatted value columns.
+
+        Args:
+            rule: AdjustmentRule applied
+            template_values: Placeholder -> per-row formatted values (all rows)
+            mask: Rows the rule matched
 
-        return matches
+        Returns:
+            Object array of reasoning strings, one per matched row
+        """
+        count = int(mask.sum())
+        if not rule.reasoning_template:
+            default = f"{rule.rule_name}: {rule.adjustment_category} adjustment"
+            return np.full(count, default, dtype=object)
+
+        fmt, fields = _compile_template(
+            rule.reasoning_template, rule.rule_name, rule.adjustment_category
+        )
+        if not fields:
+            return np.full(count, fmt.format(), dtype=object)
+        columns = [template_values[field][mask] for field in fields]
+        return np.fromiter(map(fmt.format, *columns), dtype=object, count=count)
 
     def _generate_reasoning(
         self, row: pd.Series, rule: AdjustmentRule
     ) -> str:
         """
-        Generate reasoning text for adjustment.
+        Generate reasoning text for adjustment (scalar helper; apply_rules
+        uses the vectorized _format_reasoning).
 
         Args:
             row: DataFrame row
@@ -233,14 +640,16 @@ class AdjustmentRulesEngine:
             Reasoning string
         """
         if rule.reasoning_template:
-            # Replace template variables
-            reasoning = rule.reasoning_template
-            reasoning = reasoning.replace("{rule_name}", rule.rule_name)
-            reasoning = reasoning.replace("{account}", str(row.get("account_name_flat", "")))
-            reasoning = reasoning.replace("{description}", str(row.get("description", "")))
-            reasoning = reasoning.replace("{amount}", f"${row.get('amount_net', 0):,.2f}")
-            reasoning = reasoning.replace("{category}", rule.adjustment_category)
-            return reasoning
+            # Fill template variables in a single format pass
+            fmt, fields = _compile_template(
+                rule.reasoning_template, rule.rule_name, rule.adjustment_category
+            )
+            values = {
+                "{account}": str(row.get("account_name_flat", "")),
+                "{description}": str(row.get("description", "")),
+                "{amount}": f"${row.get('amount_net', 0):,.2f}",
+            }
+            return fmt.format(*(values[field] for field in fields))
         else:
             # Default reasoning
             return f"{rule.rule_name}: {rule.adjustment_category} adjustment"
@@ -249,7 +658,8 @@ class AdjustmentRulesEngine:
         self, row: pd.Series, rule: AdjustmentRule
     ) -> float:
         """
-        Calculate adjustment amount for a transaction.
+        Calculate adjustment amount for a transaction (scalar helper;
+        apply_rules computes amounts for all matched rows at once).
 
         Args:
             row: DataFrame row
@@ -5,13 +5,50 @@ Processes raw Excel GL exports from QuickBooks Desktop and QuickBooks Online,
 normalizing them into a standardized format.
 """
 
+import os
+import re
+import threading
+from collections import OrderedDict
+
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 
+from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from pandas.io.parsers import TextParser
+from pandas.tseries.api import guess_datetime_format
+
+from app.utils.jit import njit
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional speedup
+    ahocorasick = None
+
+try:
+    import python_calamine
+except ImportError:  # pragma: no cover - optional speedup
+    python_calamine = None
+
+try:
+    import pyarrow
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - optional speedup
+    pyarrow = pc = None
+
+
+# Strings pandas treats as missing when picking the value to guess a date
+# format from
+_NAT_STRINGS = frozenset(["", "NaT", "nat", "NAT", "nan", "NaN", "NAN"])
+
+# Memory budget for parsed sheets kept by _read_gl_sheet_cached (0 = no caching)
+GL_SHEET_CACHE_MAX_BYTES = int(os.getenv("GL_SHEET_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
 
 @dataclass
 class ProcessingReport:
@@ -39,6 +76,130 @@ class ProcessingReport:
         }
 
 
+@njit(cache=True)
+def _build_hierarchy(is_header, has_valid_date, account_id, is_top_level):
+    """
+    Run the parent/sub-account state machine over factorized rows.
+
+    The current hierarchy is a node in a trie of (parent node, account id)
+    pairs, so any depth is represented without copying lists.
+
+    Args:
+        is_header: Row is an account header (parent account)
+        has_valid_date: Row has a valid date
+        account_id: Factorized account name per row (-1 = empty)
+        is_top_level: Header account starts a new top-level hierarchy
+
+    Returns:
+        (node_parent, node_account, txn_node): trie nodes (parents always
+        precede children) and, per row, the hierarchy node a transaction
+        row belongs under (-1 = no parent hierarchy, -2 = not a transaction)
+    """
+    n = len(account_id)
+    node_parent = np.empty(n, dtype=np.int64)
+    node_account = np.empty(n, dtype=np.int64)
+    txn_node = np.full(n, -2, dtype=np.int64)
+    n_nodes = 0
+    current = -1
+    for i in range(n):
+        account = account_id[i]
+        if is_header[i] and account >= 0:
+            # Parent account header: new hierarchy level (or new top level)
+            node_parent[n_nodes] = -1 if is_top_level[i] else current
+            node_account[n_nodes] = account
+            current = n_nodes
+            n_nodes += 1
+        elif account >= 0 and has_valid_date[i]:
+            # Transaction row: leaf under the current hierarchy
+            txn_node[i] = current
+        elif account < 0:
+            # Reset hierarchy if we hit an empty row
+            current = -1
+    return node_parent[:n_nodes], node_account[:n_nodes], txn_node
+
+
+@lru_cache(maxsize=8)
+def _keyword_automaton(groups: Tuple[Tuple[str, ...], ...]):
+    """Aho-Corasick automaton mapping each keyword to the indices of the groups containing it"""
+    groups_by_keyword: Dict[str, List[int]] = {}
+    for group, keywords in enumerate(groups):
+        for keyword in keywords:
+            groups_by_keyword.setdefault(keyword, []).append(group)
+
+    automaton = ahocorasick.Automaton()
+    for keyword, group_ids in groups_by_keyword.items():
+        automaton.add_word(keyword, group_ids)
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=8)
+def _keyword_regex(keywords: Tuple[str, ...]) -> re.Pattern:
+    """Compiled alternation matching any of the literal keywords"""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+# (engine_cls, path, mtime_ns, sheet_name) -> (frame, report, size in bytes), LRU first
+_sheet_cache: "OrderedDict[Tuple[Any, ...], Tuple[pd.DataFrame, ProcessingReport, int]]" = (
+    OrderedDict()
+)
+_sheet_cache_bytes = 0
+_sheet_cache_lock = threading.Lock()
+
+
+def _read_gl_sheet_cached(
+    engine_cls: type, path: str, mtime_ns: int, sheet_name: Optional[str]
+) -> Tuple[pd.DataFrame, ProcessingReport]:
+    """
+    Read a GL sheet into the standard columns.
+
+    Cached on (path, mtime, sheet), so re-processing an unchanged file skips
+    the Excel parse. The cache is bounded by GL_SHEET_CACHE_MAX_BYTES of frame
+    memory, evicting least recently used sheets; larger sheets aren't cached.
+
+    Args:
+        engine_cls: GLIngestionEngine (sub)class doing the read
+        path: Resolved file path
+        mtime_ns: File modification time, part of the cache key
+        sheet_name: Sheet to read (None = first sheet)
+
+    Returns:
+        Tuple of (structured DataFrame, read report) (shared; callers must
+        copy before mutating)
+    """
+    global _sheet_cache_bytes
+
+    key = (engine_cls, path, mtime_ns, sheet_name)
+    with _sheet_cache_lock:
+        cached = _sheet_cache.get(key)
+        if cached is not None:
+            _sheet_cache.move_to_end(key)
+            return cached[0], cached[1]
+
+    report = ProcessingReport()
+    df = engine_cls()._read_gl_sheet(Path(path), sheet_name, report)
+
+    size = int(df.memory_usage(index=True, deep=True).sum())
+    if size <= GL_SHEET_CACHE_MAX_BYTES:
+        with _sheet_cache_lock:
+            if key not in _sheet_cache:
+                _sheet_cache[key] = (df, report, size)
+                _sheet_cache_bytes += size
+            while _sheet_cache_bytes > GL_SHEET_CACHE_MAX_BYTES:
+                _, (_, _, evicted) = _sheet_cache.popitem(last=False)
+                _sheet_cache_bytes -= evicted
+    return df, report
+
+
+def _clear_sheet_cache() -> None:
+    """Drop every cached sheet"""
+    global _sheet_cache_bytes
+
+    with _sheet_cache_lock:
+        _sheet_cache.clear()
+        _sheet_cache_bytes = 0
+
+
 class GLIngestionEngine:
     """Engine for ingesting and normalizing GL data from Excel exports"""
 
@@ -57,6 +218,28 @@ class GLIngestionEngine:
         "beginning balance",
         "beginning balances",
     ]
+    # Normalized string columns stored as pandas categoricals
+    CATEGORICAL_COLUMNS = [
+        "entity",
+        "source_system",
+        "gl_source_file",
+        "account_name_raw",
+        "account_name_flat",
+    ]
+    # Rows searched for the column header row
+    HEADER_SCAN_ROWS = 5
+    # A header row has a cell containing one of these
+    HEADER_ROW_KEYWORDS = ("date", "account")
+    # Header keywords for date, account, description, debit, credit (in priority order)
+    COLUMN_KEYWORDS = [
+        ("date",),
+        ("account",),
+        ("description", "memo", "name"),
+        ("debit",),
+        ("credit",),
+    ]
+    # Header accounts containing these start a new top-level hierarchy
+    PARENT_ACCOUNT_INDICATORS = ["assets", "liabilities", "equity", "income", "expenses", "revenue"]
 
     def __init__(self):
         """Initialize the GL ingestion engine"""
@@ -86,18 +269,16 @@ class GLIngestionEngine:
 
         # Read Excel file
         try:
-            if sheet_name:
-                df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
-            else:
-                df = pd.read_excel(file_path, sheet_name=0, header=None)
+            df_structured, read_report = _read_gl_sheet_cached(
+                type(self), str(file_path.resolve()), file_path.stat().st_mtime_ns, sheet_name
+            )
         except Exception as e:
             report.warnings.append(f"Error reading Excel file: {str(e)}")
             return pd.DataFrame(), report
 
-        report.total_rows_read = len(df)
-
-        # Detect column structure (QuickBooks Desktop vs Online)
-        df_normalized = self._detect_and_parse_structure(df, file_path.name, report)
+        # The cached frame and report are shared; normalization works on copies
+        report = replace(read_report, warnings=list(read_report.warnings))
+        df_normalized = df_structured.copy()
 
         # Normalize the data
         df_normalized = self._normalize_data(
@@ -108,6 +289,246 @@ class GLIngestionEngine:
 
         return df_normalized, report
 
+    def _read_gl_sheet(
+        self, file_path: Path, sheet_name: Optional[str], report: ProcessingReport
+    ) -> pd.DataFrame:
+        """
+        Read a sheet into the standard GL columns (before normalization).
+
+        Args:
+            file_path: Path to the Excel file
+            sheet_name: Sheet to read (None = first sheet)
+            report: Processing report to update
+
+        Returns:
+            DataFrame with columns: date, account_name_raw, description, debit, credit
+        """
+        engine = self._excel_engine(file_path)
+        if engine == "openpyxl":
+            # Stream rows, keeping only the five GL columns
+            return self._stream_gl_columns(file_path, sheet_name, report)
+        return self._read_gl_columns(file_path, sheet_name, engine, report)
+
+    @staticmethod
+    def _excel_engine(file_path: Path) -> Optional[str]:
+        """
+        Pick the reader for a workbook.
+
+        Uses the Rust-backed calamine reader when python-calamine is installed.
+        Otherwise .xlsx/.xlsm files are streamed with openpyxl ("openpyxl"),
+        and anything else (e.g. legacy .xls) goes to pandas' default engine.
+        """
+        suffix = file_path.suffix.lower()
+        if suffix == ".xls":
+            return None
+        if python_calamine is not None:
+            return "calamine"
+        if suffix in (".xlsx", ".xlsm"):
+            return "openpyxl"
+        return None
+
+    def _read_gl_columns(
+        self,
+        file_path: Path,
+        sheet_name: Optional[str],
+        engine: Optional[str],
+        report: ProcessingReport,
+    ) -> pd.DataFrame:
+        """
+        Read the GL columns from a workbook with read_excel.
+
+        The first HEADER_SCAN_ROWS rows are read to find the header; the data
+        rows are then read with usecols limited to the five GL columns and
+        dtype=object, so other columns are never materialized and no per-cell
+        type inference runs (debit/credit are coerced in _normalize_data).
+
+        Args:
+            file_path: Path to the Excel file
+            sheet_name: Sheet to read (None = first sheet)
+            engine: read_excel engine (None = pandas default)
+            report: Processing report to update
+
+        Returns:
+            DataFrame with columns: date, account_name_raw, description, debit, credit
+        """
+        read_kwargs = {"sheet_name": sheet_name or 0, "header": None, "engine": engine}
+        head = pd.read_excel(file_path, nrows=self.HEADER_SCAN_ROWS, dtype=object, **read_kwargs)
+        if head.empty:
+            return pd.DataFrame()
+
+        header_row_idx, columns = self._detect_header(
+            [head.iloc[idx].tolist() for idx in range(len(head))]
+        )
+        data_start = self._record_header_row(header_row_idx, report) + 1
+
+        wanted = set(columns)
+        data = pd.read_excel(
+            file_path,
+            skiprows=data_start,
+            usecols=lambda column: column in wanted,
+            dtype=object,
+            **read_kwargs,
+        )
+        report.total_rows_read = data_start + len(data) if len(data) else len(head)
+
+        positions = {column: k for k, column in enumerate(data.columns)}
+        return self._select_gl_columns(
+            data,
+            0,
+            [positions.get(column, column if k < 2 else None) for k, column in enumerate(columns)],
+        )
+
+    def _stream_gl_columns(
+        self, file_path: Path, sheet_name: Optional[str], report: ProcessingReport
+    ) -> pd.DataFrame:
+        """
+        Read the GL columns from a workbook row by row with openpyxl.
+
+        Equivalent to read_excel(header=None) followed by
+        _detect_and_parse_structure, but only the five GL columns of each row
+        are kept, so peak memory no longer scales with the sheet's full width.
+        Cells are converted and types inferred the same way pandas does.
+
+        Args:
+            file_path: Path to the .xlsx/.xlsm file
+            sheet_name: Sheet to read (None = first sheet)
+            report: Processing report to update
+
+        Returns:
+            DataFrame with columns: date, account_name_raw, description, debit, credit
+        """
+        workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+        try:
+            sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+            sheet.reset_dimensions()
+
+            head: List[List[Any]] = []
+            columns: Optional[List[int]] = None
+            projected: List[List[Any]] = []
+            last_row_with_data = -1
+            width = 0
+            for row_number, row in enumerate(sheet.rows):
+                values = [self._convert_cell(cell) for cell in row]
+                while values and values[-1] == "":
+                    values.pop()
+                if values:
+                    last_row_with_data = row_number
+                    width = max(width, len(values))
+
+                if columns is None:
+                    head.append(values)
+                    if len(head) < self.HEADER_SCAN_ROWS:
+                        continue
+                    header_row_idx, columns = self._detect_header(head)
+                    projected.extend(self._project_row(values, columns) for values in head)
+                else:
+                    projected.append(self._project_row(values, columns))
+        finally:
+            workbook.close()
+
+        if columns is None:
+            # Fewer rows than the header scan window
+            del head[last_row_with_data + 1 :]
+            if not head:
+                return pd.DataFrame()
+            header_row_idx, columns = self._detect_header(head)
+            projected = [self._project_row(values, columns) for values in head]
+
+        # Trim trailing empty rows
+        del projected[last_row_with_data + 1 :]
+        report.total_rows_read = len(projected)
+        if not projected:
+            return pd.DataFrame()
+        header_row_idx = self._record_header_row(header_row_idx, report)
+
+        raw = TextParser(projected, header=None, skip_blank_lines=False).read()
+        return self._select_gl_columns(
+            raw,
+            header_row_idx + 1,
+            [k if column < width or k < 2 else None for k, column in enumerate(columns)],
+        )
+
+    @staticmethod
+    def _convert_cell(cell) -> Any:
+        """Convert an openpyxl cell the way pandas' openpyxl reader does"""
+        if cell.value is None:
+            return ""
+        if cell.data_type == TYPE_ERROR:
+            return np.nan
+        if cell.data_type == TYPE_NUMERIC:
+            value = int(cell.value)
+            return value if value == cell.value else float(cell.value)
+        return cell.value
+
+    @staticmethod
+    def _project_row(values: List[Any], columns: List[int]) -> List[Any]:
+        """Pick the GL columns out of a row, padding missing cells with ''"""
+        return [values[column] if column < len(values) else "" for column in columns]
+
+    def _detect_header(self, rows: List[List[Any]]) -> Tuple[Optional[int], List[int]]:
+        """
+        Find the header row and the GL column positions.
+
+        Args:
+            rows: The first rows of the sheet (at most HEADER_SCAN_ROWS)
+
+        Returns:
+            Tuple of (header row index or None if not detected, column
+            positions of date, account, description, debit, credit)
+        """
+        # Lowercase the scanned block once (ragged rows padded with '') and
+        # match every keyword against all of it; the header-row search and the
+        # column search below both read these masks
+        rows = rows[: self.HEADER_SCAN_ROWS]
+        width = max((len(row) for row in rows), default=0)
+        lowered = np.array(
+            [[str(val).lower() for val in row] + [""] * (width - len(row)) for row in rows],
+            dtype=str,
+        ).reshape(len(rows), width)
+        keywords = set(self.HEADER_ROW_KEYWORDS).union(*self.COLUMN_KEYWORDS)
+        found = {keyword: np.char.find(lowered, keyword) >= 0 for keyword in keywords}
+
+        # Try to find header row (look for "Date" or "Account" in first few rows)
+        header_hits = np.flatnonzero(
+            self._any_keyword(found, self.HEADER_ROW_KEYWORDS).any(axis=1)
+        )
+        header_row_idx = int(header_hits[0]) if len(header_hits) else None
+
+        # Find column indices: each column takes the first header cell matching
+        # its keywords that an earlier column has not already claimed. Padding
+        # cells never match, so they are never claimed
+        header_row = header_row_idx or 0
+        claimed = np.zeros(width, dtype=bool)
+        columns = []
+        for default_col, column_keywords in enumerate(self.COLUMN_KEYWORDS):
+            matches = self._any_keyword(found, column_keywords)[header_row]
+            hits = np.flatnonzero(matches & ~claimed)
+            if len(hits):
+                claimed[hits[0]] = True
+                columns.append(int(hits[0]))
+            else:
+                # If columns not found, try common positions
+                columns.append(default_col)
+
+        return header_row_idx, columns
+
+    @staticmethod
+    def _any_keyword(found: Dict[str, np.ndarray], keywords: Tuple[str, ...]) -> np.ndarray:
+        """OR together the precomputed match masks of the given keywords"""
+        return np.logical_or.reduce([found[keyword] for keyword in keywords])
+
+    @staticmethod
+    def _record_header_row(header_row_idx: Optional[int], report: ProcessingReport) -> int:
+        """Record the detected header row (the first row if none was found)"""
+        if header_row_idx is None:
+            # Assume first row is header
+            header_row_idx = 0
+            report.warnings.append("Could not detect header row, assuming first row")
+
+        # Track header row index for validation
+        report.header_row_index = header_row_idx
+        return header_row_idx
+
     def _detect_and_parse_structure(
         self, df: pd.DataFrame, filename: str, report: ProcessingReport
     ) -> pd.DataFrame:
@@ -128,84 +549,59 @@ class GLIngestionEngine:
         if df.empty or len(df) == 0:
             return pd.DataFrame()
 
-        # Try to find header row (look for "Date" or "Account" in first few rows)
-        header_row_idx = None
-        for idx in range(min(5, len(df))):
-            row_values = df.iloc[idx].astype(str).str.lower().values
-            if any("date" in str(val) for val in row_values) or any(
-                "account" in str(val) for val in row_values
-            ):
-                header_row_idx = idx
-                break
+        head = [df.iloc[idx].tolist() for idx in range(min(self.HEADER_SCAN_ROWS, len(df)))]
+        header_row_idx, columns = self._detect_header(head)
+        header_row_idx = self._record_header_row(header_row_idx, report)
+        width = len(df.columns)
+        return self._select_gl_columns(
+            df,
+            header_row_idx + 1,
+            [column if column < width or k < 2 else None for k, column in enumerate(columns)],
+        )
 
-        if header_row_idx is None:
-            # Assume first row is header
-            header_row_idx = 0
-            report.warnings.append("Could not detect header row, assuming first row")
+    @staticmethod
+    def _select_gl_columns(
+        df: pd.DataFrame, data_start: int, columns: List[Optional[int]]
+    ) -> pd.DataFrame:
+        """
+        Slice the data rows of the GL columns out of a raw sheet.
 
-        # Track header row index for validation
-        report.header_row_index = header_row_idx
+        Args:
+            df: Raw sheet (header=None)
+            data_start: First data row (the row after the header)
+            columns: Positions of date, account, description, debit, credit;
+                None for optional columns missing from the sheet
 
-        # Extract column mappings
-        header_row = df.iloc[header_row_idx].astype(str).str.lower()
-
-        # Find column indices
-        date_col = None
-        account_col = None
-        desc_col = None
-        debit_col = None
-        credit_col = None
-
-        for idx, val in enumerate(header_row):
-            val_lower = str(val).lower()
-            if "date" in val_lower and date_col is None:
-                date_col = idx
-            elif "account" in val_lower and account_col is None:
-                account_col = idx
-            elif ("description" in val_lower or "memo" in val_lower or "name" in val_lower) and desc_col is None:
-                desc_col = idx
-            elif "debit" in val_lower and debit_col is None:
-                debit_col = idx
-            elif "credit" in val_lower and credit_col is None:
-                credit_col = idx
-
-        # If columns not found, try common positions
-        if date_col is None:
-            date_col = 0
-        if account_col is None:
-            account_col = 1
-        if desc_col is None:
-            desc_col = 2
-        if debit_col is None:
-            debit_col = 3
-        if credit_col is None:
-            credit_col = 4
+        Returns:
+            DataFrame with columns: date, account_name_raw, description, debit, credit
+        """
+        date_col, account_col, desc_col, debit_col, credit_col = columns
 
         # Extract data rows (skip header)
-        data_start = header_row_idx + 1
-        result_df = pd.DataFrame()
+        if len(df) <= data_start:
+            return pd.DataFrame()
 
-        if len(df) > data_start:
-            result_df["date"] = df.iloc[data_start:, date_col].reset_index(drop=True)
-            result_df["account_name_raw"] = (
-                df.iloc[data_start:, account_col].astype(str).reset_index(drop=True)
-            )
-            if desc_col < len(df.columns):
-                result_df["description"] = (
-                    df.iloc[data_start:, desc_col].astype(str).reset_index(drop=True)
-                )
-            else:
-                result_df["description"] = ""
-            if debit_col < len(df.columns):
-                result_df["debit"] = df.iloc[data_start:, debit_col].reset_index(drop=True)
-            else:
-                result_df["debit"] = 0
-            if credit_col < len(df.columns):
-                result_df["credit"] = df.iloc[data_start:, credit_col].reset_index(drop=True)
-            else:
-                result_df["credit"] = 0
+        rows = df.iloc[data_start:]
+
+        def values(column: Optional[int], as_str: bool = False, default: Any = None) -> Any:
+            if column is None:
+                return default
+            series = rows.iloc[:, column]
+            array = (series.astype(str) if as_str else series).to_numpy()
+            # Explicit dtype: the DataFrame constructor would otherwise infer
+            # datetime64 from object columns of Excel dates
+            return pd.Series(array, dtype=array.dtype, copy=False)
 
-        return result_df
+        # One DataFrame built from the columns' arrays, all on a fresh RangeIndex
+        return pd.DataFrame(
+            {
+                "date": values(date_col),
+                "account_name_raw": values(account_col, as_str=True),
+                "description": values(desc_col, as_str=True, default=""),
+                "debit": values(debit_col, default=0),
+                "credit": values(credit_col, default=0),
+            }
+        )
 
     def _normalize_data(
         self,
@@ -236,7 +632,7 @@ class GLIngestionEngine:
         df["row_id"] = range(len(df))
 
         # Parse dates (but don't remove invalid dates yet - we need headers for hierarchy)
-        df["date"] = pd.to_datetime(df["date"], errors="coerce", infer_datetime_format=True)
+        df["date"] = self._parse_dates(df["date"])
 
         # Forward-fill account names (for QuickBooks Desktop parent/subaccount structure)
         df["account_name_raw"] = df["account_name_raw"].fillna("")
@@ -244,53 +640,33 @@ class GLIngestionEngine:
 
         # Build account hierarchy by forward-filling BEFORE removing invalid dates
         # QuickBooks Desktop often has parent accounts on separate rows before transactions
-        account_hierarchy = []
-        current_hierarchy = []
-        is_transaction_row = []
-
-        for idx, row in df.iterrows():
-            account_raw = str(row["account_name_raw"]).strip()
-            has_valid_date = not pd.isna(row["date"])
-
-            # Check if this is an account header (no valid date or no debit/credit)
-            is_header = False
-            if not has_valid_date:
-                is_header = True
-            else:
-                # Check if debit and credit are both empty/zero
-                debit_val = self._safe_numeric(row.get("debit", 0))
-                credit_val = self._safe_numeric(row.get("credit", 0))
-                if debit_val == 0 and credit_val == 0 and account_raw:
-                    # Likely a header row (parent account)
-                    is_header = True
-
-            if is_header and account_raw:
-                # This is a parent account header - update hierarchy
-                level = self._detect_account_level(account_raw, current_hierarchy)
-                # Update current hierarchy at the detected level
-                current_hierarchy = current_hierarchy[:level] + [account_raw]
-                # Headers don't get added to account_hierarchy (they're not transactions)
-                account_hierarchy.append("")
-                is_transaction_row.append(False)
-            elif account_raw and has_valid_date:
-                # This is a transaction row - use current hierarchy + this account
-                if current_hierarchy:
-                    # Build flattened name: Parent : Sub : Account
-                    full_hierarchy = current_hierarchy + [account_raw]
-                    account_flat = " : ".join([a.strip() for a in full_hierarchy if a.strip()])
-                else:
-                    # No parent hierarchy, just use the account name
-                    account_flat = account_raw
-                account_hierarchy.append(account_flat)
-                is_transaction_row.append(True)
-                # Don't update hierarchy with transaction accounts - they're leaf nodes
-            else:
-                # Empty account or invalid row
-                account_hierarchy.append("")
-                is_transaction_row.append(False)
-                # Reset hierarchy if we hit an empty row
-                if not account_raw:
-                    current_hierarchy = []
+        n = len(df)
+        account_raw = df["account_name_raw"].str.strip().to_numpy(dtype=object)
+        has_valid_date = df["date"].notna().to_numpy()
+        debit_num = self._numeric_array(df, "debit")
+        credit_num = self._numeric_array(df, "credit")
+
+        # Header rows: no valid date, or no debit/credit on a named account (parent account)
+        is_header = ~has_valid_date | ((debit_num == 0) & (credit_num == 0) & (account_raw != ""))
+
+        account_ids, account_names = pd.factorize(account_raw)
+        account_ids[account_raw == ""] = -1
+
+        # Lowercased once; reused for top-level detection and summary-row removal
+        account_lower = df["account_name_raw"].str.lower().to_numpy(dtype=object)
+        desc_lower = df["description"].str.lower().fillna("").to_numpy(dtype=object)
+        is_top_level = self._contains_any(account_lower, self.PARENT_ACCOUNT_INDICATORS)
+
+        # The hierarchy is a sequential state machine over the rows (JIT-compiled)
+        node_parent, node_account, txn_node = _build_hierarchy(
+            is_header, has_valid_date, account_ids, is_top_level
+        )
+        is_transaction_row = txn_node > -2
+        account_hierarchy = np.full(n, "", dtype=object)
+        account_hierarchy[is_transaction_row] = self._flatten_hierarchy(
+            node_parent, node_account, txn_node[is_transaction_row],
+            account_ids[is_transaction_row], np.asarray(account_names, dtype=object),
+        )
 
         df["account_name_flat"] = account_hierarchy
         df["_is_transaction"] = is_transaction_row
@@ -301,9 +677,9 @@ class GLIngestionEngine:
 
         # Now remove rows with invalid dates (non-transaction rows)
         # Keep transaction rows with valid dates, remove everything else
-        invalid_date_mask = ~df["_is_transaction"] | df["date"].isna()
-        report.rows_with_invalid_dates = invalid_date_mask.sum()
-        df = df[df["_is_transaction"] & df["date"].notna()].copy()
+        keep = is_transaction_row & has_valid_date
+        report.rows_with_invalid_dates = int((~keep).sum())
+        df = df[keep].copy()
 
         # Drop the helper column
         if "_is_transaction" in df.columns:
@@ -313,7 +689,7 @@ class GLIngestionEngine:
             return self._create_empty_normalized_df()
 
         # Remove totals, subtotals, and opening balances
-        df = self._remove_summary_rows(df, report)
+        df = self._remove_summary_rows(df, account_lower[keep], desc_lower[keep], report)
 
         # Standardize numeric columns
         df["debit"] = pd.to_numeric(df["debit"], errors="coerce").fillna(0)
@@ -340,87 +716,175 @@ class GLIngestionEngine:
             "amount_net",
         ]
 
-        # Select only columns that exist
-        available_columns = [col for col in column_order if col in df.columns]
-        df = df[available_columns]
+        # Every column exists by now, so this is a plain reorder/projection
+        df = df.reindex(columns=column_order)
+
+        # Low-cardinality string columns are stored as int codes + one copy of each value
+        df = df.astype({col: "category" for col in self.CATEGORICAL_COLUMNS})
+        # Free-text description as one contiguous Arrow string buffer
+        if pyarrow is not None:
+            df = df.astype({"description": "string[pyarrow]"})
 
         return df.reset_index(drop=True)
 
-    def _detect_account_level(self, account_name: str, current_hierarchy: List[str]) -> int:
+    @staticmethod
+    def _parse_dates(dates: pd.Series) -> pd.Series:
         """
-        Detect the hierarchy level of an account name.
-        Returns the level (0 = top level, 1 = sub-account, etc.)
+        Parse the date column (unparseable values become NaT).
+
+        The format is guessed once from the first non-null value, as pandas
+        does, and passed explicitly so the column is parsed with strptime.
+        Like pandas, empty and NaT-like strings ("", "NaT", "nan") don't count
+        as the first value. If the first value is not a guessable date string,
+        values are parsed individually (format="mixed") - the same fallback
+        pandas uses, without its per-call warning.
         """
-        # Simple heuristic: check for indentation (leading spaces/tabs)
-        stripped = account_name.strip()
-        leading_spaces = len(account_name) - len(stripped)
-
-        # If significantly indented, it's likely a sub-account
-        if leading_spaces > 2:
-            # Determine level based on indentation
-            level = min(leading_spaces // 4, len(current_hierarchy))
-            return level
-
-        # Check for common parent account indicators
-        account_lower = account_name.lower()
-        if any(
-            indicator in account_lower
-            for indicator in ["assets", "liabilities", "equity", "income", "expenses", "revenue"]
-        ):
-            return 0
-
-        # Default: assume it's at the next level
-        return len(current_hierarchy)
+        first = next(
+            (
+                value
+                for value in dates.to_numpy()
+                if not (pd.isna(value) or (isinstance(value, str) and value in _NAT_STRINGS))
+            ),
+            None,
+        )
+        date_format = "mixed"
+        if isinstance(first, str):
+            date_format = guess_datetime_format(first) or "mixed"
+        return pd.to_datetime(dates, format=date_format, errors="coerce")
+
+    @staticmethod
+    def _flatten_hierarchy(
+        node_parent: np.ndarray,
+        node_account: np.ndarray,
+        txn_node: np.ndarray,
+        txn_account: np.ndarray,
+        account_names: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Build "Parent : Sub : Account" names for transaction rows.
+
+        Each hierarchy node's path is joined once, and each distinct
+        (node, account) pair once, instead of once per transaction row.
+        """
+        node_paths = np.empty(len(node_parent), dtype=object)
+        for k in range(len(node_parent)):
+            name = account_names[node_account[k]]
+            parent = node_parent[k]
+            node_paths[k] = name if parent < 0 else f"{node_paths[parent]} : {name}"
+
+        # (node, account) packed into one int64 key and hashed, rather than
+        # sorting the pairs
+        n_accounts = max(len(account_names), 1)
+        inverse, keys = pd.factorize((txn_node + 1) * n_accounts + txn_account)
+        nodes, accounts = np.divmod(keys, n_accounts)
+        flat = np.array(
+            [
+                f"{node_paths[node - 1]} : {account_names[account]}"
+                if node > 0
+                else account_names[account]
+                for node, account in zip(nodes.tolist(), accounts.tolist())
+            ],
+            dtype=object,
+        )
+        return flat[inverse]
 
     def _remove_summary_rows(
-        self, df: pd.DataFrame, report: ProcessingReport
+        self,
+        df: pd.DataFrame,
+        account_lower: np.ndarray,
+        desc_lower: np.ndarray,
+        report: ProcessingReport,
     ) -> pd.DataFrame:
-        """Remove totals, subtotals, and opening balance rows"""
+        """
+        Remove totals, subtotals, and opening balance rows.
+
+        Args:
+            df: Transaction rows
+            account_lower: Lowercased account_name_raw, aligned with df
+            desc_lower: Lowercased description ('' if missing), aligned with df
+            report: Processing report to update with removal counts
+        """
         if df.empty:
             return df
 
-        original_len = len(df)
+        # Account name and description scanned together (a newline can't be
+        # part of any pattern, so matches never span the two fields)
+        text = account_lower + "\n" + desc_lower
 
-        # Check account names for summary patterns
-        account_lower = df["account_name_raw"].str.lower().fillna("")
-        desc_lower = df["description"].str.lower().fillna("")
+        # Categories are counted independently (a row can match several);
+        # every matching row is dropped in one boolean index
+        total_mask, subtotal_mask, opening_mask = self._keyword_group_masks(
+            text, (self.TOTAL_PATTERNS, self.SUBTOTAL_PATTERNS, self.OPENING_BALANCE_PATTERNS)
+        )
 
-        # Remove totals
-        total_mask = account_lower.str.contains("|".join(self.TOTAL_PATTERNS), case=False, na=False)
-        total_mask |= desc_lower.str.contains("|".join(self.TOTAL_PATTERNS), case=False, na=False)
-        report.rows_removed_totals = total_mask.sum()
-        df = df[~total_mask].copy()
+        report.rows_removed_totals = int(total_mask.sum())
+        report.rows_removed_subtotals = int(subtotal_mask.sum())
+        report.rows_removed_opening_balance = int(opening_mask.sum())
 
-        # Remove subtotals
-        subtotal_mask = account_lower.str.contains(
-            "|".join(self.SUBTOTAL_PATTERNS), case=False, na=False
-        )
-        subtotal_mask |= desc_lower.str.contains(
-            "|".join(self.SUBTOTAL_PATTERNS), case=False, na=False
-        )
-        report.rows_removed_subtotals = subtotal_mask.sum()
-        df = df[~subtotal_mask].copy()
+        return df[~(total_mask | subtotal_mask | opening_mask)]
 
-        # Remove opening balances
-        opening_mask = account_lower.str.contains(
-            "|".join(self.OPENING_BALANCE_PATTERNS), case=False, na=False
-        )
-        opening_mask |= desc_lower.str.contains(
-            "|".join(self.OPENING_BALANCE_PATTERNS), case=False, na=False
-        )
-        report.rows_removed_opening_balance = opening_mask.sum()
-        df = df[~opening_mask].copy()
+    @classmethod
+    def _keyword_group_masks(
+        cls, text: np.ndarray, groups: Tuple[List[str], ...]
+    ) -> List[np.ndarray]:
+        """
+        Match several groups of literal keywords against lowercased text.
 
-        return df
+        With pyarrow installed each group is matched with Arrow's vectorized
+        substring kernel; otherwise pyahocorasick (if installed) matches every
+        group in a single automaton pass, and failing that each group is one
+        regex scan.
 
-    def _safe_numeric(self, value: Any) -> float:
-        """Safely convert value to numeric"""
-        if pd.isna(value):
-            return 0.0
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return 0.0
+        Args:
+            text: Lowercased strings to search
+            groups: Keyword groups (keywords are literal, lowercase)
+
+        Returns:
+            One boolean mask per group, True where the text contains any of
+            the group's keywords
+        """
+        if pyarrow is not None:
+            values = pyarrow.array(text, type=pyarrow.string())
+            masks = []
+            for keywords in groups:
+                # A keyword containing a shorter keyword of the same group can't
+                # add matches ("totals" vs "total"), so skip its pass over the text
+                needed = [
+                    keyword
+                    for keyword in keywords
+                    if not any(other != keyword and other in keyword for other in keywords)
+                ]
+                mask = np.zeros(len(text), dtype=bool)
+                for keyword in needed:
+                    matched = pc.match_substring(values, keyword).fill_null(False)
+                    mask |= matched.to_numpy(zero_copy_only=False)
+                masks.append(mask)
+            return masks
+
+        if ahocorasick is None:
+            return [cls._contains_any(text, keywords) for keywords in groups]
+
+        automaton = _keyword_automaton(tuple(tuple(keywords) for keywords in groups))
+        masks = np.zeros((len(groups), len(text)), dtype=bool)
+        for row, value in enumerate(text):
+            for _, group_ids in automaton.iter(value):
+                masks[group_ids, row] = True
+        return list(masks)
+
+    @staticmethod
+    def _contains_any(text: np.ndarray, patterns: List[str]) -> np.ndarray:
+        """Boolean mask of the strings in text that contain any of the patterns"""
+        search = _keyword_regex(tuple(patterns)).search
+        return np.fromiter(
+            (search(value) is not None for value in text), dtype=bool, count=len(text)
+        )
+
+    @staticmethod
+    def _numeric_array(df: pd.DataFrame, column: str) -> np.ndarray:
+        """Column as float64 with missing/non-numeric values as 0 (0 if the column is absent)"""
+        if column not in df.columns:
+            return np.zeros(len(df))
+        return pd.to_numeric(df[column], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
 
     def _create_empty_normalized_df(self) -> pd.DataFrame:
         """Create an empty DataFrame with the correct column structure"""
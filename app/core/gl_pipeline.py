@@ -4,14 +4,52 @@ GL Processing Pipeline
 Combines ingestion, normalization, and validation into a single pipeline.
 """
 
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import pandas as pd
 
 from app.core.gl_ingestion import GLIngestionEngine, ProcessingReport
 from app.core.validation import GLValidator, ValidationResult
 
+# Worker pools shared by every GLPipeline, keyed by worker count. Starting
+# processes costs far more than parsing a small GL, so pools live for the
+# life of the process instead of per call.
+_executors: Dict[int, ProcessPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Return the shared pool with this many workers, starting it on first use"""
+    with _executors_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            # Forking a process that runs an event loop and thread pools (the
+            # API) can copy held locks into the child; start workers fresh
+            method = (
+                "forkserver"
+                if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn"
+            )
+            executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context(method)
+            )
+            _executors[workers] = executor
+        return executor
+
+
+def _discard_executor(workers: int, executor: ProcessPoolExecutor) -> None:
+    """Drop a broken shared pool so the next call starts a new one"""
+    with _executors_lock:
+        if _executors.get(workers) is executor:
+            del _executors[workers]
+    executor.shutdown(wait=False, cancel_futures=True)
+
 
 class GLPipeline:
     """Complete pipeline for GL processing: ingestion -> normalization -> validation"""
@@ -30,6 +68,11 @@ class GLPipeline:
             max_date_parse_failure_rate: Maximum allowed date parse failure rate
             debit_credit_tolerance: Tolerance for debit/credit equality check
         """
+        self._config = {
+            "min_transactions": min_transactions,
+            "max_date_parse_failure_rate": max_date_parse_failure_rate,
+            "debit_credit_tolerance": debit_credit_tolerance,
+        }
         self.ingestion_engine = GLIngestionEngine()
         self.validator = GLValidator(
             min_transactions=min_transactions,
@@ -72,3 +115,53 @@ class GLPipeline:
 
         return normalized_df, processing_report, validation_result
 
+    def process_gl_files(
+        self,
+        paths_entities: Sequence[Tuple[Any, ...]],
+        max_workers: Optional[int] = None,
+    ) -> List[Tuple[pd.DataFrame, ProcessingReport, ValidationResult]]:
+        """
+        Process several GL files in parallel, one worker process per CPU core.
+
+        Files are independent, so each one is ingested and validated in its own
+        process by a fresh GLPipeline with this pipeline's thresholds. A single
+        file (or max_workers=1) is processed in-process. Worker pools are
+        shared across calls; this blocks, so async callers should run it in a
+        thread (e.g. run_in_threadpool).
+
+        Args:
+            paths_entities: (file_path, entity[, source_system[, sheet_name]]) tuples,
+                matching the positional arguments of process_gl_file
+            max_workers: Worker process count (None = one per CPU core)
+
+        Returns:
+            List of (normalized_df, processing_report, validation_result), in input order
+        """
+        jobs = [tuple(job) for job in paths_entities]
+        workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+        if workers <= 1:
+            return [self.process_gl_file(*job) for job in jobs]
+
+        # A few chunks per worker keeps the pool balanced without paying a
+        # round trip per file when there are many small GLs
+        chunksize = max(1, len(jobs) // (workers * 4))
+        executor = _get_executor(workers)
+        try:
+            return list(
+                executor.map(
+                    _process_gl_file_job,
+                    [(self._config, job) for job in jobs],
+                    chunksize=chunksize,
+                )
+            )
+        except BrokenProcessPool:
+            _discard_executor(workers, executor)
+            raise
+
+
+def _process_gl_file_job(
+    args: Tuple[Dict[str, Any], Tuple[Any, ...]],
+) -> Tuple[pd.DataFrame, ProcessingReport, ValidationResult]:
+    """Worker entry point for GLPipeline.process_gl_files (must be picklable)"""
+    config, job = args
+    return GLPipeline(**config).process_gl_file(*job)
@@ -4,13 +4,21 @@ GL Account Mapping Module
 Handles account mapping workflow: extraction, categorization, and application.
 """
 
+import numpy as np
 import pandas as pd
+from functools import lru_cache
+from pandas.api.types import union_categoricals
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 
 from app.core.validation import ValidationResult, ValidationStatus
 from app.core.gl_ingestion import ProcessingReport
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional speedup
+    ahocorasick = None
+
 
 # Default chart-of-accounts categories
 DEFAULT_CATEGORIES = [
@@ -24,6 +32,95 @@ DEFAULT_CATEGORIES = [
     "Balance Sheet",
 ]
 
+# Columns a mapping assigns to each account
+MAPPING_COLUMNS = ["main_category", "sub1", "sub2", "client_specific", "notes"]
+
+# Account name patterns (lowercase substrings) suggesting each main category.
+# Categories are checked in this order; the first one with a matching pattern wins.
+CATEGORY_PATTERNS: Dict[str, List[str]] = {
+    "Revenue": [
+        "revenue",
+        "sales",
+        "income",
+        "fees",
+        "service",
+        "product",
+    ],
+    "COGS": [
+        "cost of goods",
+        "cogs",
+        "cost of sales",
+        "direct cost",
+        "material",
+    ],
+    "OpEx": [
+        "expense",
+        "operating",
+        "admin",
+        "general",
+        "salary",
+        "rent",
+        "utilities",
+    ],
+    "Interest": ["interest", "financing", "loan"],
+    "Taxes": ["tax", "taxes"],
+    "D&A": ["depreciation", "amortization", "d&a", "d and a"],
+    "Balance Sheet": [
+        "asset",
+        "liability",
+        "equity",
+        "cash",
+        "account receivable",
+        "account payable",
+    ],
+}
+
+
+# CATEGORY_PATTERNS flattened into parallel (pattern, category, priority) tuples,
+# in priority order
+_PATTERN_STRINGS, _PATTERN_CATEGORIES, _PATTERN_PRIORITIES = zip(
+    *[
+        (pattern, category, priority)
+        for priority, (category, patterns) in enumerate(CATEGORY_PATTERNS.items())
+        for pattern in patterns
+    ]
+)
+
+
+@lru_cache(maxsize=1)
+def _category_automaton():
+    """Aho-Corasick automaton mapping each pattern to (category priority, category)"""
+    automaton = ahocorasick.Automaton()
+    for pattern, category, priority in zip(
+        _PATTERN_STRINGS, _PATTERN_CATEGORIES, _PATTERN_PRIORITIES
+    ):
+        # Keep the highest-priority category if a pattern is listed twice
+        if pattern not in automaton:
+            automaton.add_word(pattern, (priority, category))
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=4096)
+def _suggest_from_patterns(account_name: str) -> Optional[str]:
+    """
+    First category (in CATEGORY_PATTERNS order) with a pattern in the account name.
+
+    Pure function of the name, so repeated names (the same account across
+    entities or files) are answered from the cache.
+    """
+    account_lower = account_name.lower()
+    if ahocorasick is not None:
+        # One automaton pass finds every pattern; keep the highest-priority hit
+        best = min((value for _, value in _category_automaton().iter(account_lower)), default=None)
+        return best[1] if best else None
+
+    # Patterns are in priority order, so the first hit is the best one
+    for pattern, category in zip(_PATTERN_STRINGS, _PATTERN_CATEGORIES):
+        if pattern in account_lower:
+            return category
+    return None
+
 
 @dataclass
 class AccountMapping:
@@ -51,6 +148,10 @@ class AccountMapping:
 class GLAccountMapper:
     """Mapper for GL account categorization"""
 
+    # Accounts whose lowercased names share this many leading characters are
+    # treated as similar when no name pattern matches
+    SIMILAR_PREFIX_LENGTH = 10
+
     def __init__(self, default_categories: Optional[List[str]] = None):
         """
         Initialize account mapper.
@@ -83,10 +184,8 @@ class GLAccountMapper:
                 ]
             )
 
-        # Filter by entity if specified
-        df_filtered = normalized_df.copy()
-        if entity:
-            df_filtered = df_filtered[df_filtered["entity"] == entity]
+        # Filter by entity if specified (nothing below modifies the frame in place)
+        df_filtered = normalized_df[normalized_df["entity"] == entity] if entity else normalized_df
 
         # Get account column
         account_col = (
@@ -95,9 +194,20 @@ class GLAccountMapper:
             else "account_name_raw"
         )
 
-        # Group by account and entity to get unique accounts
+        # Group on categorical keys so groupby hashes integer codes, not strings
+        # (normalized GL output is already categorical)
+        df_filtered = df_filtered.astype(
+            {
+                col: "category"
+                for col in (account_col, "entity")
+                if not isinstance(df_filtered[col].dtype, pd.CategoricalDtype)
+            }
+        )
+
+        # Group by entity and account to get unique accounts; the sorted
+        # groupby already yields the (entity, account) order, so no re-sort
         account_summary = (
-            df_filtered.groupby([account_col, "entity"])
+            df_filtered.groupby(["entity", account_col], observed=True, sort=True)
             .agg(
                 {
                     "account_name_raw": "first",
@@ -108,18 +218,15 @@ class GLAccountMapper:
         )
 
         account_summary.columns = [
-            "account_name_flat",
             "entity",
+            "account_name_flat",
             "account_name_raw",
             "transaction_count",
         ]
 
-        # Sort by entity and account name
-        account_summary = account_summary.sort_values(
-            ["entity", "account_name_flat"]
-        ).reset_index(drop=True)
-
-        return account_summary
+        return account_summary[
+            ["account_name_flat", "entity", "account_name_raw", "transaction_count"]
+        ]
 
     def create_mapping_template(
         self,
@@ -151,17 +258,22 @@ class GLAccountMapper:
                 ]
             )
 
-        # Create base mapping DataFrame
-        mapping_df = unique_accounts_df[
-            ["account_name_flat", "account_name_raw", "entity"]
-        ].copy()
-
-        # Add mapping columns
-        mapping_df["main_category"] = ""
-        mapping_df["sub1"] = ""
-        mapping_df["sub2"] = ""
-        mapping_df["client_specific"] = ""
-        mapping_df["notes"] = ""
+        # Create base mapping DataFrame with empty mapping columns. The key
+        # columns share unique_accounts_df's buffers (copy=False) instead of
+        # being copied into one consolidated block
+        mapping_df = pd.DataFrame(
+            {
+                "account_name_flat": unique_accounts_df["account_name_flat"],
+                "account_name_raw": unique_accounts_df["account_name_raw"],
+                "entity": unique_accounts_df["entity"],
+                "main_category": "",
+                "sub1": "",
+                "sub2": "",
+                "client_specific": "",
+                "notes": "",
+            },
+            copy=False,
+        )
 
         # Merge with existing mapping if provided
         if existing_mapping is not None and not existing_mapping.empty:
@@ -177,12 +289,19 @@ class GLAccountMapper:
                 suffixes=("", "_existing"),
             )
 
-            # Fill in mapping columns from existing mapping
-            for col in ["main_category", "sub1", "sub2", "client_specific", "notes"]:
-                if f"{col}_existing" in mapping_df.columns:
-                    # Use existing value if available, otherwise keep empty string
-                    mapping_df[col] = mapping_df[f"{col}_existing"].fillna("")
-                    mapping_df = mapping_df.drop(columns=[f"{col}_existing"])
+            # Fill in mapping columns from existing mapping: use existing value
+            # if available, otherwise keep empty string
+            merged_cols = set(mapping_df.columns)
+            existing = {
+                col: f"{col}_existing"
+                for col in MAPPING_COLUMNS
+                if f"{col}_existing" in merged_cols
+            }
+            if existing:
+                filled = mapping_df[list(existing.values())].fillna("")
+                mapping_df = mapping_df.assign(
+                    **{col: filled[source] for col, source in existing.items()}
+                ).drop(columns=list(existing.values()))
 
         return mapping_df
 
@@ -205,8 +324,9 @@ class GLAccountMapper:
             return normalized_df.copy()
 
         # Merge mapping onto normalized data
+        mapping_has_entity = "entity" in mapping_df.columns
         merge_cols = ["account_name_flat"]
-        if "entity" in mapping_df.columns and "entity" in normalized_df.columns:
+        if mapping_has_entity and "entity" in normalized_df.columns:
             merge_cols.append("entity")
 
         # Select only mapping columns to merge
@@ -218,22 +338,32 @@ class GLAccountMapper:
             "client_specific",
             "notes",
         ]
-        if "entity" in mapping_df.columns:
+        if mapping_has_entity:
             mapping_cols.insert(1, "entity")
 
-        mapping_to_merge = mapping_df[mapping_cols].copy()
-
-        # Merge
-        result_df = normalized_df.merge(
-            mapping_to_merge,
-            on=merge_cols,
-            how="left",
-        )
+        # The join builds a new frame, so the column subset needs no copy
+        mapping_to_merge = mapping_df[mapping_cols]
+
+        # Give categorical keys the GL's dtype so the join matches on integer
+        # codes; mapping rows for accounts not in the GL can't match anyway
+        for col in merge_cols:
+            key_dtype = normalized_df[col].dtype
+            if isinstance(key_dtype, pd.CategoricalDtype):
+                keys = mapping_to_merge[col]
+                mapping_to_merge = mapping_to_merge[
+                    keys.isna() | keys.isin(key_dtype.categories)
+                ].astype({col: key_dtype})
+
+        # One mapping row per key (the first wins), so the join can't multiply
+        # GL rows; joining on the small indexed mapping avoids a full merge
+        mapping_to_merge = mapping_to_merge.drop_duplicates(merge_cols).set_index(merge_cols)
+        result_df = normalized_df.join(mapping_to_merge, on=merge_cols, how="left")
+        result_df.index = pd.RangeIndex(len(result_df))
 
         # Fill empty mapping values with empty strings
-        for col in ["main_category", "sub1", "sub2", "client_specific", "notes"]:
-            if col in result_df.columns:
-                result_df[col] = result_df[col].fillna("")
+        result_cols = set(result_df.columns)
+        present = [col for col in MAPPING_COLUMNS if col in result_cols]
+        result_df[present] = result_df[present].fillna("")
 
         return result_df
 
@@ -250,68 +380,97 @@ class GLAccountMapper:
         Returns:
             Suggested category or None
         """
-        account_lower = account_name.lower()
-
-        # Pattern matching for category suggestions
-        patterns = {
-            "Revenue": [
-                "revenue",
-                "sales",
-                "income",
-                "fees",
-                "service",
-                "product",
-            ],
-            "COGS": [
-                "cost of goods",
-                "cogs",
-                "cost of sales",
-                "direct cost",
-                "material",
-            ],
-            "OpEx": [
-                "expense",
-                "operating",
-                "admin",
-                "general",
-                "salary",
-                "rent",
-                "utilities",
-            ],
-            "Interest": ["interest", "financing", "loan"],
-            "Taxes": ["tax", "taxes"],
-            "D&A": ["depreciation", "amortization", "d&a", "d and a"],
-            "Balance Sheet": [
-                "asset",
-                "liability",
-                "equity",
-                "cash",
-                "account receivable",
-                "account payable",
-            ],
-        }
-
         # Check patterns
-        for category, pattern_list in patterns.items():
-            if any(pattern in account_lower for pattern in pattern_list):
-                return category
-
-        # Check existing mapping for similar accounts
-        if mapping_df is not None and not mapping_df.empty:
-            # Find accounts with similar names
-            similar = mapping_df[
-                mapping_df["account_name_flat"].str.contains(
-                    account_name[:10], case=False, na=False
-                )
-            ]
-            if not similar.empty and "main_category" in similar.columns:
-                # Return most common category for similar accounts
-                categories = similar["main_category"].value_counts()
-                if not categories.empty:
-                    return categories.index[0]
+        category = _suggest_from_patterns(account_name)
+        if category:
+            return category
+
+        # Check existing mapping for similar accounts (same 10-character prefix)
+        if mapping_df is not None and not mapping_df.empty and "main_category" in mapping_df:
+            prefix_modes = self._prefix_category_modes(
+                mapping_df["account_name_flat"], mapping_df["main_category"].to_numpy()
+            )
+            return prefix_modes.get(account_name.lower()[: self.SIMILAR_PREFIX_LENGTH])
 
         return None
 
+    def suggest_categories_bulk(self, account_names: pd.Series) -> pd.Series:
+        """
+        Suggest main categories for many account names from name patterns alone.
+
+        Args:
+            account_names: Account names (missing values match nothing)
+
+        Returns:
+            Series aligned with account_names holding the suggested category,
+            or None where no pattern matches
+        """
+        names = account_names.astype(object).fillna("").astype(str)
+        return pd.Series(
+            [_suggest_from_patterns(name) for name in names],
+            index=account_names.index,
+            dtype=object,
+        )
+
+    @classmethod
+    def _name_prefixes(cls, account_names: pd.Series) -> pd.Series:
+        """Lowercased leading characters of each name, the key for similar accounts"""
+        names = account_names.astype(object).fillna("").astype(str)
+        return names.str.lower().str[: cls.SIMILAR_PREFIX_LENGTH]
+
+    @classmethod
+    def _prefix_category_modes(cls, account_names: pd.Series, categories: np.ndarray) -> pd.Series:
+        """
+        Most common non-empty category among accounts sharing a name prefix.
+
+        Args:
+            account_names: Account names
+            categories: Category of each account ('' or missing if unmapped)
+
+        Returns:
+            Series of categories indexed by prefix (ties go to the category
+            that sorts first, as with Series.mode)
+        """
+        categories = np.asarray(categories, dtype=object)
+        known = pd.notna(categories) & (categories != "")
+        pairs = pd.DataFrame(
+            {
+                "prefix": cls._name_prefixes(account_names).to_numpy(dtype=object)[known],
+                "category": categories[known],
+            }
+        )
+        counts = pairs.value_counts().reset_index(name="count")
+        counts = counts.sort_values(["prefix", "count", "category"], ascending=[True, False, True])
+        return counts.drop_duplicates("prefix").set_index("prefix")["category"]
+
+    def _suggest_mapping_categories(self, mapping_df: pd.DataFrame) -> np.ndarray:
+        """
+        main_category values for a mapping template with automatic suggestions filled in.
+
+        Pattern matches are computed for all accounts at once. Accounts without
+        one take the most common category among accounts with the same name
+        prefix (one grouping pass, then a lookup per account).
+
+        Args:
+            mapping_df: Mapping template (from create_mapping_template)
+
+        Returns:
+            Object array of main categories aligned with mapping_df
+        """
+        names = mapping_df["account_name_flat"]
+        suggestions = self.suggest_categories_bulk(names).to_numpy()
+        matched = pd.notna(suggestions)
+        categories = np.where(
+            matched, suggestions, mapping_df["main_category"].to_numpy(dtype=object)
+        )
+
+        unmatched = ~matched & (names.astype(object).fillna("") != "").to_numpy()
+        if unmatched.any():
+            prefix_modes = self._prefix_category_modes(names, categories)
+            similar = self._name_prefixes(names[unmatched]).map(prefix_modes).to_numpy(dtype=object)
+            categories[unmatched] = np.where(pd.notna(similar), similar, categories[unmatched])
+        return categories
+
     def get_default_categories(self) -> List[str]:
         """Get list of default categories"""
         return self.default_categories.copy()
@@ -342,15 +501,7 @@ class GLAccountMapper:
         mapping_df = self.create_mapping_template(unique_accounts_df)
         
         # Apply automatic category suggestions
-        for idx, row in mapping_df.iterrows():
-            account_name = row["account_name_flat"]
-            if pd.isna(account_name) or account_name == "":
-                continue
-                
-            # Get automatic suggestion
-            suggested_category = self.suggest_category(account_name, mapping_df)
-            if suggested_category:
-                mapping_df.at[idx, "main_category"] = suggested_category
+        mapping_df["main_category"] = self._suggest_mapping_categories(mapping_df)
         
         # Apply mapping to normalized data
         mapped_df = self.apply_mapping(normalized_df, mapping_df)
@@ -384,15 +535,7 @@ class GLAccountMapper:
         mapping_df = self.create_mapping_template(unique_accounts_df)
         
         # Apply automatic category suggestions
-        for idx, row in mapping_df.iterrows():
-            account_name = row["account_name_flat"]
-            if pd.isna(account_name) or account_name == "":
-                continue
-                
-            # Get automatic suggestion
-            suggested_category = self.suggest_category(account_name, mapping_df)
-            if suggested_category:
-                mapping_df.at[idx, "main_category"] = suggested_category
+        mapping_df["main_category"] = self._suggest_mapping_categories(mapping_df)
         
         return mapping_df
 
@@ -422,27 +565,16 @@ class MultiEntityProcessor:
         from app.core.gl_pipeline import GLPipeline
 
         pipeline = GLPipeline()
-        all_dfs = []
-        all_reports = []
-        all_validation_results = []
-
-        for file_path, entity in file_entity_pairs:
-            # Process each file
-            normalized_df, processing_report, validation_result = (
-                pipeline.process_gl_file(
-                    file_path=file_path,
-                    entity=entity,
-                    source_system=source_system,
-                )
-            )
-
-            all_dfs.append(normalized_df)
-            all_reports.append(processing_report)
-            all_validation_results.append(validation_result)
+        results = pipeline.process_gl_files(
+            [(file_path, entity, source_system) for file_path, entity in file_entity_pairs]
+        )
+        all_dfs, all_reports, all_validation_results = (
+            map(list, zip(*results)) if results else ([], [], [])
+        )
 
         # Consolidate DataFrames
         if all_dfs:
-            consolidated_df = pd.concat(all_dfs, ignore_index=True)
+            consolidated_df = self._concat_normalized(all_dfs)
         else:
             consolidated_df = pd.DataFrame()
 
@@ -453,6 +585,35 @@ class MultiEntityProcessor:
 
         return consolidated_df, all_reports, consolidated_validation
 
+    @staticmethod
+    def _concat_normalized(dfs: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Concatenate per-file normalized frames in one pass.
+
+        Categorical columns get the union of every frame's categories first;
+        pandas would otherwise fall back to object columns wherever the
+        categories differ (e.g. one entity per file).
+
+        Args:
+            dfs: Normalized GL DataFrames (at least one)
+
+        Returns:
+            Consolidated DataFrame with a fresh RangeIndex
+        """
+        # Empty frames add no rows, and their object columns would defeat the union
+        frames = [df for df in dfs if not df.empty] or dfs
+        unified = {}
+        for col in frames[0].columns:
+            columns = [df[col] for df in frames if col in df.columns]
+            if len(columns) == len(frames) and all(
+                isinstance(column.dtype, pd.CategoricalDtype) for column in columns
+            ):
+                categories = union_categoricals(columns, sort_categories=True).categories
+                unified[col] = pd.CategoricalDtype(categories)
+        if unified:
+            frames = [df.astype(unified) for df in frames]
+        return pd.concat(frames, ignore_index=True)
+
     def _consolidate_validation_results(
         self, validation_results: List[ValidationResult]
     ) -> ValidationResult:
@@ -467,16 +628,17 @@ class MultiEntityProcessor:
         """
         consolidated = ValidationResult()
 
-        # Aggregate metrics
-        total_transactions = sum(
-            vr.key_metrics.get("total_transactions", 0) for vr in validation_results
-        )
-        total_debits = sum(
-            vr.key_metrics.get("total_debits", 0) for vr in validation_results
-        )
-        total_credits = sum(
-            vr.key_metrics.get("total_credits", 0) for vr in validation_results
-        )
+        # Aggregate metrics, messages and status in a single pass
+        total_transactions = total_debits = total_credits = 0
+        any_failed = False
+        for vr in validation_results:
+            metrics = vr.key_metrics
+            total_transactions += metrics.get("total_transactions", 0)
+            total_debits += metrics.get("total_debits", 0)
+            total_credits += metrics.get("total_credits", 0)
+            consolidated.errors.extend(vr.errors)
+            consolidated.warnings.extend(vr.warnings)
+            any_failed = any_failed or not vr.is_valid()
 
         consolidated.key_metrics = {
             "total_transactions": total_transactions,
@@ -486,16 +648,8 @@ class MultiEntityProcessor:
             "date_parse_failure_rate": 0.0,  # Would need to aggregate from reports
         }
 
-        # Collect all errors and warnings
-        for vr in validation_results:
-            consolidated.errors.extend(vr.errors)
-            consolidated.warnings.extend(vr.warnings)
-
         # Set status: FAIL if any validation failed
-        if any(not vr.is_valid() for vr in validation_results):
-            consolidated.status = ValidationStatus.FAIL
-        else:
-            consolidated.status = ValidationStatus.PASS
+        consolidated.status = ValidationStatus.FAIL if any_failed else ValidationStatus.PASS
 
         return consolidated
 
@@ -6,10 +6,183 @@ Validates normalized GL data to ensure data quality before mapping and EBITDA ca
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from app.utils.jit import NUMBA_AVAILABLE, njit
+
+
+# User-facing messages; templates are only formatted when a check fails
+_NO_TRANSACTIONS_ERROR = (
+    "❌ **No transactions found in your GL file**\n\n"
+    "**What happened:** The file you uploaded appears to be empty or contains no valid transaction data.\n\n"
+    "**Why this usually happens:**\n"
+    "• The Excel file may be blank or contain only headers\n"
+    "• The file format may not match QuickBooks Desktop or QuickBooks Online exports\n"
+    "• All rows may have been filtered out during processing (e.g., totals, subtotals, or invalid dates)\n\n"
+    "**What to do next:**\n"
+    "• Verify the file contains actual transaction data\n"
+    "• Ensure you exported the General Ledger report from QuickBooks\n"
+    "• Check that the file includes date, account, debit, and credit columns\n"
+    "• Try re-exporting the GL report from QuickBooks"
+)
+
+_MISSING_AMOUNTS_ERROR = (
+    "❌ **No usable debit/credit amounts in your GL file**\n\n"
+    "**What happened:** {problem}\n\n"
+    "**Why this usually happens:**\n"
+    "• The debit and credit columns were not recognized in the export\n"
+    "• Amounts may be stored as text instead of numbers in Excel\n"
+    "• The file may contain only a summary or header section\n\n"
+    "**What to do next:**\n"
+    "• Re-export the General Ledger report from QuickBooks using the standard format\n"
+    "• Check that the file includes debit and credit columns with numeric values\n"
+    "• Remove any manual formatting from the amount columns"
+)
+
+_DEBIT_CREDIT_ERROR = (
+    "❌ **Debits and Credits Don't Balance**\n\n"
+    "**What failed:** Your GL data shows total debits of ${total_debits:,.2f} and total credits of ${total_credits:,.2f}, "
+    "with a difference of ${difference:,.2f}. In accounting, debits must equal credits.\n\n"
+    "**Why this usually happens:**\n"
+    "• The GL export may be incomplete (missing some transactions or date ranges)\n"
+    "• Some rows may have been filtered out during processing (totals, subtotals, or invalid dates)\n"
+    "• The export may have been cut off or corrupted during download\n"
+    "• You may have selected the wrong date range or account filters in QuickBooks\n\n"
+    "**What to do next:**\n"
+    "• Verify your QuickBooks GL report shows balanced debits and credits before exporting\n"
+    "• Re-export the General Ledger report ensuring all transactions are included\n"
+    "• Check that you selected the correct date range and account filters\n"
+    "• Ensure the file wasn't modified after export (don't add/delete rows manually)\n"
+    "• If the issue persists, contact your accounting team to verify the GL data integrity"
+)
+
+_TRANSACTION_COUNT_ERROR = (
+    "❌ **Insufficient Transaction Data**\n\n"
+    "**What failed:** Your GL file contains only {total_transactions} transaction(s), "
+    "but at least {min_transactions} transaction(s) are required for processing.\n\n"
+    "**Why this usually happens:**\n"
+    "• The date range selected in QuickBooks may be too narrow\n"
+    "• Account filters may have excluded most transactions\n"
+    "• The file may have been filtered too aggressively during processing\n"
+    "• You may have uploaded a summary report instead of detailed transactions\n\n"
+    "**What to do next:**\n"
+    "• Re-export the General Ledger report with a broader date range\n"
+    "• Remove account filters or expand the account selection in QuickBooks\n"
+    "• Ensure you're exporting detailed transactions, not summary totals\n"
+    "• Verify the file contains actual transaction rows, not just headers or totals"
+)
+
+_DATE_PARSE_FAILURE_ERROR = (
+    "❌ **Too Many Invalid Dates in Your GL File**\n\n"
+    "**What failed:** {failure_rate:.1%} of rows in your GL file have invalid or unreadable dates, "
+    "which exceeds the maximum allowed rate of {max_failure_rate:.1%}.\n\n"
+    "**Why this usually happens:**\n"
+    "• Date columns may be formatted inconsistently in the Excel file\n"
+    "• The file may contain header rows, totals, or subtotals mixed with transactions\n"
+    "• Dates may be stored as text instead of date values in Excel\n"
+    "• The QuickBooks export format may have changed or be corrupted\n\n"
+    "**What to do next:**\n"
+    "• Re-export the General Ledger report from QuickBooks using the standard format\n"
+    "• Ensure dates are in a consistent format (MM/DD/YYYY or YYYY-MM-DD)\n"
+    "• Remove any manual formatting or merged cells from the Excel file\n"
+    "• Verify the file opens correctly in Excel and dates display properly\n"
+    "• If using QuickBooks Desktop, try exporting to CSV first, then converting to Excel"
+)
+
+_NEGATIVE_DEBITS_WARNING = (
+    "⚠️ **Negative Debits Detected**\n\n"
+    "**What we found:** {negative_debits} transaction(s) have negative debit amounts.\n\n"
+    "**Why this usually happens:**\n"
+    "• Credit memos or refunds may be recorded as negative debits\n"
+    "• Reversing entries may use negative amounts\n"
+    "• Data entry errors where credits were entered in the debit column\n\n"
+    "**What to do next:**\n"
+    "• Review these transactions in QuickBooks to verify they're correct\n"
+    "• If these are valid credit memos or reversals, no action needed\n"
+    "• If these are errors, correct them in QuickBooks and re-export"
+)
+
+_NEGATIVE_CREDITS_WARNING = (
+    "⚠️ **Negative Credits Detected**\n\n"
+    "**What we found:** {negative_credits} transaction(s) have negative credit amounts.\n\n"
+    "**Why this usually happens:**\n"
+    "• Debit memos or adjustments may be recorded as negative credits\n"
+    "• Reversing entries may use negative amounts\n"
+    "• Data entry errors where debits were entered in the credit column\n\n"
+    "**What to do next:**\n"
+    "• Review these transactions in QuickBooks to verify they're correct\n"
+    "• If these are valid debit memos or reversals, no action needed\n"
+    "• If these are errors, correct them in QuickBooks and re-export"
+)
+
+
+@njit(cache=True)
+def _compensated_add(total, compensation, value):
+    """Neumaier summation step: returns the new total and running compensation"""
+    new_total = total + value
+    if abs(total) >= abs(value):
+        compensation += (total - new_total) + value
+    else:
+        compensation += (value - new_total) + total
+    return new_total, compensation
+
+
+@njit(cache=True)
+def _scan_amounts(debits, credits):
+    """
+    Debit/credit totals and negative counts in a single pass (NaN skipped).
+
+    Amounts are summed in blocks of 256 and the block sums are combined with
+    compensated summation, which keeps totals accurate to well below a cent
+    on multi-million-row GLs while the inner loop stays a plain add.
+    """
+    debit_total = debit_comp = credit_total = credit_comp = 0.0
+    debit_block = credit_block = 0.0
+    negative_debits = negative_credits = 0
+    for i in range(debits.shape[0]):
+        debit = debits[i]
+        credit = credits[i]
+        if debit == debit:
+            debit_block += debit
+            negative_debits += debit < 0
+        if credit == credit:
+            credit_block += credit
+            negative_credits += credit < 0
+        if (i & 255) == 255:
+            debit_total, debit_comp = _compensated_add(debit_total, debit_comp, debit_block)
+            credit_total, credit_comp = _compensated_add(credit_total, credit_comp, credit_block)
+            debit_block = credit_block = 0.0
+    debit_total, debit_comp = _compensated_add(debit_total, debit_comp, debit_block)
+    credit_total, credit_comp = _compensated_add(credit_total, credit_comp, credit_block)
+    return debit_total + debit_comp, credit_total + credit_comp, negative_debits, negative_credits
+
+
+def _amount_metrics(debits: np.ndarray, credits: np.ndarray) -> Tuple[float, float, int, int]:
+    """
+    Total debits, total credits and negative debit/credit counts.
+
+    Uses the fused JIT scan when numba is installed; otherwise NumPy
+    reductions (a pure-Python loop would be far slower than those).
+
+    Args:
+        debits: Debit amounts as float64 (NaN = missing)
+        credits: Credit amounts as float64 (NaN = missing)
+
+    Returns:
+        Tuple of (total_debits, total_credits, negative_debits, negative_credits)
+    """
+    if NUMBA_AVAILABLE:
+        total_debits, total_credits, negative_debits, negative_credits = _scan_amounts(
+            debits, credits
+        )
+    else:
+        total_debits, total_credits = np.nansum(debits), np.nansum(credits)
+        negative_debits = np.count_nonzero(debits < 0)
+        negative_credits = np.count_nonzero(credits < 0)
+    return float(total_debits), float(total_credits), int(negative_debits), int(negative_credits)
+
 
 class ValidationStatus(str, Enum):
     """Validation status enumeration"""
@@ -80,19 +253,7 @@ class GLValidator:
 
         if normalized_df.empty:
             result.status = ValidationStatus.FAIL
-            result.errors.append(
-                "❌ **No transactions found in your GL file**\n\n"
-                "**What happened:** The file you uploaded appears to be empty or contains no valid transaction data.\n\n"
-                "**Why this usually happens:**\n"
-                "• The Excel file may be blank or contain only headers\n"
-                "• The file format may not match QuickBooks Desktop or QuickBooks Online exports\n"
-                "• All rows may have been filtered out during processing (e.g., totals, subtotals, or invalid dates)\n\n"
-                "**What to do next:**\n"
-                "• Verify the file contains actual transaction data\n"
-                "• Ensure you exported the General Ledger report from QuickBooks\n"
-                "• Check that the file includes date, account, debit, and credit columns\n"
-                "• Try re-exporting the GL report from QuickBooks"
-            )
+            result.errors.append(_NO_TRANSACTIONS_ERROR)
             result.key_metrics = {
                 "total_transactions": 0,
                 "total_debits": 0.0,
@@ -101,10 +262,27 @@ class GLValidator:
             }
             return result
 
-        # Collect key metrics
+        # Cheap structural check before any O(N) scans: a frame without numeric
+        # amounts can't pass, so fail fast with a specific message
+        amounts_problem = self._amount_columns_problem(normalized_df)
+        if amounts_problem:
+            result.status = ValidationStatus.FAIL
+            result.errors.append(_MISSING_AMOUNTS_ERROR.format(problem=amounts_problem))
+            result.key_metrics = {
+                "total_transactions": len(normalized_df),
+                "total_debits": 0.0,
+                "total_credits": 0.0,
+                "date_parse_failure_rate": 0.0,
+            }
+            return result
+
+        # Collect key metrics: one scan over the amount columns gives both the
+        # totals and the negative-amount counts
         total_transactions = len(normalized_df)
-        total_debits = float(normalized_df["debit"].sum())
-        total_credits = float(normalized_df["credit"].sum())
+        total_debits, total_credits, negative_debits, negative_credits = _amount_metrics(
+            normalized_df["debit"].to_numpy(dtype=np.float64, na_value=np.nan),
+            normalized_df["credit"].to_numpy(dtype=np.float64, na_value=np.nan),
+        )
 
         # Calculate date parse failure rate from processing report if available
         # Exclude header row from calculation since it's expected to not have a date
@@ -139,7 +317,7 @@ class GLValidator:
         self._validate_date_parse_failure_rate(date_parse_failure_rate, result)
 
         # 3. Negative debit/credit warnings
-        self._check_negative_amounts(normalized_df, result)
+        self._check_negative_amounts(negative_debits, negative_credits, result)
 
         # Update status based on errors
         if result.errors:
@@ -147,6 +325,26 @@ class GLValidator:
 
         return result
 
+    @staticmethod
+    def _amount_columns_problem(normalized_df: pd.DataFrame) -> Optional[str]:
+        """
+        Check that the debit/credit columns exist, are numeric and hold data.
+
+        Args:
+            normalized_df: Normalized GL DataFrame
+
+        Returns:
+            Description of the problem, or None if the amount columns are usable
+        """
+        for column in ("debit", "credit"):
+            if column not in normalized_df.columns:
+                return f"The {column} column is missing from the processed data."
+            if not pd.api.types.is_numeric_dtype(normalized_df[column].dtype):
+                return f"The {column} column does not contain numeric amounts."
+        if normalized_df["debit"].isna().all() and normalized_df["credit"].isna().all():
+            return "Every debit and credit amount in the file is blank."
+        return None
+
     def _validate_debit_credit_equality(
         self,
         total_debits: float,
@@ -164,21 +362,8 @@ class GLValidator:
         difference = abs(total_debits - total_credits)
 
         if difference > self.debit_credit_tolerance:
-            error_msg = (
-                f"❌ **Debits and Credits Don't Balance**\n\n"
-                f"**What failed:** Your GL data shows total debits of ${total_debits:,.2f} and total credits of ${total_credits:,.2f}, "
-                f"with a difference of ${difference:,.2f}. In accounting, debits must equal credits.\n\n"
-                "**Why this usually happens:**\n"
-                "• The GL export may be incomplete (missing some transactions or date ranges)\n"
-                "• Some rows may have been filtered out during processing (totals, subtotals, or invalid dates)\n"
-                "• The export may have been cut off or corrupted during download\n"
-                "• You may have selected the wrong date range or account filters in QuickBooks\n\n"
-                "**What to do next:**\n"
-                "• Verify your QuickBooks GL report shows balanced debits and credits before exporting\n"
-                "• Re-export the General Ledger report ensuring all transactions are included\n"
-                "• Check that you selected the correct date range and account filters\n"
-                "• Ensure the file wasn't modified after export (don't add/delete rows manually)\n"
-                "• If the issue persists, contact your accounting team to verify the GL data integrity"
+            error_msg = _DEBIT_CREDIT_ERROR.format(
+                total_debits=total_debits, total_credits=total_credits, difference=difference
             )
             result.errors.append(error_msg)
 
@@ -193,20 +378,8 @@ class GLValidator:
             result: ValidationResult to update
         """
         if total_transactions < self.min_transactions:
-            error_msg = (
-                f"❌ **Insufficient Transaction Data**\n\n"
-                f"**What failed:** Your GL file contains only {total_transactions} transaction(s), "
-                f"but at least {self.min_transactions} transaction(s) are required for processing.\n\n"
-                "**Why this usually happens:**\n"
-                "• The date range selected in QuickBooks may be too narrow\n"
-                "• Account filters may have excluded most transactions\n"
-                "• The file may have been filtered too aggressively during processing\n"
-                "• You may have uploaded a summary report instead of detailed transactions\n\n"
-                "**What to do next:**\n"
-                "• Re-export the General Ledger report with a broader date range\n"
-                "• Remove account filters or expand the account selection in QuickBooks\n"
-                "• Ensure you're exporting detailed transactions, not summary totals\n"
-                "• Verify the file contains actual transaction rows, not just headers or totals"
+            error_msg = _TRANSACTION_COUNT_ERROR.format(
+                total_transactions=total_transactions, min_transactions=self.min_transactions
             )
             result.errors.append(error_msg)
 
@@ -221,64 +394,27 @@ class GLValidator:
             result: ValidationResult to update
         """
         if failure_rate > self.max_date_parse_failure_rate:
-            error_msg = (
-                f"❌ **Too Many Invalid Dates in Your GL File**\n\n"
-                f"**What failed:** {failure_rate:.1%} of rows in your GL file have invalid or unreadable dates, "
-                f"which exceeds the maximum allowed rate of {self.max_date_parse_failure_rate:.1%}.\n\n"
-                "**Why this usually happens:**\n"
-                "• Date columns may be formatted inconsistently in the Excel file\n"
-                "• The file may contain header rows, totals, or subtotals mixed with transactions\n"
-                "• Dates may be stored as text instead of date values in Excel\n"
-                "• The QuickBooks export format may have changed or be corrupted\n\n"
-                "**What to do next:**\n"
-                "• Re-export the General Ledger report from QuickBooks using the standard format\n"
-                "• Ensure dates are in a consistent format (MM/DD/YYYY or YYYY-MM-DD)\n"
-                "• Remove any manual formatting or merged cells from the Excel file\n"
-                "• Verify the file opens correctly in Excel and dates display properly\n"
-                "• If using QuickBooks Desktop, try exporting to CSV first, then converting to Excel"
+            error_msg = _DATE_PARSE_FAILURE_ERROR.format(
+                failure_rate=failure_rate, max_failure_rate=self.max_date_parse_failure_rate
             )
             result.errors.append(error_msg)
 
     def _check_negative_amounts(
-        self, df: pd.DataFrame, result: ValidationResult
+        self, negative_debits: int, negative_credits: int, result: ValidationResult
     ) -> None:
         """
-        Check for negative debits or credits and add warnings.
+        Add warnings for negative debits or credits.
 
         Args:
-            df: Normalized DataFrame
+            negative_debits: Number of transactions with a negative debit
+            negative_credits: Number of transactions with a negative credit
             result: ValidationResult to update
         """
-        negative_debits = (df["debit"] < 0).sum()
-        negative_credits = (df["credit"] < 0).sum()
-
         if negative_debits > 0:
-            warning_msg = (
-                f"⚠️ **Negative Debits Detected**\n\n"
-                f"**What we found:** {negative_debits} transaction(s) have negative debit amounts.\n\n"
-                "**Why this usually happens:**\n"
-                "• Credit memos or refunds may be recorded as negative debits\n"
-                "• Reversing entries may use negative amounts\n"
-                "• Data entry errors where credits were entered in the debit column\n\n"
-                "**What to do next:**\n"
-                "• Review these transactions in QuickBooks to verify they're correct\n"
-                "• If these are valid credit memos or reversals, no action needed\n"
-                "• If these are errors, correct them in QuickBooks and re-export"
-            )
+            warning_msg = _NEGATIVE_DEBITS_WARNING.format(negative_debits=negative_debits)
             result.warnings.append(warning_msg)
 
         if negative_credits > 0:
-            warning_msg = (
-                f"⚠️ **Negative Credits Detected**\n\n"
-                f"**What we found:** {negative_credits} transaction(s) have negative credit amounts.\n\n"
-                "**Why this usually happens:**\n"
-                "• Debit memos or adjustments may be recorded as negative credits\n"
-                "• Reversing entries may use negative amounts\n"
-                "• Data entry errors where debits were entered in the credit column\n\n"
-                "**What to do next:**\n"
-                "• Review these transactions in QuickBooks to verify they're correct\n"
-                "• If these are valid debit memos or reversals, no action needed\n"
-                "• If these are errors, correct them in QuickBooks and re-export"
-            )
+            warning_msg = _NEGATIVE_CREDITS_WARNING.format(negative_credits=negative_credits)
             result.warnings.append(warning_msg)
 
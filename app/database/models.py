@@ -1,82 +1,117 @@
 """
 Database models for QoE Tool
 """
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, ForeignKey, Boolean
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy import (
+    create_engine, insert, Integer, String, DateTime, Text, ForeignKey, Boolean, Index
+)
+from sqlalchemy.orm import (
+    DeclarativeBase, Mapped, Session, mapped_column, sessionmaker, relationship
+)
 from datetime import datetime
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 import os
 
-Base = declarative_base()
+try:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+except ImportError:  # pragma: no cover - optional backend (needs greenlet)
+    async_sessionmaker = create_async_engine = None
+
+
+class Base(DeclarativeBase):
+    """Declarative base for all QoE Tool models"""
 
 
 class User(Base):
     """User model for authentication"""
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
-    email = Column(String(255), unique=True, index=True, nullable=False)
-    username = Column(String(100), unique=True, index=True, nullable=False)
-    hashed_password = Column(String(255), nullable=False)
-    full_name = Column(String(255), nullable=True)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    # 254 is the longest deliverable address (RFC 5321)
+    email: Mapped[str] = mapped_column(String(254), unique=True, index=True)
+    username: Mapped[str] = mapped_column(String(100), unique=True, index=True)
+    hashed_password: Mapped[str] = mapped_column(String(255))
+    full_name: Mapped[Optional[str]] = mapped_column(String(255))
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
     
     # Relationships
-    projects = relationship("Project", back_populates="owner", cascade="all, delete-orphan")
+    projects: Mapped[List["Project"]] = relationship(
+        back_populates="owner", cascade="all, delete-orphan"
+    )
 
 
 class Project(Base):
     """Project model for organizing GL processing"""
     __tablename__ = "projects"
+    # Serves "a user's projects, newest first" (get_user_projects)
+    __table_args__ = (Index("ix_projects_user_created", "user_id", "created_at"),)
     
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(255), nullable=False)
-    description = Column(Text, nullable=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    title: Mapped[str] = mapped_column(String(255))
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
     
-    # Relationships
-    owner = relationship("User", back_populates="projects")
-    files = relationship("ProjectFile", back_populates="project", cascade="all, delete-orphan")
-    databooks = relationship("Databook", back_populates="project", cascade="all, delete-orphan")
+    # Relationships. files/databooks are listed with every project, so they
+    # are loaded together with it (one IN query per collection, not one per
+    # project) and stay readable after the session closes
+    owner: Mapped["User"] = relationship(back_populates="projects")
+    files: Mapped[List["ProjectFile"]] = relationship(
+        back_populates="project", cascade="all, delete-orphan", lazy="selectin"
+    )
+    databooks: Mapped[List["Databook"]] = relationship(
+        back_populates="project", cascade="all, delete-orphan", lazy="selectin"
+    )
 
 
 class ProjectFile(Base):
     """Uploaded Excel files associated with projects"""
     __tablename__ = "project_files"
+    # Serves "a project's files by upload time" and the files selectin load;
+    # also covers the project_id foreign key
+    __table_args__ = (Index("ix_project_files_project_uploaded", "project_id", "uploaded_at"),)
     
-    id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
-    filename = Column(String(255), nullable=False)
-    file_path = Column(String(500), nullable=False)
-    file_size = Column(Integer, nullable=False)
-    entity_name = Column(String(255), nullable=True)
-    source_system = Column(String(50), nullable=True)  # QuickBooks Online, QuickBooks Desktop
-    uploaded_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    project_id: Mapped[int] = mapped_column(Integer, ForeignKey("projects.id"))
+    filename: Mapped[str] = mapped_column(String(255))
+    file_path: Mapped[str] = mapped_column(String(500))
+    file_size: Mapped[int] = mapped_column(Integer)
+    entity_name: Mapped[Optional[str]] = mapped_column(String(255))
+    # QuickBooks Online, QuickBooks Desktop
+    source_system: Mapped[Optional[str]] = mapped_column(String(50))
+    uploaded_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    project = relationship("Project", back_populates="files")
+    project: Mapped["Project"] = relationship(back_populates="files")
 
 
 class Databook(Base):
     """Generated Excel databooks"""
     __tablename__ = "databooks"
+    # Serves "a project's databooks by generation time" and the databooks
+    # selectin load; also covers the project_id foreign key
+    __table_args__ = (Index("ix_databooks_project_generated", "project_id", "generated_at"),)
     
-    id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
-    filename = Column(String(255), nullable=False)
-    file_path = Column(String(500), nullable=False)
-    file_size = Column(Integer, nullable=False)
-    generated_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    project_id: Mapped[int] = mapped_column(Integer, ForeignKey("projects.id"))
+    filename: Mapped[str] = mapped_column(String(255))
+    file_path: Mapped[str] = mapped_column(String(500))
+    file_size: Mapped[int] = mapped_column(Integer)
+    generated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    project = relationship("Project", back_populates="databooks")
+    project: Mapped["Project"] = relationship(back_populates="databooks")
 
 
-def get_database_url():
+def get_database_url(driver: str = "pymysql"):
     """Get database connection URL from environment or use default"""
     db_host = os.getenv("DB_HOST", "localhost")
     db_port = os.getenv("DB_PORT", "3306")
@@ -84,20 +119,137 @@ def get_database_url():
     db_password = os.getenv("DB_PASSWORD", "")
     db_name = os.getenv("DB_NAME", "qoe_tool")
     
-    return f"mysql+pymysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+    return f"mysql+{driver}://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+
 
+def get_pool_settings():
+    """Get connection pool settings from environment or use defaults"""
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "40")),
+        # Recycle pooled connections before MySQL's wait_timeout drops them
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    }
 
+
+@lru_cache(maxsize=1)
 def get_engine():
-    """Get SQLAlchemy engine"""
+    """Get the process-wide SQLAlchemy engine (one shared connection pool)"""
     database_url = get_database_url()
-    return create_engine(database_url, pool_pre_ping=True, echo=False)
+    # LIFO checkout keeps reusing the same few warm connections, letting the
+    # rest idle out instead of cycling through the whole pool
+    return create_engine(
+        database_url,
+        pool_pre_ping=True,
+        pool_use_lifo=True,
+        echo=False,
+        **get_pool_settings(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_sessionmaker():
+    """Get the session factory bound to the shared engine"""
+    # expire_on_commit=False keeps returned objects readable after the session closes
+    return sessionmaker(
+        autocommit=False, autoflush=False, bind=get_engine(), expire_on_commit=False
+    )
 
 
 def get_session():
-    """Get database session"""
-    engine = get_engine()
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    return SessionLocal()
+    """Get database session (connections come from the shared pool)"""
+    return get_sessionmaker()()
+
+
+@contextmanager
+def session_scope():
+    """
+    Transactional session scope: commits on success, rolls back on error and
+    always closes the session, returning its connection to the pool.
+    """
+    db = get_session()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def bulk_insert_project_files(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert many ProjectFile rows in one executemany INSERT.
+
+    Unlike db.add per object, no ORM instances are built and the driver
+    batches the rows (pymysql rewrites them into multi-row INSERTs). The
+    caller commits, e.g. by running this inside session_scope().
+
+    Args:
+        db: Session to execute in
+        rows: Column values per file (project_id, filename, file_path, ...)
+    """
+    if rows:
+        db.execute(insert(ProjectFile), rows)
+
+
+def bulk_insert_databooks(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert many Databook rows in one executemany INSERT.
+
+    Args:
+        db: Session to execute in
+        rows: Column values per databook (project_id, filename, file_path, ...)
+    """
+    if rows:
+        db.execute(insert(Databook), rows)
+
+
+def db_dep():
+    """FastAPI dependency yielding a pooled session for the duration of a request"""
+    db = get_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@lru_cache(maxsize=1)
+def get_async_engine():
+    """Get the process-wide async engine (aiomysql driver, its own shared pool)"""
+    if create_async_engine is None:
+        raise ImportError(
+            "Async database sessions require sqlalchemy[asyncio] and aiomysql "
+            "(pip install qoe-tool[async-db])"
+        )
+    return create_async_engine(
+        get_database_url("aiomysql"),
+        pool_pre_ping=True,
+        pool_use_lifo=True,
+        echo=False,
+        **get_pool_settings(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_sessionmaker():
+    """Get the async session factory bound to the shared async engine"""
+    return async_sessionmaker(
+        bind=get_async_engine(), autoflush=False, expire_on_commit=False
+    )
+
+
+async def get_async_session():
+    """
+    FastAPI dependency yielding an AsyncSession for the duration of a request.
+
+    Queries await the aiomysql driver instead of blocking a worker thread.
+    get_session/db_dep remain the synchronous API.
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
 
 
 def init_db():
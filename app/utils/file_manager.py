@@ -2,6 +2,7 @@
 File management utilities for storing uploaded files
 """
 import os
+import shutil
 from pathlib import Path
 from typing import Optional
 from app.database.models import ProjectFile, get_session
@@ -79,6 +80,59 @@ def save_uploaded_file(project_id: int, file_content: bytes, filename: str,
         db.close()
 
 
+def save_uploaded_file_from_path(project_id: int, source_path: str, filename: str,
+                                 entity_name: Optional[str] = None,
+                                 source_system: Optional[str] = None):
+    """
+    Move an upload that was already streamed to disk into project storage
+    and create a database record.
+
+    Unlike save_uploaded_file the payload is never loaded into memory. If the
+    project is not in the database (or the DB write fails) the file is left
+    at source_path and an object with only a file_path attribute is returned.
+    """
+    class TempFile:
+        def __init__(self, path):
+            self.file_path = path
+
+    db = get_session()
+    file_path = None
+    try:
+        from app.database.models import Project
+        project = db.query(Project).filter(Project.id == project_id).first()
+        if not project:
+            # Project stored in frontend localStorage: process the temp file directly
+            return TempFile(source_path)
+
+        project_dir = get_uploads_directory() / f"project_{project_id}"
+        project_dir.mkdir(exist_ok=True)
+        file_path = project_dir / filename
+        file_size = os.path.getsize(source_path)
+        shutil.move(source_path, file_path)
+
+        project_file = ProjectFile(
+            project_id=project_id,
+            filename=filename,
+            file_path=str(file_path),
+            file_size=file_size,
+            entity_name=entity_name,
+            source_system=source_system
+        )
+
+        db.add(project_file)
+        db.commit()
+        db.refresh(project_file)
+        return project_file
+    except Exception:
+        db.rollback()
+        # Put the file back so the caller's temp-file cleanup still applies
+        if file_path is not None and file_path.exists():
+            shutil.move(file_path, source_path)
+        return TempFile(source_path)
+    finally:
+        db.close()
+
+
 def get_project_files(project_id: int) -> list:
     """Get all files for a project"""
     db = get_session()
@@ -0,0 +1,22 @@
+"""
+Optional Numba JIT support.
+
+Exposes ``njit`` from numba when it is installed. Otherwise ``njit`` is a
+no-op decorator, so kernels run as plain Python/NumPy.
+"""
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional speedup
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+__all__ = ["njit", "NUMBA_AVAILABLE"]
@@ -7,6 +7,9 @@ import LoadingSpinner from '../components/LoadingSpinner'
 import './GLProcessing.css'
 
 const STORAGE_KEY = 'qoe_projects'
+// Databook polling: one request per interval, giving up after the last attempt
+const DATABOOK_POLL_INTERVAL_MS = 1000
+const DATABOOK_MAX_POLL_ATTEMPTS = 300
 
 const GLProcessing = () => {
   const { projectId } = useParams()
@@ -104,10 +107,7 @@ const GLProcessing = () => {
       formData.append('entity_configs', JSON.stringify(configsArray))
 
       const response = await api.post(`/projects/${projectId}/process`, formData, {
-        headers: { 
-          'Content-Type': 'multipart/form-data',
-          'Authorization': `Bearer ${localStorage.getItem('token') || '1'}`
-        }
+        headers: { 'Content-Type': 'multipart/form-data' }
       })
 
       clearInterval(progressInterval)
@@ -144,12 +144,22 @@ const GLProcessing = () => {
           ? `${apiBaseUrl}${excelFileUrl.replace('/api', '')}`
           : `${apiBaseUrl}${excelFileUrl}`
       
-      const response = await fetch(url, {
-        headers: {
-          'Authorization': `Bearer ${localStorage.getItem('token') || '1'}`
+      // The databook is generated in the background; 202 means not ready yet
+      const token = localStorage.getItem('token')
+      const headers = token ? { 'Authorization': `Bearer ${token}` } : {}
+      let response
+      for (let attempt = 1; ; attempt++) {
+        response = await fetch(url, { headers })
+        if (response.status !== 202) break
+        if (attempt >= DATABOOK_MAX_POLL_ATTEMPTS) {
+          throw new Error('Timed out waiting for the databook to be generated')
         }
-      })
+        await new Promise(resolve => setTimeout(resolve, DATABOOK_POLL_INTERVAL_MS))
+      }
       
+      if (response.status === 404) {
+        throw new Error('The databook has expired; please process the files again')
+      }
       if (!response.ok) {
         throw new Error('Failed to download file')
       }
@@ -181,7 +191,9 @@ const GLProcessing = () => {
         const blobUrl = window.URL.createObjectURL(blob)
         const link = document.createElement('a')
         link.href = blobUrl
-        link.download = excelFileUrl.split('/').pop() || 'GL_Databook.xlsx'
+        const disposition = response.headers.get('content-disposition') || ''
+        const match = disposition.match(/filename="?([^";]+)"?/)
+        link.download = match ? match[1] : 'GL_Databook.xlsx'
         document.body.appendChild(link)
         link.click()
         document.body.removeChild(link)
@@ -2,7 +2,6 @@ import { useState } from 'react'
 import { Link, useNavigate } from 'react-router-dom'
 import { FaLock, FaArrowLeft, FaExclamationCircle } from 'react-icons/fa'
 import { useAuth } from '../contexts/AuthContext'
-import api from '../services/api'
 import './Auth.css'
 
 const Login = () => {
@@ -15,26 +14,6 @@ const Login = () => {
   const [error, setError] = useState('')
   const [loading, setLoading] = useState(false)
   
-  const handleQuickLogin = () => {
-    const email = formData.email || 'demo@example.com'
-    const username = email.split('@')[0] || 'demo'
-    
-    const mockUser = {
-      id: 1,
-      email: email,
-      username: username,
-      full_name: 'Demo User'
-    }
-    
-    const mockToken = '1'
-    
-    localStorage.setItem('token', mockToken)
-    localStorage.setItem('user', JSON.stringify(mockUser))
-    api.defaults.headers.common['Authorization'] = `Bearer ${mockToken}`
-    
-    window.location.href = '/dashboard'
-  }
-
   const handleChange = (e) => {
     setFormData({
       ...formData,
@@ -45,7 +24,15 @@ const Login = () => {
 
   const handleSubmit = async (e) => {
     e.preventDefault()
-    handleQuickLogin()
+    setLoading(true)
+    const result = await login(formData.email, formData.password)
+    setLoading(false)
+
+    if (result.success) {
+      navigate('/dashboard')
+    } else {
+      setError(result.error)
+    }
   }
 
   return (
@@ -67,6 +54,7 @@ const Login = () => {
               value={formData.email}
               onChange={handleChange}
               placeholder="your.email@example.com"
+              required
             />
           </div>
 
@@ -78,6 +66,7 @@ const Login = () => {
               value={formData.password}
               onChange={handleChange}
               placeholder="Enter your password"
+              required
             />
           </div>
 
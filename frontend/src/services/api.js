@@ -21,9 +21,6 @@ api.interceptors.request.use(
     const token = localStorage.getItem('token')
     if (token) {
       config.headers.Authorization = `Bearer ${token}`
-    } else {
-      // For frontend-only projects, use default token
-      config.headers.Authorization = `Bearer 1`
     }
     return config
   },
@@ -35,7 +32,8 @@ api.interceptors.request.use(
 api.interceptors.response.use(
   (response) => response,
   (error) => {
-    if (error.response?.status === 401) {
+    // A failed login is also a 401; let the login form show its error
+    if (error.response?.status === 401 && !error.config?.url?.endsWith('/auth/login')) {
       localStorage.removeItem('token')
       localStorage.removeItem('user')
       window.location.href = '/login'
@@ -3,6 +3,7 @@ Unit tests for adjustment rules engine
 """
 
 import pytest
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import tempfile
@@ -65,6 +66,18 @@ class TestAdjustmentRule:
         assert rule.match_type == "account"
         assert rule.match_value == "Cash"
 
+    def test_compiled_pattern_is_cached(self):
+        """Test regex rules compile once and recompile when match_value changes"""
+        rule = AdjustmentRule(rule_name="Re", match_type="regex", match_value=r"^Cash")
+
+        first = rule.compiled_pattern()
+        assert first is rule.compiled_pattern()
+        assert first.pattern == r"^Cash"
+
+        rule.match_value = r"Rev.*"
+        assert rule.compiled_pattern().pattern == r"Rev.*"
+        assert AdjustmentRule(rule_name="Kw", match_value="cash").compiled_pattern() is None
+
 
 class TestAdjustmentRulesEngine:
     """Test suite for AdjustmentRulesEngine"""
@@ -325,6 +338,26 @@ rules:
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
 
+    def test_load_rules_cached_until_file_changes(self, tmp_path):
+        """Test cached rule configs are copied per engine and reloaded on change"""
+        config_path = tmp_path / "rules.yaml"
+        config_path.write_text("rules:\n  - rule_name: First\n")
+
+        first = AdjustmentRulesEngine()
+        first.load_rules_from_yaml(config_path)
+        first.disable_rule("First")
+
+        second = AdjustmentRulesEngine()
+        second.load_rules_from_yaml(config_path)
+        assert second.rules[0].enabled is True
+        assert second.rules[0] is not first.rules[0]
+
+        config_path.write_text("rules:\n  - rule_name: Second\n")
+        mtime = config_path.stat().st_mtime + 10
+        os.utime(config_path, (mtime, mtime))
+        second.load_rules_from_yaml(config_path)
+        assert [rule.rule_name for rule in second.rules] == ["Second"]
+
     def test_enable_disable_rule(self, engine):
         """Test enabling and disabling rules"""
         rule = AdjustmentRule(rule_name="Test Rule", enabled=True)
@@ -360,3 +393,174 @@ rules:
         assert len(summary) == 1
         assert summary.iloc[0]["rule_name"] == "Test Rule"
 
+
+    def test_match_all_agrees_with_per_rule_matching(
+        self, engine, sample_normalized_df, monkeypatch
+    ):
+        """Test that the single-pass keyword/regex scan matches per-rule matching"""
+        from app.core import adjustments
+
+        rules = [
+            AdjustmentRule(rule_name="Legal", match_type="keyword", match_value="Legal"),
+            AdjustmentRule(rule_name="Dep", match_type="keyword", match_value="depreciation"),
+            AdjustmentRule(rule_name="Dotted", match_type="keyword", match_value="c.sh"),
+            AdjustmentRule(rule_name="Regex", match_type="regex", match_value="^(Sales|Dep)"),
+            AdjustmentRule(rule_name="BackRef", match_type="regex", match_value=r"(s)\1"),
+            AdjustmentRule(
+                rule_name="Off", enabled=False, match_type="keyword", match_value="cash"
+            ),
+        ]
+        for rule in rules:
+            engine.add_rule(rule)
+        df = sample_normalized_df
+
+        expected = {
+            i: engine._find_matches(df, rule)
+            for i, rule in enumerate(rules)
+            if rule.enabled
+        }
+        masks = engine._match_all(df)
+        monkeypatch.setattr(adjustments, "hyperscan", None)
+        monkeypatch.setattr(adjustments, "ahocorasick", None)
+        fallback_masks = engine._match_all(df)
+
+        assert set(masks) == set(fallback_masks) == set(expected)
+        for i, mask in expected.items():
+            assert masks[i].tolist() == fallback_masks[i].tolist() == mask.tolist()
+
+    def test_later_rule_overrides_columns_but_both_are_logged(
+        self, engine, sample_normalized_df
+    ):
+        """Test column assignment order and per-rule log rows"""
+        engine.add_rule(
+            AdjustmentRule(
+                rule_name="Big",
+                match_type="threshold",
+                match_value=5000,
+                adjustment_category="Big",
+            )
+        )
+        engine.add_rule(
+            AdjustmentRule(
+                rule_name="Legal",
+                match_type="keyword",
+                match_value="legal",
+                adjustment_category="Legal",
+                add_back=True,
+            )
+        )
+        adjusted_df, log_df = engine.apply_rules(sample_normalized_df)
+
+        assert adjusted_df["adjustment_flag"].tolist() == [False, True, True, True, False]
+        assert adjusted_df["adjustment_category"].tolist() == ["", "Legal", "Big", "Big", ""]
+        assert adjusted_df["adjustment_amount"].tolist() == [0.0, -50000.0, -30000.0, 10000.0, 0.0]
+        assert log_df["rule_name"].tolist() == ["Big", "Big", "Big", "Legal"]
+        assert log_df["row_id"].tolist() == [1, 2, 3, 1]
+
+    def test_vectorized_reasoning_matches_scalar_helper(self, engine, sample_normalized_df):
+        """Test that bulk reasoning formatting matches _generate_reasoning"""
+        rule = AdjustmentRule(
+            rule_name="All",
+            match_type="threshold",
+            match_value=0,
+            adjustment_category="Review",
+            reasoning_template="{rule_name}/{category}: {account} - {description} ({amount})",
+        )
+        engine.add_rule(rule)
+        adjusted_df, _ = engine.apply_rules(sample_normalized_df)
+
+        expected = [
+            engine._generate_reasoning(row, rule) for _, row in sample_normalized_df.iterrows()
+        ]
+        assert adjusted_df["reasoning"].tolist() == expected
+        assert expected[2] == "All/Review: Revenue - Sales revenue ($-30,000.00)"
+
+    def test_apply_rules_inplace(self, engine, sample_normalized_df):
+        """Test inplace adds columns to the input while the default leaves it untouched"""
+        engine.add_rule(AdjustmentRule(rule_name="Cash", match_type="account", match_value="Cash"))
+        original_columns = list(sample_normalized_df.columns)
+
+        adjusted_df, _ = engine.apply_rules(sample_normalized_df)
+        assert adjusted_df is not sample_normalized_df
+        assert list(sample_normalized_df.columns) == original_columns
+
+        inplace_df, log_df = engine.apply_rules(sample_normalized_df, inplace=True)
+        assert inplace_df is sample_normalized_df
+        assert sample_normalized_df["adjustment_flag"].tolist() == adjusted_df[
+            "adjustment_flag"
+        ].tolist()
+        assert len(log_df) == 2
+
+    def test_category_columns_are_categorical(self, engine, sample_normalized_df):
+        """Test adjustment_category and log rule_name use categorical dtype"""
+        engine.add_rule(
+            AdjustmentRule(
+                rule_name="Cash", match_type="account", match_value="Cash",
+                adjustment_category="Treasury",
+            )
+        )
+        engine.add_rule(
+            AdjustmentRule(
+                rule_name="Legal", match_type="keyword", match_value="legal",
+                adjustment_category="Legal",
+            )
+        )
+        adjusted_df, log_df = engine.apply_rules(sample_normalized_df)
+
+        assert isinstance(adjusted_df["adjustment_category"].dtype, pd.CategoricalDtype)
+        assert adjusted_df["adjustment_category"].tolist() == [
+            "Treasury", "Legal", "", "", "Treasury"
+        ]
+        assert isinstance(log_df["rule_name"].dtype, pd.CategoricalDtype)
+        assert isinstance(log_df["adjustment_category"].dtype, pd.CategoricalDtype)
+        assert log_df["rule_name"].tolist() == ["Cash", "Cash", "Legal"]
+
+    def test_reasoning_template_keeps_literal_braces(self, engine, sample_normalized_df):
+        """Test unknown placeholders and braces in templates/values are left as text"""
+        rule = AdjustmentRule(
+            rule_name="Odd {name}",
+            match_type="account",
+            match_value="Revenue",
+            adjustment_category="Cat}",
+            reasoning_template="{rule_name} | {category} | {other} {{x}} | {amount}",
+        )
+        engine.add_rule(rule)
+        adjusted_df, log_df = engine.apply_rules(sample_normalized_df)
+
+        expected = "Odd {name} | Cat} | {other} {{x}} | $-30,000.00"
+        assert log_df["reasoning"].tolist() == [expected]
+        assert engine._generate_reasoning(sample_normalized_df.iloc[2], rule) == expected
+
+    def test_find_matches_returns_boolean_mask(self, engine, sample_normalized_df):
+        """Test _find_matches returns a row mask, all False for an invalid regex"""
+        rules = [
+            AdjustmentRule(rule_name="Kw", match_type="keyword", match_value="legal"),
+            AdjustmentRule(rule_name="Acct", match_type="account", match_value="Cash"),
+            AdjustmentRule(rule_name="Bad", match_type="regex", match_value="(unclosed"),
+            AdjustmentRule(rule_name="Big", match_type="threshold", match_value=10000),
+        ]
+        masks = [engine._find_matches(sample_normalized_df, rule) for rule in rules]
+
+        for mask in masks:
+            assert isinstance(mask, np.ndarray)
+            assert mask.dtype == bool
+            assert len(mask) == len(sample_normalized_df)
+        assert masks[0].tolist() == [False, True, False, False, False]
+        assert masks[1].tolist() == [True, False, False, False, True]
+        assert not masks[2].any()
+        assert masks[3].tolist() == [False, True, True, True, False]
+
+    def test_regex_rules_on_arrow_description(self, engine, sample_normalized_df):
+        """Test regex rules keep Python re semantics on Arrow-backed descriptions"""
+        pytest.importorskip("pyarrow")
+        df = sample_normalized_df.astype(
+            {"description": "string[pyarrow]", "account_name_flat": "category"}
+        )
+        rule = AdjustmentRule(
+            rule_name="Lookahead", match_type="regex", match_value=r"\w+(?= settlement)"
+        )
+
+        engine.add_rule(rule)
+
+        assert engine._find_matches(df, rule).tolist() == [False, True, False, False, False]
+        assert engine._match_all(df)[0].tolist() == [False, True, False, False, False]
@@ -5,7 +5,10 @@ These tests verify that the AI module interfaces are properly defined
 and can be instantiated. No actual AI/ML functionality is tested yet.
 """
 
+import asyncio
+import json
 import pytest
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
@@ -14,11 +17,14 @@ from app.ai.transaction_clustering import (
     TransactionClusterer,
     ClusteringResult,
     ClusteringMethod,
+    ClusterColumns,
 )
+from app.ai._embedding_cache import EmbeddingCache, embed_with_cache, hash_ids, hash_text
 from app.ai.suggestion_schema import (
     AdjustmentSuggestion,
     AdjustmentSuggestionEngine,
     SuggestionBatch,
+    SuggestionColumns,
     SuggestionConfidence,
     AdjustmentCategory,
 )
@@ -105,6 +111,232 @@ class TestTransactionClusteringScaffolding:
         # Should return empty clusters for now (scaffolding)
         assert len(result.clusters) == 0
 
+    def test_cluster_by_account_pattern_totals(self):
+        """Test per-account totals and counts for account clusters"""
+        clusterer = TransactionClusterer(min_cluster_size=2)
+        df = pd.DataFrame(
+            {
+                "row_id": [1, 2, 3, 4, 5],
+                "account_name_flat": ["Rent", "Travel", "Rent", "Travel", "Legal"],
+                "date": pd.to_datetime(
+                    ["2024-03-01", "2024-01-10", "2024-01-01", None, "2024-02-01"]
+                ),
+                "amount_net": [1000.0, 50.0, 1000.0, 75.0, 300.0],
+            }
+        )
+        result = clusterer.cluster_by_account_pattern(df)
+
+        by_name = {c.cluster_name: c for c in result.clusters}
+        assert set(by_name) == {"Rent", "Travel"}
+        assert by_name["Rent"].transaction_ids == [1, 3]
+        assert by_name["Rent"].total_amount == 2000.0
+        assert by_name["Travel"].transaction_count == 2
+        assert by_name["Travel"].total_amount == 125.0
+        assert by_name["Rent"].date_range_start == pd.Timestamp("2024-01-01")
+        assert by_name["Rent"].date_range_end == pd.Timestamp("2024-03-01")
+        assert by_name["Travel"].date_range_start == by_name["Travel"].date_range_end
+        assert result.unclustered_transaction_ids == [5]
+
+    def test_cluster_by_time_pattern_finds_monthly_recurring(self):
+        """Test that same-amount monthly transactions form one cluster"""
+        clusterer = TransactionClusterer()
+        df = pd.DataFrame(
+            {
+                "row_id": [1, 2, 3, 4, 5, 6],
+                "date": pd.to_datetime(
+                    [
+                        "2024-01-05",
+                        "2024-02-05",
+                        "2024-03-06",
+                        "2024-04-05",
+                        "2024-02-20",
+                        "2024-03-01",
+                    ]
+                ),
+                "amount_net": [99.0, 99.0, 99.0, 99.0, 500.0, 42.0],
+            }
+        )
+        result = clusterer.cluster_by_time_pattern(df)
+
+        assert len(result.clusters) == 1
+        cluster = result.clusters[0]
+        assert cluster.transaction_ids == [1, 2, 3, 4]
+        assert cluster.total_amount == 396.0
+        assert cluster.date_range_start == pd.Timestamp("2024-01-05")
+        assert cluster.date_range_end == pd.Timestamp("2024-04-05")
+        assert sorted(result.unclustered_transaction_ids) == [5, 6]
+        assert result.clustered_transactions == 4
+
+    def test_cluster_by_time_pattern_breaks_on_irregular_interval(self):
+        """Test that an irregular gap ends a recurring run"""
+        clusterer = TransactionClusterer(min_cluster_size=3)
+        df = pd.DataFrame(
+            {
+                "row_id": [1, 2, 3, 4],
+                "date": pd.to_datetime(["2024-01-01", "2024-01-08", "2024-01-15", "2024-03-01"]),
+                "amount_net": [10.0, 10.0, 10.0, 10.0],
+            }
+        )
+        result = clusterer.cluster_by_time_pattern(df)
+
+        assert [c.transaction_ids for c in result.clusters] == [[1, 2, 3]]
+        assert result.clusters[0].metadata["interval_days"] == 7
+
+    def test_cluster_by_semantic_similarity_links_neighbors(self):
+        """Test that near-duplicate descriptions are merged via the kNN graph"""
+        vectors = {
+            "uber ride": [1.0, 0.0, 0.0],
+            "uber trip": [0.99, 0.1, 0.0],
+            "office rent": [0.0, 1.0, 0.0],
+            "rent office": [0.0, 0.98, 0.05],
+            "legal": [0.0, 0.0, 1.0],
+        }
+
+        async def fake_embed(texts):
+            return np.array([vectors[t] for t in texts], dtype=np.float32)
+
+        clusterer = TransactionClusterer(min_cluster_size=2, similarity_threshold=0.9)
+        clusterer._embed_texts = fake_embed
+        df = pd.DataFrame(
+            {
+                "row_id": [1, 2, 3, 4, 5, 6],
+                "description": [
+                    "Uber ride",
+                    "Office rent",
+                    "Uber trip",
+                    "Rent office",
+                    "Legal",
+                    None,
+                ],
+                "amount_net": [10.0, 100.0, 12.0, 100.0, 5.0, 1.0],
+            }
+        )
+        result = clusterer.cluster_by_semantic_similarity(df)
+
+        assert [c.transaction_ids for c in result.clusters] == [[1, 3], [2, 4]]
+        assert [c.total_amount for c in result.clusters] == [22.0, 200.0]
+        assert result.unclustered_transaction_ids == [5, 6]
+        assert result.clustering_method == ClusteringMethod.SEMANTIC_SIMILARITY
+
+    def test_knn_graph_matches_brute_force_with_int8_codes(self):
+        """Test blockwise kNN search on float and int8-quantized embeddings"""
+        from app.ai._ann import knn_graph, quantize_int8
+
+        rng = np.random.default_rng(0)
+        embeddings = rng.normal(size=(200, 16)).astype(np.float32)
+        unit = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        expected = 1 + np.sort(-(unit @ unit.T), axis=1)[:, :5]
+
+        _, distances = knn_graph(embeddings, k=5, block_size=64)
+        assert np.allclose(np.sort(distances, axis=1), expected, atol=1e-5)
+
+        codes, scale = quantize_int8(embeddings)
+        assert codes.dtype == np.int8
+        _, q_distances = knn_graph(codes, k=5, block_size=64, scale=scale)
+        assert np.allclose(np.sort(q_distances, axis=1), expected, atol=0.02)
+
+        _, flag_distances = knn_graph(embeddings, k=5, block_size=64, quantize=True)
+        assert np.array_equal(flag_distances, q_distances)
+
+    def test_knn_graph_indexes_full_precision_with_hnsw(self, monkeypatch):
+        """Test quantize=True leaves the vectors given to an HNSW index unquantized"""
+        from app.ai import _ann
+
+        added = []
+
+        class FakeIndex:
+            def __init__(self, space, dim):
+                pass
+
+            def init_index(self, **kwargs):
+                pass
+
+            def add_items(self, data, ids):
+                added.append(np.array(data))
+
+            def set_ef(self, ef):
+                pass
+
+            def knn_query(self, data, k):
+                return np.zeros((len(data), k), dtype=np.int64), np.zeros((len(data), k))
+
+        monkeypatch.setattr(_ann, "hnswlib", type("hnswlib", (), {"Index": FakeIndex}))
+        embeddings = np.random.default_rng(0).normal(size=(10, 4)).astype(np.float32)
+        _ann.knn_graph(embeddings, k=3, quantize=True)
+        assert np.array_equal(np.concatenate(added), embeddings)
+
+    def test_clustering_accepts_polars_frames(self):
+        """Test that polars input clusters the same as pandas input"""
+        pl = pytest.importorskip("polars")
+        clusterer = TransactionClusterer(min_cluster_size=2)
+        df = pd.DataFrame(
+            {
+                "row_id": [1, 2, 3, 4],
+                "account_name_flat": ["Rent", "Rent", "Rent", "Legal"],
+                "date": pd.to_datetime(["2024-01-05", "2024-02-05", "2024-03-05", "2024-03-09"]),
+                "amount_net": [1000.0, 1000.0, 1000.0, 300.0],
+            }
+        )
+        pl_df = pl.from_pandas(df)
+
+        for method in ("cluster_by_account_pattern", "cluster_by_time_pattern"):
+            expected = getattr(clusterer, method)(df).to_dict()
+            actual = getattr(clusterer, method)(pl_df).to_dict()
+            assert actual == expected
+
+    def test_datetime_array_coerces_unparseable_values(self):
+        """Test that unparseable dates become NaT instead of raising"""
+        from app.ai._frames import datetime_array
+
+        df = pd.DataFrame({"date": ["2024-01-05", "not a date", None]})
+        dates = datetime_array(df, "date")
+        assert dates.dtype == np.dtype("datetime64[ns]")
+        assert dates[0] == np.datetime64("2024-01-05")
+        assert np.isnat(dates[1:]).all()
+
+    def test_cluster_columns_round_trip(self):
+        """Test that column-backed results match per-object conversion"""
+        clusters = [
+            TransactionCluster(
+                cluster_id="c1",
+                cluster_name="Rent",
+                transaction_ids=[1, 3],
+                total_amount=2000.0,
+                transaction_count=2,
+                date_range_start=pd.Timestamp("2024-01-01"),
+                date_range_end=pd.Timestamp("2024-02-01"),
+                common_accounts=["Rent"],
+            ),
+            TransactionCluster(
+                cluster_id="c2",
+                cluster_name="Travel",
+                transaction_ids=[2],
+                total_amount=50.0,
+                transaction_count=1,
+            ),
+        ]
+        columns = ClusterColumns.from_clusters(clusters)
+        result = ClusteringResult.from_columns(
+            columns,
+            unclustered_transaction_ids=[],
+            total_transactions=3,
+            clustered_transactions=3,
+            clustering_method=ClusteringMethod.RULE_BASED,
+        )
+
+        assert result.clusters == clusters
+        assert result.to_dict()["clusters"] == [c.to_dict() for c in clusters]
+
+        filtered = columns.filter(np.array([False, True]))
+        assert filtered.transaction_ids(0).tolist() == [2]
+        assert filtered.cluster(0) == clusters[1]
+
+
+def _blocking_classify(prompt):
+    """Blocking stand-in for a synchronous LLM SDK (top-level so it pickles)"""
+    count = sum(1 for line in prompt.splitlines() if line[:1].isdigit())
+    return json.dumps([{"category": "Other"}] * count)
+
 
 @pytest.mark.unit
 class TestAdjustmentSuggestionScaffolding:
@@ -125,6 +357,7 @@ class TestAdjustmentSuggestionScaffolding:
         assert suggestion.suggestion_id == "sug_001"
         assert suggestion.add_back is True
         assert suggestion.confidence_score == 0.85
+        assert not hasattr(suggestion, "__dict__")
 
     def test_adjustment_suggestion_to_dict(self):
         """Test converting suggestion to dictionary"""
@@ -197,6 +430,107 @@ class TestAdjustmentSuggestionScaffolding:
         assert len(batch.suggestions) == 2
         assert batch.high_confidence_count == 1
 
+    def test_suggestion_columns_round_trip(self):
+        """Test that column-backed batches match per-object conversion"""
+        suggestions = [
+            AdjustmentSuggestion(
+                suggestion_id="s1",
+                transaction_ids=[1, 2],
+                adjustment_category=AdjustmentCategory.ONE_TIME_EXPENSE,
+                suggested_amount=1000.0,
+                add_back=True,
+                confidence_score=0.9,
+                confidence_level=SuggestionConfidence.HIGH,
+                reasoning="High confidence",
+                alternative_categories=[AdjustmentCategory.OTHER],
+            ),
+            AdjustmentSuggestion(
+                suggestion_id="s2",
+                transaction_ids=[3],
+                adjustment_category=AdjustmentCategory.DISCRETIONARY_EXPENSE,
+                suggested_amount=-250.0,
+                add_back=False,
+                confidence_score=0.2,
+                confidence_level=SuggestionConfidence.VERY_LOW,
+                reasoning="Very low confidence",
+            ),
+        ]
+        batch = SuggestionBatch.from_columns(SuggestionColumns.from_suggestions(suggestions))
+
+        assert batch.columns.category.dtype == np.int8
+        assert batch.suggestions == suggestions
+        assert batch.to_dict()["suggestions"] == [s.to_dict() for s in suggestions]
+        assert batch.total_suggested_adjustment == 750.0
+        assert batch.high_confidence_count == 1
+        assert batch.medium_confidence_count == 0
+        assert batch.low_confidence_count == 1
+
+    def test_suggestion_columns_drop_duplicate_txn_sets(self):
+        """Test dedup keyed by the hash of each transaction id set"""
+
+        def make(sid, ids, score, category=AdjustmentCategory.ONE_TIME_EXPENSE):
+            return AdjustmentSuggestion(
+                suggestion_id=sid,
+                transaction_ids=ids,
+                adjustment_category=category,
+                suggested_amount=1.0,
+                add_back=True,
+                confidence_score=score,
+                confidence_level=SuggestionConfidence.MEDIUM,
+                reasoning="",
+            )
+
+        columns = SuggestionColumns.from_suggestions(
+            [
+                make("a", [1, 2], 0.5),
+                make("b", [2, 1], 0.7),  # same set as "a", higher confidence
+                make("c", [1, 2], 0.9, AdjustmentCategory.OTHER),
+                make("d", [3], 0.5),
+            ]
+        )
+        keys = columns.txn_set_keys()
+        assert keys[0] == keys[1] == keys[2] == hash_ids(np.array([2, 1]))
+
+        deduped = columns.drop_duplicates()
+        assert deduped.suggestion_id.tolist() == ["b", "c", "d"]
+        assert deduped.transaction_ids(0).tolist() == [2, 1]
+        assert deduped.transaction_ids(2).tolist() == [3]
+
+    def test_suggestion_batch_to_json_bytes(self):
+        """Test column-wise JSON serialization of a batch"""
+        created = datetime(2024, 1, 2, 3, 4, 5)
+        suggestion = AdjustmentSuggestion(
+            suggestion_id="s1",
+            transaction_ids=[4, 5],
+            adjustment_category=AdjustmentCategory.OWNER_COMPENSATION,
+            suggested_amount=100.0,
+            add_back=True,
+            confidence_score=0.7,
+            confidence_level=SuggestionConfidence.MEDIUM,
+            reasoning="Owner salary",
+            alternative_categories=[AdjustmentCategory.OTHER],
+            created_at=created,
+        )
+        batch = SuggestionBatch(
+            suggestions=[suggestion],
+            total_suggested_adjustment=100.0,
+            high_confidence_count=0,
+            medium_confidence_count=1,
+            low_confidence_count=0,
+        )
+        doc = json.loads(batch.to_json_bytes())
+        cols = doc["columns"]
+        palette = doc["category_palette"]
+
+        assert cols["suggestion_id"] == ["s1"]
+        assert cols["txn_id_values"] == [4, 5]
+        assert cols["txn_id_offsets"] == [0, 2]
+        assert palette[cols["adjustment_category"][0]] == "Owner Compensation"
+        assert doc["confidence_palette"][cols["confidence_level"][0]] == "medium"
+        assert [palette[c] for c in cols["alternative_categories"][0]] == ["Other"]
+        assert cols["created_at_ns"] == [pd.Timestamp(created).value]
+        assert doc["medium_confidence_count"] == 1
+
     def test_adjustment_suggestion_engine_initialization(self):
         """Test initializing AdjustmentSuggestionEngine"""
         engine = AdjustmentSuggestionEngine(
@@ -224,6 +558,346 @@ class TestAdjustmentSuggestionScaffolding:
         # Should return empty suggestions for now (scaffolding)
         assert len(result.suggestions) == 0
 
+    def test_agenerate_suggestions_interface(self):
+        """Test that the async entry point returns a SuggestionBatch"""
+        engine = AdjustmentSuggestionEngine()
+        df = pd.DataFrame(
+            {
+                "row_id": [1],
+                "account_name_flat": ["Expense A"],
+                "description": ["Desc 1"],
+                "date": pd.to_datetime(["2024-01-01"]),
+                "amount_net": [100.0],
+            }
+        )
+        result = asyncio.run(engine.agenerate_suggestions(df))
+        assert isinstance(result, SuggestionBatch)
+
+    def test_suggest_one_time_expenses_keywords(self):
+        """Test keyword-based one-time expense detection"""
+        engine = AdjustmentSuggestionEngine()
+        df = pd.DataFrame(
+            {
+                "row_id": [10, 11, 12, 13],
+                "description": [
+                    "Legal settlement payment",
+                    "Monthly rent",
+                    "Employee SEVERANCE",
+                    None,
+                ],
+                "amount_net": [5000.0, 2000.0, 1500.0, 100.0],
+            }
+        )
+        suggestions = engine.suggest_one_time_expenses(df)
+
+        assert [s.transaction_ids for s in suggestions] == [[10], [12]]
+        assert all(s.adjustment_category == AdjustmentCategory.ONE_TIME_EXPENSE for s in suggestions)
+        assert suggestions[0].suggested_amount == -5000.0
+        assert suggestions[1].supporting_evidence == ["SEVERANCE"]
+
+        batch = engine.generate_suggestions(df)
+        assert len(batch.suggestions) == 2
+        assert batch.total_suggested_adjustment == -6500.0
+        assert batch.suggestions[0].created_at == batch.suggestions[1].created_at
+
+    def test_txn_features_extracted_once(self):
+        """Test shared feature extraction for the suggest_* detectors"""
+        from app.ai.suggestion_schema import _TxnFeatures
+
+        df = pd.DataFrame(
+            {
+                "row_id": [7, 8, 9],
+                "account_name_flat": ["Rent", None, "Rent"],
+                "description": ["Office  Rent", None, "office rent"],
+                "date": pd.to_datetime(["2024-01-01", None, "2024-02-01"]),
+                "amount_net": [10.0, 20.0, 30.0],
+            }
+        )
+        features = _TxnFeatures.from_frame(df)
+
+        assert features.row_id.tolist() == [7, 8, 9]
+        assert features.desc_lower.tolist() == ["office rent", "", "office rent"]
+        assert features.desc_hash[0] == features.desc_hash[2] == hash_text("Office Rent")
+        assert features.description[1] is None
+        assert features.account_code.tolist() == [0, -1, 0]
+        assert features.account_names.tolist() == ["Rent"]
+        assert features.date_i8[0] == pd.Timestamp("2024-01-01").value
+
+    def test_suggest_discretionary_expenses_flags_account_outliers(self):
+        """Test z-score outlier detection within each account"""
+        engine = AdjustmentSuggestionEngine()
+        amounts = [100.0] * 19 + [1000.0] + [50.0, 5000.0]
+        df = pd.DataFrame(
+            {
+                "row_id": list(range(1, 23)),
+                "account_name_flat": ["Marketing"] * 20 + ["Travel", "Travel"],
+                "amount_net": amounts,
+            }
+        )
+        suggestions = engine.suggest_discretionary_expenses(df)
+
+        assert [s.transaction_ids for s in suggestions] == [[20]]
+        suggestion = suggestions[0]
+        assert suggestion.adjustment_category == AdjustmentCategory.DISCRETIONARY_EXPENSE
+        assert suggestion.suggested_amount == pytest.approx(-(1000.0 - 145.0))
+        assert suggestion.confidence_level == SuggestionConfidence.LOW
+
+    def test_suggest_discretionary_expenses_with_large_amounts(self):
+        """Test account std stays accurate for large amounts with a small spread"""
+        engine = AdjustmentSuggestionEngine()
+        amounts = np.array([1e12 + i % 2 for i in range(19)] + [1e12 + 10])
+        assert (amounts[-1] - amounts.mean()) / amounts.std(ddof=0) > 3
+        df = pd.DataFrame(
+            {
+                "row_id": list(range(1, 21)),
+                "account_name_flat": ["Marketing"] * 20,
+                "amount_net": amounts,
+            }
+        )
+        suggestions = engine.suggest_discretionary_expenses(df)
+
+        assert [s.transaction_ids for s in suggestions] == [[20]]
+        assert suggestions[0].suggested_amount == pytest.approx(-(10 - 9 / 20 - 0.5), abs=0.01)
+
+    def test_one_time_keyword_mask_matches_regex_fallback(self, monkeypatch):
+        """Test that the Hyperscan and regex keyword paths agree"""
+        from app.ai import suggestion_schema
+
+        descriptions = pd.Series(
+            [
+                "Legal Fees Q1",
+                "one time bonus",
+                "Office supplies",
+                None,
+                "Goodwill impairment",
+                "Résettlement paid",
+                "ÉSEVERANCE",
+            ]
+        )
+        mask = suggestion_schema._one_time_keyword_mask(descriptions)
+        keywords = suggestion_schema._one_time_keywords(descriptions)
+
+        monkeypatch.setattr(suggestion_schema, "hyperscan", None)
+        fallback = suggestion_schema._one_time_keyword_mask(descriptions)
+        fallback_keywords = suggestion_schema._one_time_keywords(descriptions)
+
+        assert mask.tolist()[:5] == fallback.tolist()[:5] == [True, True, False, False, True]
+        # Every path reports a keyword exactly for the rows it selects
+        for selected, found in [(mask, keywords), (fallback, fallback_keywords)]:
+            assert selected.tolist() == [k is not None for k in found]
+
+    def test_one_time_keyword_mask_on_arrow_strings(self, monkeypatch):
+        """Test the regex scan on string[pyarrow] columns"""
+        pytest.importorskip("pyarrow")
+        from app.ai import suggestion_schema
+        from app.ai._frames import with_arrow_strings
+
+        df = with_arrow_strings(
+            pd.DataFrame({"description": ["Legal Fees Q1", None, "Office supplies"]}),
+            ["description"],
+        )
+        assert str(df["description"].dtype) == "string"
+
+        monkeypatch.setattr(suggestion_schema, "hyperscan", None)
+        mask = suggestion_schema._one_time_keyword_mask(df["description"])
+        assert mask.tolist() == [True, False, False]
+
+    def test_one_time_suggestions_with_non_ascii_descriptions(self, monkeypatch):
+        """Test non-ASCII letters next to a keyword don't break suggestion generation"""
+        from app.ai import suggestion_schema
+        from app.ai._frames import with_arrow_strings
+
+        monkeypatch.setattr(suggestion_schema, "hyperscan", None)
+        df = pd.DataFrame(
+            {
+                "row_id": [1, 2, 3],
+                "description": ["Résettlement paid", "ÉSEVERANCE", "Lawsuit settlement"],
+                "amount_net": [100.0, 200.0, 300.0],
+            }
+        )
+        for descriptions in (df, with_arrow_strings(df, ["description"])):
+            suggestions = AdjustmentSuggestionEngine().suggest_one_time_expenses(descriptions)
+            assert "one_time_3" in [s.suggestion_id for s in suggestions]
+            for suggestion in suggestions:
+                keyword = suggestion.supporting_evidence[0]
+                assert keyword.lower() in suggestion.reasoning.lower()
+
+    def test_classify_descriptions_batches_unique_descriptions(self):
+        """Test that unique descriptions are packed batch_size per model call"""
+        engine = AdjustmentSuggestionEngine(batch_size=2)
+        batches = []
+
+        async def fake_classify_batch(descriptions):
+            batches.append(list(descriptions))
+            return [{"category": "Other", "confidence": 0.5} for _ in descriptions]
+
+        engine._classify_batch = fake_classify_batch
+        results = asyncio.run(engine._classify_descriptions(["a", "b", "c"]))
+
+        assert batches == [["a", "b"], ["c"]]
+        assert set(results) == {"a", "b", "c"}
+
+        # Second pass is served from the classification cache
+        asyncio.run(engine._classify_descriptions(["a", "c"]))
+        assert len(batches) == 2
+
+    def test_unknown_backend_rejected(self):
+        """Test that an unsupported backend name raises"""
+        with pytest.raises(ValueError):
+            AdjustmentSuggestionEngine(backend="not-a-backend")
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_classify_descriptions_with_blocking_classify_fn(self, executor):
+        """Test that a blocking classify_fn runs in the worker pool"""
+        engine = AdjustmentSuggestionEngine(
+            batch_size=2, executor=executor, classify_fn=_blocking_classify, max_concurrency=2
+        )
+        try:
+            result = asyncio.run(engine._classify_descriptions(["a", "b", "c"]))
+        finally:
+            engine.close()
+
+        assert result == {desc: {"category": "Other"} for desc in ["a", "b", "c"]}
+
+    def test_unknown_executor_rejected(self):
+        """Test that an unsupported executor name raises"""
+        with pytest.raises(ValueError):
+            AdjustmentSuggestionEngine(executor="fibers")
+
+    def test_classify_batch_uses_backend(self):
+        """Test that batches go through the configured backend in one call"""
+
+        class FakeBackend:
+            def __init__(self):
+                self.prompts = []
+
+            async def generate(self, prompt):
+                self.prompts.append(prompt)
+                return '[{"category": "Other", "confidence": 0.4}, {"category": "Other"}]'
+
+        engine = AdjustmentSuggestionEngine()
+        engine.backend = FakeBackend()
+        result = asyncio.run(engine._classify_batch(["Desc A", "Desc B"]))
+
+        assert len(engine.backend.prompts) == 1
+        assert "2) Desc B" in engine.backend.prompts[0]
+        assert result[0] == {"category": "Other", "confidence": 0.4}
+
+    def test_one_time_suggestions_from_model_classifications(self):
+        """Test model classifications of unmatched descriptions become suggestions"""
+        replies = {
+            "Trade show booth": {"category": "One-Time Expense", "confidence": 0.9},
+            "AWS": {"category": "Other", "confidence": 0.9},
+            "Office move": {"category": "One-Time Expense", "confidence": 0.2},
+        }
+
+        class FakeBackend:
+            def __init__(self):
+                self.calls = 0
+
+            async def generate(self, prompt):
+                self.calls += 1
+                items = [line.split(") ", 1)[1] for line in prompt.splitlines()[3:]]
+                return json.dumps([replies.get(item) for item in items])
+
+        df = pd.DataFrame(
+            {
+                "row_id": [1, 2, 3, 4, 5],
+                "description": [
+                    "Trade show booth",
+                    "AWS",
+                    "Office move",
+                    "Lawsuit settlement",
+                    "Trade show booth",
+                ],
+                "amount_net": [100.0, 50.0, 80.0, 300.0, 120.0],
+            }
+        )
+        engine = AdjustmentSuggestionEngine()
+        engine.backend = FakeBackend()
+        suggestions = engine.suggest_one_time_expenses(df)
+
+        by_id = {s.suggestion_id: s for s in suggestions}
+        assert sorted(by_id) == ["one_time_1", "one_time_4", "one_time_5"]
+        assert by_id["one_time_1"].confidence_score == 0.9
+        assert by_id["one_time_1"].confidence_level == SuggestionConfidence.HIGH
+        assert by_id["one_time_5"].suggested_amount == -120.0
+        # Unique unmatched descriptions share one batched call
+        assert engine.backend.calls == 1
+
+    def test_parse_batch_response(self):
+        """Test parsing JSON array replies from the model"""
+        engine = AdjustmentSuggestionEngine()
+        prompt = engine._build_batch_prompt(["Legal settlement", "AWS"])
+        assert "1) Legal settlement" in prompt
+        assert "2) AWS" in prompt
+
+        parsed = engine._parse_batch_response('[{"category": "Other"}]', expected=2)
+        assert parsed == [{"category": "Other"}, None]
+        assert engine._parse_batch_response("not json", expected=2) == [None, None]
+
+    def test_gather_bounded_limits_concurrency(self):
+        """Test that fan-out never exceeds max_concurrency in-flight calls"""
+        engine = AdjustmentSuggestionEngine(max_concurrency=2)
+        in_flight = 0
+        peak = 0
+
+        async def call(i):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if i == 3:
+                raise ValueError("model error")
+            return i
+
+        results = asyncio.run(engine._gather_bounded(call(i) for i in range(6)))
+        assert peak == 2
+        assert results[:3] == [0, 1, 2]
+        assert isinstance(results[3], ValueError)
+
+
+@pytest.mark.unit
+class TestEmbeddingCache:
+    """Test content-addressed embedding cache"""
+
+    def test_normalized_descriptions_share_hash(self):
+        """Test that case/whitespace variants hash identically"""
+        assert hash_text("  AWS   Invoice ") == hash_text("aws invoice")
+        assert hash_text("AWS") != hash_text("Stripe fee")
+
+    def test_embed_with_cache_batches_misses_once(self):
+        """Test that repeated descriptions are embedded once"""
+        calls = []
+
+        async def fake_embed(texts):
+            calls.append(list(texts))
+            return np.arange(len(texts), dtype=np.float32).reshape(-1, 1)
+
+        cache = EmbeddingCache()
+        texts = ["AWS", "Stripe fee", "aws", "AWS "]
+        result = asyncio.run(embed_with_cache(cache, texts, fake_embed))
+
+        assert calls == [["aws", "stripe fee"]]
+        assert result.shape == (4, 1)
+        assert result[0, 0] == result[2, 0] == result[3, 0]
+
+        asyncio.run(embed_with_cache(cache, ["Stripe Fee"], fake_embed))
+        assert len(calls) == 1
+
+    def test_cache_persists_to_sqlite(self, tmp_path):
+        """Test that cached values survive a new cache instance"""
+        path = tmp_path / "cache.sqlite"
+        cache = EmbeddingCache(path=path)
+        cache.put(1, np.array([0.5, 1.5], dtype=np.float32))
+        cache.put((2, "model"), {"category": "Other"})
+
+        reopened = EmbeddingCache(path=path)
+        np.testing.assert_array_equal(reopened.get(1), [0.5, 1.5])
+        assert reopened.get((2, "model")) == {"category": "Other"}
+        assert reopened.get(3) is None
+
 
 @pytest.mark.unit
 class TestAIModuleImports:
@@ -240,3 +914,26 @@ class TestAIModuleImports:
         assert TransactionClusterer is not None
         assert AdjustmentSuggestionEngine is not None
 
+
+    def test_ai_package_does_not_import_pandas(self):
+        """Test that importing app.ai defers loading pandas-backed submodules"""
+        import subprocess
+        import sys
+        from pathlib import Path
+
+        code = "import sys, app.ai; print('pandas' in sys.modules)"
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parents[1],
+        )
+        assert out.stdout.strip() == "False"
+
+    def test_ai_module_unknown_attribute(self):
+        """Test that unknown names still raise AttributeError"""
+        import app.ai
+
+        with pytest.raises(AttributeError):
+            app.ai.NotAThing
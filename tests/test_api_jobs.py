@@ -0,0 +1,144 @@
+"""
+Tests for the background databook job registry
+"""
+
+import logging
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from app.api.jobs import DatabookJobs
+
+
+class FakeClock:
+    """Manually advanced time source"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDatabookJobs:
+    """Test job ownership, expiry and size bounds"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_job_lifecycle(self, clock):
+        """Test pending -> done/failed transitions"""
+        jobs = DatabookJobs(ttl_seconds=60, clock=clock)
+        done_id = jobs.create(user_id=1)
+        failed_id = jobs.create(user_id=1)
+
+        assert jobs.get(done_id, user_id=1)["status"] == "pending"
+
+        jobs.finish(done_id, "/tmp/does-not-exist.xlsx")
+        jobs.fail(failed_id, "boom")
+
+        assert jobs.get(done_id, user_id=1)["path"] == "/tmp/does-not-exist.xlsx"
+        assert jobs.get(failed_id, user_id=1)["error"] == "boom"
+
+    def test_jobs_are_private_to_their_owner(self, clock):
+        """Test another user's job looks like a missing job"""
+        jobs = DatabookJobs(ttl_seconds=60, clock=clock)
+        job_id = jobs.create(user_id=1)
+
+        assert jobs.get(job_id, user_id=2) is None
+        assert jobs.get(job_id, user_id=1) is not None
+
+    def test_finished_jobs_expire_with_their_files(self, clock, tmp_path):
+        """Test finished jobs and their databooks are removed after the TTL"""
+        jobs = DatabookJobs(ttl_seconds=60, clock=clock)
+        databook = tmp_path / "GL_Databook.xlsx"
+        databook.write_bytes(b"xlsx")
+
+        done_id = jobs.create(user_id=1)
+        pending_id = jobs.create(user_id=1)
+        jobs.finish(done_id, str(databook))
+
+        clock.now = 59
+        assert jobs.get(done_id, user_id=1) is not None
+
+        clock.now = 60
+        assert jobs.get(done_id, user_id=1) is None
+        assert not databook.exists()
+        # Jobs still running are never expired
+        assert jobs.get(pending_id, user_id=1)["status"] == "pending"
+
+    def test_registry_is_bounded(self, clock, tmp_path):
+        """Test the oldest finished jobs are evicted beyond max_jobs"""
+        jobs = DatabookJobs(ttl_seconds=3600, max_jobs=3, clock=clock)
+        paths = []
+        job_ids = []
+        for i in range(3):
+            path = tmp_path / f"databook_{i}.xlsx"
+            path.write_bytes(b"xlsx")
+            paths.append(path)
+            job_ids.append(jobs.create(user_id=1))
+            jobs.finish(job_ids[-1], str(path))
+
+        newest = jobs.create(user_id=1)
+
+        assert len(jobs) == 3
+        assert jobs.get(job_ids[0], user_id=1) is None
+        assert not paths[0].exists()
+        assert all(jobs.get(j, user_id=1) is not None for j in job_ids[1:] + [newest])
+
+
+class TestGenerateDatabookJob:
+    """Test the background task writing each job's databook"""
+
+    @pytest.fixture
+    def main(self, monkeypatch, tmp_path):
+        pytest.importorskip("jose")
+        pytest.importorskip("email_validator")
+        from app.api import main
+        from app.core.mapping import GLAccountMapper
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(main, "databook_jobs", DatabookJobs(ttl_seconds=60))
+        monkeypatch.setattr(
+            GLAccountMapper, "generate_auto_mapping_df", lambda self, df, entity=None: None
+        )
+        return main
+
+    def test_each_job_writes_its_own_file(self, main, monkeypatch):
+        """Test jobs finishing together don't share a databook path"""
+        from app.excel.databook_generator import DatabookGenerator
+
+        def fake_generate(self, output_path, **kwargs):
+            Path(output_path).write_bytes(b"xlsx")
+            return output_path
+
+        monkeypatch.setattr(DatabookGenerator, "generate_databook", fake_generate)
+        job_ids = [main.databook_jobs.create(user_id=user_id) for user_id in (1, 2)]
+        for job_id in job_ids:
+            main.generate_databook_job(job_id, pd.DataFrame(), None, None, [])
+
+        paths = [
+            main.databook_jobs.get(job_id, user_id)["path"]
+            for job_id, user_id in zip(job_ids, (1, 2))
+        ]
+        assert len(set(paths)) == 2
+        assert all(job_id in path for job_id, path in zip(job_ids, paths))
+        assert all(Path(path).exists() for path in paths)
+
+    def test_failure_is_logged(self, main, monkeypatch, caplog):
+        """Test a failed generation marks the job failed and logs the traceback"""
+        from app.excel.databook_generator import DatabookGenerator
+
+        def failing_generate(self, output_path, **kwargs):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(DatabookGenerator, "generate_databook", failing_generate)
+        job_id = main.databook_jobs.create(user_id=1)
+        with caplog.at_level(logging.ERROR, logger="app.api.main"):
+            main.generate_databook_job(job_id, pd.DataFrame(), None, None, [])
+
+        assert main.databook_jobs.get(job_id, user_id=1)["error"] == "disk full"
+        assert job_id in caplog.text
+        assert caplog.records[-1].exc_info is not None
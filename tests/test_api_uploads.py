@@ -0,0 +1,52 @@
+"""
+Tests for spooling uploaded files to disk
+"""
+
+import io
+import os
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("jose")
+pytest.importorskip("email_validator")
+
+from app.api.main import spool_upload
+
+
+class FailingStream(io.RawIOBase):
+    """Stream that yields some bytes, then fails like a dropped connection"""
+
+    def __init__(self):
+        self.sent = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.sent:
+            raise OSError("connection reset")
+        self.sent = True
+        buffer[:3] = b"abc"
+        return 3
+
+
+class TestSpoolUpload:
+    """Test streaming uploads to temp files"""
+
+    def test_spools_upload_to_temp_file(self):
+        """Test the upload's bytes end up in the returned temp file"""
+        path = spool_upload(SimpleNamespace(file=io.BytesIO(b"xlsx bytes")))
+        try:
+            with open(path, "rb") as spooled:
+                assert spooled.read() == b"xlsx bytes"
+        finally:
+            os.unlink(path)
+
+    def test_failed_copy_removes_partial_file(self, monkeypatch, tmp_path):
+        """Test a failed copy leaves no partial temp file behind"""
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+        with pytest.raises(OSError):
+            spool_upload(SimpleNamespace(file=FailingStream()))
+        assert list(tmp_path.iterdir()) == []
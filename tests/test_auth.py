@@ -0,0 +1,80 @@
+"""
+Tests for access tokens and the API's current-user dependency
+"""
+
+import time
+
+import pytest
+
+jwt = pytest.importorskip("jose.jwt")
+
+from app.auth import auth
+from app.auth.auth import create_access_token, decode_access_token
+
+
+class TestAccessTokens:
+    """Test signed, expiring access tokens"""
+
+    def test_token_round_trip(self):
+        """Test a freshly issued token decodes to its user id"""
+        assert decode_access_token(create_access_token(42)) == 42
+
+    def test_expired_token_is_rejected(self):
+        """Test a token past its exp claim doesn't decode"""
+        payload = {"sub": "42", "exp": int(time.time()) - 10}
+        token = jwt.encode(payload, auth.JWT_SECRET_KEY, algorithm=auth.JWT_ALGORITHM)
+        assert decode_access_token(token) is None
+
+    def test_bad_signature_is_rejected(self):
+        """Test tokens signed with another key, tampered with or malformed don't decode"""
+        payload = {"sub": "42", "exp": int(time.time()) + 60}
+        forged = jwt.encode(payload, "not-the-secret", algorithm=auth.JWT_ALGORITHM)
+        assert decode_access_token(forged) is None
+
+        header, _, signature = create_access_token(42).split(".")
+        other_claims = jwt.encode(payload | {"sub": "1"}, "x").split(".")[1]
+        assert decode_access_token(f"{header}.{other_claims}.{signature}") is None
+
+        assert decode_access_token("1") is None
+
+    def test_expiry_is_set(self, monkeypatch):
+        """Test tokens carry the configured lifetime"""
+        monkeypatch.setattr(auth.time, "time", lambda: 1_000)
+        claims = jwt.get_unverified_claims(create_access_token(7))
+        assert claims == {"sub": "7", "exp": 1_000 + auth.ACCESS_TOKEN_EXPIRE_SECONDS}
+
+
+class TestCurrentUserDependency:
+    """Test the API dependency resolving the caller from the bearer token"""
+
+    @pytest.fixture
+    def main(self):
+        pytest.importorskip("email_validator")
+        from app.api import main
+
+        return main
+
+    @staticmethod
+    def credentials(token):
+        from fastapi.security import HTTPAuthorizationCredentials
+
+        return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    def test_valid_token_resolves_user(self, main):
+        """Test a valid token resolves to its user"""
+        assert main.get_current_user_id(self.credentials(create_access_token(5))) == 5
+
+    def test_invalid_token_is_unauthorized(self, main, monkeypatch):
+        """Test forged or malformed tokens get 401 by default"""
+        from fastapi import HTTPException
+
+        monkeypatch.setattr(main, "ANONYMOUS_USER_ID", None)
+        for token in ("1", jwt.encode({"sub": "1"}, "not-the-secret")):
+            with pytest.raises(HTTPException) as excinfo:
+                main.get_current_user_id(self.credentials(token))
+            assert excinfo.value.status_code == 401
+
+    def test_anonymous_fallback_is_opt_in(self, main, monkeypatch):
+        """Test ANONYMOUS_USER_ID lets invalid tokens act as that user"""
+        monkeypatch.setattr(main, "ANONYMOUS_USER_ID", "1")
+        assert main.get_current_user_id(self.credentials("1")) == 1
@@ -0,0 +1,145 @@
+"""
+Tests for database sessions and bulk inserts (in-memory SQLite)
+"""
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import models
+from app.database.models import (
+    Databook,
+    Project,
+    ProjectFile,
+    User,
+    bulk_insert_databooks,
+    bulk_insert_project_files,
+    session_scope,
+)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """In-memory SQLite engine behind the module's session factory"""
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    monkeypatch.setattr(
+        models,
+        "get_sessionmaker",
+        lambda: sessionmaker(bind=engine, autoflush=False, expire_on_commit=False),
+    )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def project_id(engine):
+    """Id of a project owned by a fresh user"""
+    with session_scope() as db:
+        user = User(email="owner@example.com", username="owner", hashed_password="x")
+        project = Project(title="Acme QoE", owner=user)
+        db.add(project)
+        db.flush()
+        return project.id
+
+
+def count(model) -> int:
+    """Number of rows stored for model"""
+    with session_scope() as db:
+        return db.scalar(select(func.count()).select_from(model))
+
+
+class TestSessionScope:
+    """Test the transactional session scope"""
+
+    def test_commits_on_success(self, engine):
+        """Test that changes made in the scope are committed"""
+        with session_scope() as db:
+            db.add(User(email="a@example.com", username="a", hashed_password="x"))
+
+        with session_scope() as db:
+            user = db.scalars(select(User)).one()
+            assert user.username == "a"
+            assert user.is_active is True
+            assert user.created_at is not None
+
+    def test_rolls_back_on_exception(self, engine):
+        """Test that an exception discards the scope's changes and propagates"""
+        with pytest.raises(RuntimeError):
+            with session_scope() as db:
+                db.add(User(email="a@example.com", username="a", hashed_password="x"))
+                db.flush()
+                raise RuntimeError("boom")
+
+        assert count(User) == 0
+
+
+class TestBulkInserts:
+    """Test executemany inserts of files and databooks"""
+
+    def test_bulk_insert_round_trip(self, project_id):
+        """Test bulk-inserted rows read back with their values and column defaults"""
+        with session_scope() as db:
+            bulk_insert_project_files(
+                db,
+                [
+                    {
+                        "project_id": project_id,
+                        "filename": f"gl_{i}.xlsx",
+                        "file_path": f"/uploads/gl_{i}.xlsx",
+                        "file_size": 100 + i,
+                    }
+                    for i in range(3)
+                ],
+            )
+            bulk_insert_databooks(
+                db,
+                [
+                    {
+                        "project_id": project_id,
+                        "filename": "databook.xlsx",
+                        "file_path": "/d.xlsx",
+                        "file_size": 500,
+                    }
+                ],
+            )
+
+        with session_scope() as db:
+            project = db.get(Project, project_id)
+            files = sorted(project.files, key=lambda f: f.filename)
+            assert [(f.filename, f.file_size) for f in files] == [
+                ("gl_0.xlsx", 100),
+                ("gl_1.xlsx", 101),
+                ("gl_2.xlsx", 102),
+            ]
+            assert all(f.uploaded_at is not None for f in files)
+            assert [d.filename for d in project.databooks] == ["databook.xlsx"]
+            assert project.databooks[0].generated_at is not None
+
+    def test_bulk_insert_without_rows_is_noop(self, project_id):
+        """Test empty row lists insert nothing"""
+        with session_scope() as db:
+            bulk_insert_project_files(db, [])
+            bulk_insert_databooks(db, [])
+
+        assert count(ProjectFile) == 0
+        assert count(Databook) == 0
+
+    def test_bulk_insert_rolls_back_with_scope(self, project_id):
+        """Test bulk inserts are part of the scope's transaction"""
+        with pytest.raises(RuntimeError):
+            with session_scope() as db:
+                bulk_insert_project_files(
+                    db,
+                    [
+                        {
+                            "project_id": project_id,
+                            "filename": "gl.xlsx",
+                            "file_path": "/gl.xlsx",
+                            "file_size": 1,
+                        }
+                    ],
+                )
+                raise RuntimeError("boom")
+
+        assert count(ProjectFile) == 0
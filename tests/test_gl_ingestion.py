@@ -10,6 +10,7 @@ from pathlib import Path
 import tempfile
 import os
 
+from app.core import gl_ingestion
 from app.core.gl_ingestion import GLIngestionEngine, ProcessingReport
 
 
@@ -619,3 +620,306 @@ class TestGLIngestionEngine:
         finally:
             os.unlink(tmp_path)
 
+
+    def test_nested_hierarchy_flattening(self, engine):
+        """Test parent/sub-account headers nest, reset on indicators and empty rows"""
+        df_input = pd.DataFrame(
+            {
+                "date": [None, None, "2024-01-15", None, "2024-01-16", None,
+                         "2024-01-17", None, "2024-01-18", "2024-01-19"],
+                "account_name_raw": ["Assets", "Bank", "Checking", "Savings", "Interest",
+                                     "Expenses", "Rent", "", "Misc", "Misc"],
+                "description": ["", "", "a", "", "b", "", "c", "", "", "d"],
+                "debit": [None, None, 10.0, None, 5.0, None, 7.0, None, 0.0, 3.0],
+                "credit": [None, None, 0.0, None, 0.0, None, 0.0, None, 0.0, 0.0],
+            }
+        )
+
+        df = engine._normalize_data(df_input, "E", "QuickBooks", "gl.xlsx", ProcessingReport())
+
+        assert df["account_name_flat"].tolist() == [
+            "Assets : Bank : Checking",
+            "Assets : Bank : Savings : Interest",
+            "Expenses : Rent",
+            "Misc : Misc",
+        ]
+
+    def test_keyword_group_masks(self, engine, monkeypatch):
+        """Test keyword groups are matched independently by every matching backend"""
+        from app.core import gl_ingestion
+
+        text = np.array(
+            ["checking\nsubtotal", "grand total\nopening balance", "rent\nmay", ""], dtype=object
+        )
+        groups = (engine.TOTAL_PATTERNS, engine.SUBTOTAL_PATTERNS, engine.OPENING_BALANCE_PATTERNS)
+        expected = [[True, True, False, False], [True, False, False, False],
+                    [False, True, False, False]]
+
+        masks = engine._keyword_group_masks(text, groups)
+        assert [mask.tolist() for mask in masks] == expected
+
+        monkeypatch.setattr(gl_ingestion, "pyarrow", None)
+        masks = engine._keyword_group_masks(text, groups)
+        assert [mask.tolist() for mask in masks] == expected
+
+        monkeypatch.setattr(gl_ingestion, "ahocorasick", None)
+        masks = engine._keyword_group_masks(text, groups)
+        assert [mask.tolist() for mask in masks] == expected
+
+    def test_report_counts_are_plain_ints(self, engine):
+        """Test report counts are Python ints so the report serializes as JSON"""
+        import json
+
+        df_input = pd.DataFrame(
+            {
+                "date": ["2024-01-15", "2024-01-16", None],
+                "account_name_raw": ["Checking", "Total Checking", "Savings"],
+                "description": ["a", "", ""],
+                "debit": [10.0, 10.0, None],
+                "credit": [0.0, 0.0, None],
+            }
+        )
+        report = ProcessingReport()
+        engine._normalize_data(df_input, "E", "QuickBooks", "gl.xlsx", report)
+
+        counts = report.to_dict()
+        assert counts["rows_removed_totals"] == 1
+        assert all(type(value) is int for key, value in counts.items() if key != "warnings")
+        json.dumps(counts)
+
+    def test_excel_engine_selection(self, engine, monkeypatch):
+        """Test calamine is used for .xlsx when installed, never for legacy .xls"""
+        from app.core import gl_ingestion
+
+        monkeypatch.setattr(gl_ingestion, "python_calamine", object())
+        assert engine._excel_engine(Path("gl.xlsx")) == "calamine"
+        assert engine._excel_engine(Path("gl.XLS")) is None
+
+        monkeypatch.setattr(gl_ingestion, "python_calamine", None)
+        assert engine._excel_engine(Path("gl.xlsx")) == "openpyxl"
+        assert engine._excel_engine(Path("gl.xls")) is None
+
+    @pytest.mark.parametrize(
+        "rows",
+        [
+            # Title rows above the header, extra columns, blank and trailing rows
+            [
+                ["Company GL", None, None, None, None, None, None],
+                [None] * 7,
+                ["Date", "Num", "Account", "Memo", "Debit", "Credit", "Balance"],
+                ["2024-01-15", 1, "Cash", "Deposit", 100, None, 100],
+                [None, None, "Bank", None, None, None, None],
+                ["2024-01-16", 2, "Bank", 42, 12.5, None, 87.5],
+                [None] * 7,
+                ["2024-01-17", 3, "Rent", "#N/A", None, 30, 57.5],
+                [None] * 7,
+                [None] * 7,
+            ],
+            # No header row, narrower than five columns, fewer rows than the scan window
+            [["x", "Cash", 1.0], ["2024-01-15", "Cash", 2.0], ["2024-01-16", None, None]],
+            [],
+        ],
+    )
+    def test_column_readers_match_read_excel(self, engine, rows):
+        """Test the streaming and usecols readers match read_excel + structure detection"""
+        with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp_file:
+            pd.DataFrame(rows).to_excel(tmp_file.name, index=False, header=False)
+            tmp_path = Path(tmp_file.name)
+
+        try:
+            streamed_report = ProcessingReport()
+            streamed = engine._stream_gl_columns(tmp_path, None, streamed_report)
+
+            expected_report = ProcessingReport()
+            raw = pd.read_excel(tmp_path, header=None, engine="openpyxl")
+            expected_report.total_rows_read = len(raw)
+            expected = engine._detect_and_parse_structure(raw, tmp_path.name, expected_report)
+
+            pd.testing.assert_frame_equal(streamed, expected)
+            assert streamed_report == expected_report
+
+            # The usecols reader skips type inference, so compare normalized output
+            selected_report = ProcessingReport()
+            selected = engine._read_gl_columns(tmp_path, None, "openpyxl", selected_report)
+            assert selected_report == expected_report
+            if not expected.empty:
+                pd.testing.assert_frame_equal(
+                    engine._normalize_data(selected, "E", "QB", "gl.xlsx", ProcessingReport()),
+                    engine._normalize_data(expected, "E", "QB", "gl.xlsx", ProcessingReport()),
+                )
+        finally:
+            os.unlink(tmp_path)
+
+    def test_string_columns_are_categorical(self, engine):
+        """Test low-cardinality string columns are categoricals, description Arrow-backed"""
+        from app.core import gl_ingestion
+
+        df_input = pd.DataFrame(
+            {
+                "date": ["2024-01-15", "2024-01-16", "2024-01-17"],
+                "account_name_raw": ["Cash", "Cash", "Rent"],
+                "description": ["a", "b", "c"],
+                "debit": [10.0, 5.0, 7.0],
+                "credit": [0.0, 0.0, 0.0],
+            }
+        )
+
+        df = engine._normalize_data(df_input, "E", "QuickBooks", "gl.xlsx", ProcessingReport())
+
+        for col in engine.CATEGORICAL_COLUMNS:
+            assert isinstance(df[col].dtype, pd.CategoricalDtype)
+        assert df["account_name_flat"].tolist() == ["Cash", "Cash", "Rent"]
+        assert df["entity"].cat.categories.tolist() == ["E"]
+        if gl_ingestion.pyarrow is not None:
+            assert df["description"].dtype == "string[pyarrow]"
+        assert df["description"].tolist() == ["a", "b", "c"]
+
+    def test_amounts_keep_cent_precision(self, engine):
+        """Test large amounts survive normalization to the cent (no float32 downcast)"""
+        df_input = pd.DataFrame(
+            {
+                "date": ["2024-01-15", "2024-01-16"],
+                "account_name_raw": ["Cash", "Revenue"],
+                "description": ["a", "b"],
+                "debit": [12345678.91, 0.0],
+                "credit": [0.0, 12345678.91],
+            }
+        )
+
+        df = engine._normalize_data(df_input, "E", "QuickBooks", "gl.xlsx", ProcessingReport())
+
+        assert df["debit"].dtype == np.float64
+        assert df["amount_net"].tolist() == [12345678.91, -12345678.91]
+        assert df["debit"].sum() - df["credit"].sum() == 0
+
+    def test_detect_header_column_priority(self, engine):
+        """Test header cells are claimed by the first unassigned matching column"""
+        rows = [
+            ["General Ledger", None],
+            ["Txn Date", "Due Date", "Account Name", "Name", "Num", "Debit", "Credit"],
+        ]
+
+        header_row_idx, columns = engine._detect_header(rows)
+
+        assert header_row_idx == 1
+        # "Due Date" is not reused; "Account Name" goes to account, not description
+        assert columns == [0, 2, 3, 5, 6]
+
+        header_row_idx, columns = engine._detect_header([["x", "y"], [1, 2]])
+        assert header_row_idx is None
+        assert columns == [0, 1, 2, 3, 4]
+
+        # Ragged rows: the header row may be wider than the rows above it
+        rows = [["Report"], ["Date", "Account", "Memo", "Debit", "Credit", "Balance"]]
+        assert engine._detect_header(rows) == (1, [0, 1, 2, 3, 4])
+
+    @pytest.mark.parametrize(
+        "values",
+        [
+            ["01/15/2024", "01/16/2024", None, "Total"],
+            ["Date", "2024-01-15", "16-Oct-2024", None],
+            [datetime(2024, 1, 15), "2024-01-16", "Jan 17, 2024", "Total"],
+            [None, None],
+            ["", "01/02/2024", "2024-03-05"],
+            ["", "01/02/2024", "13/02/2024", "02/03/2024"],
+            ["NaT", "nan", "2024-01-15", "01/16/2024"],
+        ],
+    )
+    def test_parse_dates_matches_to_datetime(self, engine, values):
+        """Test explicit-format date parsing gives the same result as pandas inference"""
+        import warnings
+
+        dates = pd.Series(values, dtype=object)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = pd.to_datetime(dates, errors="coerce")
+
+        pd.testing.assert_series_equal(engine._parse_dates(dates), expected)
+
+    def test_non_numeric_amounts_count_as_zero_for_headers(self, engine):
+        """Test unparseable debit/credit cells are 0, so a dated row without amounts is a header"""
+        df_input = pd.DataFrame(
+            {
+                "date": ["2024-01-15", "2024-01-15", "2024-01-16"],
+                "account_name_raw": ["Bank", "Checking", "Checking"],
+                "description": ["", "a", "b"],
+                "debit": ["n/a", "12.5", None],
+                "credit": [None, None, "7"],
+            }
+        )
+
+        df = engine._normalize_data(df_input, "E", "QuickBooks", "gl.xlsx", ProcessingReport())
+
+        assert df["account_name_flat"].tolist() == ["Bank : Checking", "Bank : Checking"]
+        assert df["amount_net"].tolist() == [12.5, -7.0]
+
+    def test_ingest_reuses_parsed_sheet_until_file_changes(
+        self, engine, sample_qb_online_data, monkeypatch
+    ):
+        """Test an unchanged file is parsed once and cached results are not mutated"""
+        with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp_file:
+            sample_qb_online_data.to_excel(tmp_file.name, index=False, header=False)
+            tmp_path = tmp_file.name
+
+        reads = []
+        original_read = GLIngestionEngine._read_gl_sheet
+
+        def counting_read(self, *args):
+            reads.append(args)
+            return original_read(self, *args)
+
+        monkeypatch.setattr(GLIngestionEngine, "_read_gl_sheet", counting_read)
+        try:
+            first, first_report = engine.ingest_gl_file(tmp_path, entity="A")
+            second, second_report = engine.ingest_gl_file(tmp_path, entity="B")
+            assert len(reads) == 1
+            assert first["entity"].tolist() == ["A"] * len(first)
+            assert second["entity"].tolist() == ["B"] * len(second)
+            assert first_report == second_report
+
+            stat = os.stat(tmp_path)
+            os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            engine.ingest_gl_file(tmp_path, entity="A")
+            assert len(reads) == 2
+        finally:
+            os.unlink(tmp_path)
+
+    def test_sheet_cache_is_bounded_in_bytes(self, engine, sample_qb_online_data, monkeypatch):
+        """Test parsed sheets are evicted beyond the byte budget and not cached at 0"""
+        tmp_paths = []
+        for _ in range(2):
+            with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp_file:
+                sample_qb_online_data.to_excel(tmp_file.name, index=False, header=False)
+                tmp_paths.append(tmp_file.name)
+
+        reads = []
+        original_read = GLIngestionEngine._read_gl_sheet
+
+        def counting_read(self, path, *args):
+            reads.append(str(path))
+            return original_read(self, path, *args)
+
+        monkeypatch.setattr(GLIngestionEngine, "_read_gl_sheet", counting_read)
+        gl_ingestion._clear_sheet_cache()
+        try:
+            # Room for one sheet: reading the second evicts the first
+            engine.ingest_gl_file(tmp_paths[0], entity="A")
+            size = gl_ingestion._sheet_cache_bytes
+            assert size > 0
+            monkeypatch.setattr(gl_ingestion, "GL_SHEET_CACHE_MAX_BYTES", size)
+            engine.ingest_gl_file(tmp_paths[1], entity="A")
+            assert gl_ingestion._sheet_cache_bytes == size
+            engine.ingest_gl_file(tmp_paths[1], entity="A")
+            engine.ingest_gl_file(tmp_paths[0], entity="A")
+            assert len(reads) == 3
+
+            monkeypatch.setattr(gl_ingestion, "GL_SHEET_CACHE_MAX_BYTES", 0)
+            gl_ingestion._clear_sheet_cache()
+            engine.ingest_gl_file(tmp_paths[0], entity="A")
+            engine.ingest_gl_file(tmp_paths[0], entity="A")
+            assert len(reads) == 5
+            assert gl_ingestion._sheet_cache_bytes == 0
+        finally:
+            gl_ingestion._clear_sheet_cache()
+            for tmp_path in tmp_paths:
+                os.unlink(tmp_path)
@@ -12,6 +12,7 @@ import os
 from pathlib import Path
 from datetime import datetime
 
+from app.core import gl_pipeline
 from app.core.gl_pipeline import GLPipeline
 from app.core.validation import ValidationStatus
 from app.excel.databook_generator import DatabookGenerator
@@ -439,3 +440,37 @@ class TestPipelineIntegration:
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
 
+
+    def test_process_gl_files_matches_serial(self, balanced_gl_data, unbalanced_gl_data):
+        """Test that parallel multi-file processing matches per-file processing"""
+        tmp_paths = []
+        for data in (balanced_gl_data, unbalanced_gl_data):
+            with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as tmp_file:
+                data.to_excel(tmp_file.name, index=False, header=False)
+                tmp_paths.append(tmp_file.name)
+
+        try:
+            pipeline = GLPipeline()
+            jobs = [
+                (tmp_paths[0], "Entity A", "QuickBooks Desktop"),
+                (tmp_paths[1], "Entity B", "QuickBooks Desktop"),
+            ]
+            results = pipeline.process_gl_files(jobs, max_workers=2)
+
+            assert len(results) == 2
+            for job, (normalized_df, processing_report, validation_result) in zip(jobs, results):
+                expected_df, expected_report, expected_validation = pipeline.process_gl_file(*job)
+                pd.testing.assert_frame_equal(normalized_df, expected_df)
+                assert processing_report == expected_report
+                assert validation_result.status == expected_validation.status
+                assert validation_result.errors == expected_validation.errors
+
+            # Later calls reuse the same worker pool instead of starting a new one
+            executor = gl_pipeline._executors[2]
+            assert len(GLPipeline().process_gl_files(jobs, max_workers=2)) == 2
+            assert gl_pipeline._executors[2] is executor
+
+        finally:
+            for tmp_path in tmp_paths:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
@@ -60,6 +60,31 @@ class TestGLAccountMapper:
         # Should have unique accounts per entity
         assert len(unique_accounts) > 0
 
+    def test_extract_unique_accounts_counts_and_raw_names(self, mapper):
+        """Test transaction counts and first non-null raw name per account/entity"""
+        df = pd.DataFrame(
+            {
+                "row_id": range(5),
+                "entity": ["A", "A", "A", "B", "A"],
+                "account_name_flat": ["Cash", "Cash", "Sales", "Cash", "Cash"],
+                "account_name_raw": [None, "1000 Cash", "4000 Sales", "Cash B", "Cash 2"],
+            }
+        )
+
+        unique_accounts = mapper.extract_unique_accounts(df)
+
+        assert unique_accounts[["entity", "account_name_flat"]].values.tolist() == [
+            ["A", "Cash"],
+            ["A", "Sales"],
+            ["B", "Cash"],
+        ]
+        assert unique_accounts["transaction_count"].tolist() == [3, 1, 1]
+        assert unique_accounts["account_name_raw"].tolist() == [
+            "1000 Cash",
+            "4000 Sales",
+            "Cash B",
+        ]
+
     def test_extract_unique_accounts_filtered_by_entity(
         self, mapper, sample_normalized_df
     ):
@@ -168,6 +193,29 @@ class TestGLAccountMapper:
         assert "main_category" in result_df.columns
         assert len(result_df) == 2
 
+    def test_apply_mapping_duplicate_keys(self, mapper, sample_normalized_df):
+        """Test duplicate mapping rows don't duplicate GL rows (the first one wins)"""
+        mapping_df = pd.DataFrame(
+            {
+                "account_name_flat": ["Cash", "Cash", "Revenue"],
+                "main_category": ["Balance Sheet", "OpEx", "Revenue"],
+                "sub1": ["", "", ""],
+                "sub2": ["", "", ""],
+                "client_specific": ["", "", ""],
+                "notes": ["", "", ""],
+            }
+        )
+        normalized_df = sample_normalized_df.astype(
+            {"entity": "category", "account_name_flat": "category"}
+        ).set_index(pd.Index([5, 6, 7, 8]))
+
+        result_df = mapper.apply_mapping(normalized_df, mapping_df)
+
+        assert result_df.index.tolist() == [0, 1, 2, 3]
+        assert result_df["main_category"].tolist() == [
+            "Balance Sheet", "Revenue", "Balance Sheet", ""
+        ]
+
     def test_suggest_category(self, mapper):
         """Test category suggestion"""
         # Test revenue pattern
@@ -199,6 +247,56 @@ class TestGLAccountMapper:
         suggestion = mapper.suggest_category("Service Sales", mapping_df)
         assert suggestion == "Revenue"
 
+    def test_suggest_categories_bulk(self, mapper, monkeypatch):
+        """Test bulk suggestions match suggest_category, with and without Aho-Corasick"""
+        from app.core import mapping
+
+        names = pd.Series(
+            ["Sales Revenue", "Rent Income", "Interest Expense", "Misc", None, "Cash - Operating"],
+            index=[10, 11, 12, 13, 14, 15],
+        )
+        expected = ["Revenue", "Revenue", "OpEx", None, None, "OpEx"]
+
+        suggestions = mapper.suggest_categories_bulk(names)
+        assert suggestions.index.tolist() == names.index.tolist()
+        assert suggestions.tolist() == expected
+        assert [mapper.suggest_category(name) for name in names[:4]] == expected[:4]
+
+        monkeypatch.setattr(mapping, "ahocorasick", None)
+        mapping._suggest_from_patterns.cache_clear()
+        try:
+            assert mapper.suggest_categories_bulk(names).tolist() == expected
+        finally:
+            mapping._suggest_from_patterns.cache_clear()
+
+    def test_generate_auto_mapping_df(self, mapper):
+        """Test unmatched accounts take the most common category of same-prefix accounts"""
+        names = ["Widget Co Misc", "Widget Co Cash", "Widget Co Sales", "Widget Co Fees",
+                 "Widget Corp", ""]
+        normalized_df = pd.DataFrame(
+            {
+                "entity": ["Company A"] * 6,
+                "row_id": range(6),
+                "account_name_raw": names,
+                "account_name_flat": names,
+            }
+        )
+
+        mapping_df = mapper.generate_auto_mapping_df(normalized_df)
+        categories = dict(zip(mapping_df["account_name_flat"], mapping_df["main_category"]))
+
+        assert categories == {
+            "": "",
+            "Widget Co Cash": "Balance Sheet",
+            "Widget Co Fees": "Revenue",
+            # Shares the "widget co " prefix with two Revenue accounts and one Balance Sheet
+            "Widget Co Misc": "Revenue",
+            "Widget Co Sales": "Revenue",
+            "Widget Corp": "",
+        }
+        assert mapper.suggest_category("Widget Co Other", mapping_df) == "Revenue"
+        assert mapper.suggest_category("Gizmo", mapping_df) is None
+
     def test_get_default_categories(self, mapper):
         """Test getting default categories"""
         categories = mapper.get_default_categories()
@@ -221,6 +319,25 @@ class TestMultiEntityProcessor:
         assert processor is not None
         assert isinstance(processor, MultiEntityProcessor)
 
+    def test_concat_normalized_keeps_categoricals(self, processor):
+        """Test per-entity frames concatenate without falling back to object columns"""
+        frame_a = pd.DataFrame(
+            {"entity": ["Entity A"] * 2, "account_name_flat": ["Rent", "Cash"], "debit": [1.0, 2.0]}
+        ).astype({"entity": "category", "account_name_flat": "category"})
+        frame_b = pd.DataFrame(
+            {"entity": ["Entity B"], "account_name_flat": ["Bank"], "debit": [3.0]}
+        ).astype({"entity": "category", "account_name_flat": "category"})
+        empty = pd.DataFrame(columns=["entity", "account_name_flat", "debit"])
+
+        result = processor._concat_normalized([frame_a, empty, frame_b])
+
+        assert isinstance(result["entity"].dtype, pd.CategoricalDtype)
+        assert result["entity"].cat.categories.tolist() == ["Entity A", "Entity B"]
+        assert result["account_name_flat"].tolist() == ["Rent", "Cash", "Bank"]
+        assert result["account_name_flat"].cat.categories.tolist() == ["Bank", "Cash", "Rent"]
+        assert result["debit"].tolist() == [1.0, 2.0, 3.0]
+        assert result.index.tolist() == [0, 1, 2]
+
     def test_consolidate_validation_results(self, processor):
         """Test validation result consolidation"""
         result1 = ValidationResult()
@@ -108,6 +108,20 @@ class TestGLValidator:
         assert "empty" in result.errors[0].lower()
         assert result.key_metrics["total_transactions"] == 0
 
+    def test_validate_unusable_amount_columns(self, validator, sample_valid_df):
+        """Test missing, non-numeric or all-blank amounts fail before any scan"""
+        blank = sample_valid_df.assign(debit=np.nan, credit=np.nan)
+        text = sample_valid_df.assign(credit=sample_valid_df["credit"].astype(str))
+        missing = sample_valid_df.drop(columns=["debit"])
+
+        for df, expected in [(blank, "blank"), (text, "numeric"), (missing, "missing")]:
+            result = validator.validate(df)
+            assert result.status == ValidationStatus.FAIL
+            assert len(result.errors) == 1
+            assert expected in result.errors[0]
+            assert result.key_metrics["total_transactions"] == len(df)
+            assert result.key_metrics["total_debits"] == 0.0
+
     def test_validate_balanced_debits_credits(self, validator, sample_valid_df):
         """Test validation passes when debits equal credits"""
         # Adjust sample to be balanced
@@ -225,6 +239,51 @@ class TestGLValidator:
         warning_messages = " ".join(result.warnings).lower()
         assert "negative credit" in warning_messages or "negative credits" in warning_messages
 
+    def test_validate_amount_metrics(self, validator, sample_negative_amounts_df):
+        """Test totals skip missing amounts and negative counts appear in the warnings"""
+        df = sample_negative_amounts_df.copy()
+        df.loc[0, "credit"] = np.nan
+
+        result = validator.validate(df)
+
+        assert result.key_metrics["total_debits"] == 1400.0
+        assert result.key_metrics["total_credits"] == 250.0
+        assert type(result.key_metrics["total_debits"]) is float
+        assert "1 transaction(s) have negative debit" in result.warnings[0]
+        assert "1 transaction(s) have negative credit" in result.warnings[1]
+
+    def test_validate_detects_cent_imbalance_on_large_amounts(self, validator, sample_valid_df):
+        """Test a few-cent imbalance is caught on amounts in the tens of millions"""
+        df = sample_valid_df.copy()
+        df["debit"] = [10_000_000.0, 0.0, 0.0, 0.0, 0.0]
+        df["credit"] = [0.0, 10_000_000.04, 0.0, 0.0, 0.0]
+
+        result = validator.validate(df)
+
+        # float32 amounts (1.0 spacing at this magnitude) would hide the difference
+        assert result.status == ValidationStatus.FAIL
+        assert result.key_metrics["debit_credit_difference"] == pytest.approx(0.04)
+
+    def test_amount_metrics_jit_matches_numpy(self, monkeypatch):
+        """Test the fused amount scan agrees with the NumPy fallback"""
+        import math
+
+        from app.core import validation
+
+        rng = np.random.default_rng(0)
+        debits = rng.normal(0, 1e5, 100_003).round(2)
+        credits = rng.normal(0, 1e5, 100_003).round(2)
+        credits[::7] = np.nan
+
+        fused = validation._amount_metrics(debits, credits)
+        monkeypatch.setattr(validation, "NUMBA_AVAILABLE", False)
+        fallback = validation._amount_metrics(debits, credits)
+
+        assert fused[2:] == fallback[2:]
+        assert fused[0] == pytest.approx(math.fsum(debits), abs=1e-6)
+        assert fused[1] == pytest.approx(math.fsum(credits[~np.isnan(credits)]), abs=1e-6)
+        assert fused[:2] == pytest.approx(fallback[:2], abs=1e-6)
+
     def test_validation_result_to_dict(self, validator, sample_valid_df):
         """Test ValidationResult.to_dict() method"""
         result = validator.validate(sample_valid_df)